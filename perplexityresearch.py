@@ -2,6 +2,7 @@
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import sys
 import re
 import time
@@ -53,6 +54,10 @@ FIRECRAWL_API_KEY = os.getenv("FIRECRAWL_API_KEY")
 PERPLEXITY_RESEARCH_MODEL = os.getenv("PERPLEXITY_RESEARCH_MODEL")
 PERPLEXITY_CLEANUP_MODEL = os.getenv("PERPLEXITY_CLEANUP_MODEL")
 
+# Shared session so concurrent research calls reuse keep-alive connections to the API
+perplexity_session = requests.Session()
+perplexity_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=int(os.getenv("MAX_CONCURRENT_REQUESTS", "32"))))
+
 # Initialize Firecrawl
 firecrawl_client = FirecrawlApp(api_key=FIRECRAWL_API_KEY)
 
@@ -132,7 +137,7 @@ def query_perplexity(prompt, model, system_prompt="Be concise.", is_research=Fal
     print(f"{Colors.YELLOW}Calling Perplexity API with model: {model}" + 
           (f" {Colors.BOLD}(this may take up to 10 minutes...){Colors.RESET}" if is_research else f"{Colors.RESET}"))
     
-    response = requests.post(url, json=payload, headers=headers, timeout=timeout_duration)
+    response = perplexity_session.post(url, json=payload, headers=headers, timeout=timeout_duration)
     if response.status_code != 200:
         raise RuntimeError(f"Perplexity API call failed: {response.text}")
     return response.json()
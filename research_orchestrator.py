@@ -47,17 +47,27 @@ Run with --help for more options.
 
 import os
 import re
+import copy
 import time
 import json
 import uuid
+import hashlib
+import heapq
 import queue
 import random
+import sqlite3
+import asyncio
+import functools
 import argparse
+import logging
 import threading
 import traceback
 import sys
+import atexit
+from collections import defaultdict
+from contextlib import asynccontextmanager, closing, contextmanager
 from urllib.parse import urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -65,13 +75,23 @@ load_dotenv()
 
 # Try importing OpenAI for file search functionality
 try:
-    from openai import OpenAI
+    import httpx
+    from openai import OpenAI, AsyncOpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
     pass
 
+# HTTP/2 lets concurrent OpenAI requests share a connection (needs the optional h2 package)
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Import functions from perplexityresearch.py
 from perplexityresearch import (
@@ -88,6 +108,8 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 ENABLE_OPENAI_INTEGRATION = os.getenv("ENABLE_OPENAI_INTEGRATION", "false").lower() in ("true", "1", "yes")
 OPENAI_PROCESSING_MAX_CHECKS = int(os.getenv("OPENAI_PROCESSING_MAX_CHECKS", "10"))
 OPENAI_PROCESSING_CHECK_INTERVAL = float(os.getenv("OPENAI_PROCESSING_CHECK_INTERVAL", "5.0"))
+OPENAI_PROCESSING_INITIAL_INTERVAL = float(os.getenv("OPENAI_PROCESSING_INITIAL_INTERVAL", "1.0"))
+OPENAI_PROCESSING_BACKOFF_FACTOR = float(os.getenv("OPENAI_PROCESSING_BACKOFF_FACTOR", "2.0"))
 
 # Models
 PERPLEXITY_RESEARCH_MODEL = os.getenv("PERPLEXITY_RESEARCH_MODEL", "sonar-deep-research")
@@ -98,17 +120,66 @@ API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
 API_INITIAL_RETRY_DELAY = float(os.getenv("API_INITIAL_RETRY_DELAY", "5.0"))
 API_MAX_RETRY_DELAY = float(os.getenv("API_MAX_RETRY_DELAY", "60.0"))
 
+# Upper bound on automatically calculated worker threads
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "32"))
+
+# Phase 1 completions between progress checkpoints in the tracking file
+PROGRESS_CHECKPOINT_INTERVAL = int(os.getenv("PROGRESS_CHECKPOINT_INTERVAL", "10"))
+# Per-question results, appended as each question completes so a run can be resumed
+QUESTION_RESULTS_FILE = "_results.jsonl"
+
 # Citation Processing
 MAX_CITATIONS = int(os.getenv("MAX_CITATIONS", "50"))
 CITATION_TIMEOUT = float(os.getenv("CITATION_TIMEOUT", "300.0"))  # 5 minutes by default
+CITATION_PER_HOST_QPS = float(os.getenv("CITATION_PER_HOST_QPS", "1.0"))
+CITATION_PER_HOST_BURST = int(os.getenv("CITATION_PER_HOST_BURST", "2"))
+CITATION_RATE_LIMIT_BACKOFF = float(os.getenv("CITATION_RATE_LIMIT_BACKOFF", "5.0"))  # Seconds to pause a host after its first 429
+CITATION_MAX_BYTES = int(os.getenv("CITATION_MAX_BYTES", str(20 * 1024 * 1024)))  # 20 MB by default
+URL_CACHE_TTL = int(os.getenv("URL_CACHE_TTL", "86400"))  # Seconds to remember URLs that failed the preflight check
 
 # Project tracking
 RESEARCH_PROJECTS_FILE = os.getenv("RESEARCH_PROJECTS_FILE", "research_projects.json")
 OPENAI_FILE_UPLOAD_TIMEOUT = int(os.getenv("OPENAI_FILE_UPLOAD_TIMEOUT", "60"))
 OPENAI_VECTORSTORE_CREATION_TIMEOUT = int(os.getenv("OPENAI_VECTORSTORE_CREATION_TIMEOUT", "60"))
+OPENAI_MAX_CONCURRENT_UPLOADS = int(os.getenv("OPENAI_MAX_CONCURRENT_UPLOADS", "16"))
+OPENAI_IN_MEMORY_UPLOAD_SIZE = 4 * 1024 * 1024  # Files up to this size are read fully before uploading
+# Turns an ISO timestamp (2025-01-31T12:00:00Z) into a compact name suffix (20250131_120000) in one pass
+VECTOR_STORE_TIMESTAMP_TABLE = str.maketrans({":": None, "-": None, "T": "_", "Z": None, " ": "_"})
+
+# Patterns for turning questions and topics into folder/file name fragments
+UNSAFE_NAME_CHARS_RE = re.compile(r'[^\w\s-]')
+NAME_SEPARATORS_RE = re.compile(r'[-\s]+')
+
+# Debug diagnostics go through logging so they cost nothing unless enabled
+logger = logging.getLogger(__name__)
 
 # Thread safety
 print_lock = threading.Lock()
+tracking_lock = threading.Lock()
+
+# Shared OpenAI client, created on first use by create_openai_client()
+_openai_client = None
+
+# Shared thread pool for blocking I/O (citation steps, index building), created on first use by get_io_pool()
+_io_pool = None
+_io_pool_lock = threading.Lock()
+
+# Shared HTTP session for citation URL checks, so repeat hosts reuse pooled connections.
+# 429 is left to the per-host rate limiter in process_citations rather than retried here.
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=64,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504], raise_on_status=False)
+)
+_http_session.mount("http://", _http_adapter)
+_http_session.mount("https://", _http_adapter)
+_http_session.headers["User-Agent"] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+atexit.register(_http_session.close)
+
+# In-process copy of the project tracking file, reloaded when the file changes on disk
+_tracking_cache = None
+_tracking_mtime = None
 
 # Terminal colors
 class Colors:
@@ -169,6 +240,121 @@ def with_retry(func, *args, prefix="", **kwargs):
             # Increase delay for next retry (exponential backoff with jitter)
             delay = min(delay * 2 * (0.5 + random.random()), API_MAX_RETRY_DELAY)
 
+@contextmanager
+def preserve_active(project_data):
+    """
+    Keep a project's "active" flag unchanged across an operation.
+    The flag is read once on entry and restored on exit, including early
+    returns and exceptions.
+    
+    Args:
+        project_data (dict): The project data
+    """
+    active_status = project_data.get("active", True)
+    try:
+        yield
+    finally:
+        project_data["active"] = active_status
+
+class StartRateLimiter:
+    """
+    Thread-safe token bucket (one token, refilled every `interval` seconds) for spacing out
+    task starts. Workers call acquire() before their first API request, so tasks are
+    submitted all at once and only the workers wait, never the submitting thread.
+    Tokens are computed on acquire from time.monotonic(); no refill thread is needed.
+    """
+    
+    def __init__(self, interval):
+        """
+        Args:
+            interval: Minimum seconds between two task starts (0 disables spacing)
+        """
+        self.interval = max(0.0, interval)
+        self._next_start = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until this caller is allowed to start."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        
+        if start > now:
+            time.sleep(start - now)
+    
+    def call(self, func, *args, **kwargs):
+        """
+        Wait for a start slot, then call a function.
+        
+        Args:
+            func: The function to call
+            *args: Arguments to pass to the function
+            **kwargs: Keyword arguments to pass to the function
+            
+        Returns:
+            The result of the function call
+        """
+        self.acquire()
+        return func(*args, **kwargs)
+
+def get_io_pool():
+    """
+    Get the shared thread pool used for blocking I/O.
+    The pool is created on first use with MAX_CONCURRENT_REQUESTS threads and reused
+    by every later phase and run in this process, so worker threads are only started once.
+    Callers that need a lower limit bound their own in-flight work (e.g. with a semaphore).
+    
+    Returns:
+        The shared ThreadPoolExecutor
+    """
+    global _io_pool
+    
+    with _io_pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=max(1, MAX_CONCURRENT_REQUESTS), thread_name_prefix="research-io")
+            atexit.register(_io_pool.shutdown, wait=False)
+        return _io_pool
+
+def iter_completed(futures):
+    """
+    Yield futures in the order they complete.
+    A lighter replacement for concurrent.futures.as_completed: each future gets a
+    single done callback that pushes it onto a queue, instead of as_completed's
+    waiter bookkeeping across all pending futures.
+    
+    Args:
+        futures: Collection of concurrent.futures.Future objects
+        
+    Yields:
+        Each future once it has completed
+    """
+    completed = queue.SimpleQueue()
+    for future in futures:
+        future.add_done_callback(completed.put)
+    for _ in range(len(futures)):
+        yield completed.get()
+
+def calculate_max_workers(question_count, questions_per_worker, max_concurrency=None):
+    """
+    Calculate the number of worker threads to use for a batch of questions.
+    One worker per questions_per_worker questions, capped so large projects
+    don't spawn more threads than the APIs or the machine can usefully run.
+    
+    Args:
+        question_count: Number of questions to process
+        questions_per_worker: Number of questions each worker should handle
+        max_concurrency: Maximum number of concurrent requests (default: MAX_CONCURRENT_REQUESTS)
+        
+    Returns:
+        int: The number of worker threads (at least 1)
+    """
+    if max_concurrency is None:
+        max_concurrency = MAX_CONCURRENT_REQUESTS
+    
+    cpu_limit = (os.cpu_count() or 4) * 4
+    return max(1, min(int(question_count / questions_per_worker), max_concurrency, cpu_limit))
+
 def research_pipeline(question, master_folder, question_number, total_questions, topic=None, perspective=None):
     """
     Phase 1 of the research process: Get initial research response for a question.
@@ -189,8 +375,8 @@ def research_pipeline(question, master_folder, question_number, total_questions,
     
     try:
         # Set up paths for this question
-        safe_question = re.sub(r'[^\w\s-]', '', question)
-        safe_question = re.sub(r'[-\s]+', '_', safe_question).strip('-_')
+        safe_question = UNSAFE_NAME_CHARS_RE.sub('', question)
+        safe_question = NAME_SEPARATORS_RE.sub('_', safe_question).strip('-_')
         safe_question = safe_question[:30] if len(safe_question) > 30 else safe_question
         
         # Change prefix from Q to A to make files sort to the top
@@ -293,7 +479,7 @@ Please perform comprehensive, detailed research on the question above, consideri
             traceback.print_exc()
         return False, None, []
 
-def create_master_index(master_folder, questions, results):
+def create_master_index(master_folder, questions, results, out_dir=None):
     """
     Create a master index of all questions and their research outputs.
     
@@ -301,12 +487,16 @@ def create_master_index(master_folder, questions, results):
         master_folder: The master folder path
         questions: List of research questions
         results: List of (success_flag, research_response, citations) tuples
+        out_dir: Folder to write the index to (default: the summaries folder)
     
     Returns:
         Path to the created index file
     """
-    markdown_dir = os.path.join(master_folder, "markdown")
-    index_path = os.path.join(markdown_dir, "master_index.md")
+    if out_dir is None:
+        out_dir = os.path.join(master_folder, "summaries")
+    index_path = os.path.join(out_dir, "master_index.md")
+    # Links to the research outputs are relative to wherever the index is written
+    markdown_link_prefix = os.path.relpath(os.path.join(master_folder, "markdown"), out_dir).replace(os.sep, "/")
     
     # Get timestamp for the report
     timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
@@ -319,24 +509,24 @@ def create_master_index(master_folder, questions, results):
         successful_count = sum(1 for success, _, _ in results if success)
         f.write(f"Successfully processed {successful_count} out of {len(questions)} questions.\n\n")
         
-        # Table of contents
+        # Clean any thinking sections from the questions once, for both sections below
+        clean_questions = [clean_thinking_sections(question) for question in questions]
+        
+        # Table of contents, written with a single call
         f.write("## Table of Contents\n\n")
-        for i, question in enumerate(questions, 1):
-            success = results[i-1][0] if i-1 < len(results) else False
-            status = "✅" if success else "❌"
-            # Clean any thinking sections from the question
-            clean_question = clean_thinking_sections(question)
-            f.write(f"{i}. {status} [Q{i:02d}: {clean_question[:80]}{'...' if len(clean_question) > 80 else ''}](#q{i:02d})\n")
+        f.write("".join(
+            f"{i}. {'✅' if i-1 < len(results) and results[i-1][0] else '❌'} "
+            f"[Q{i:02d}: {clean_question[:80]}{'...' if len(clean_question) > 80 else ''}](#q{i:02d})\n"
+            for i, clean_question in enumerate(clean_questions, 1)
+        ))
         
         f.write("\n---\n\n")
         
         # Question details
-        for i, question in enumerate(questions, 1):
+        for i, clean_question in enumerate(clean_questions, 1):
             f.write(f"## Q{i:02d}\n\n")
             success, research_response, citations = results[i-1] if i-1 < len(results) else (False, None, [])
             
-            # Clean any thinking sections from the question
-            clean_question = clean_thinking_sections(question)
             f.write(f"**Question**: {clean_question}\n\n")
             
             if not success:
@@ -350,16 +540,15 @@ def create_master_index(master_folder, questions, results):
                 f.write(f"**Citations**: {len(citations)}\n\n")
                 f.write("| # | Citation URL |\n")
                 f.write("|---|-------------|\n")
-                for j, citation in enumerate(citations, 1):
-                    f.write(f"| {j} | [{citation[:60]}...]({citation}) |\n")
+                f.write("".join(f"| {j} | [{citation[:60]}...]({citation}) |\n" for j, citation in enumerate(citations, 1)))
             else:
                 f.write("**Citations**: None found\n\n")
                 
             # Links to outputs - updated to use A prefix instead of Q
             question_prefix = f"A{i:02d}_"
             f.write("\n**Research Outputs**:\n\n")
-            f.write(f"- [Research Summary]({question_prefix}research_summary.md)\n")
-            f.write(f"- [Executive Summary]({question_prefix}executive_summary.md)\n")
+            f.write(f"- [Research Summary]({markdown_link_prefix}/{question_prefix}research_summary.md)\n")
+            f.write(f"- [Executive Summary]({markdown_link_prefix}/{question_prefix}executive_summary.md)\n")
             
             f.write("\n---\n\n")
     
@@ -473,9 +662,58 @@ CONTENT TO CLEAN UP:
         safe_print(f"  ↳ Error during citation cleanup: {str(e)}")
         return None
 
-def process_citation(citation_url, question_context, master_folder, citation_id, total_citations, prefix=""):
+def save_citation_files(master_folder, citation_id, citation_url, content, formatted_content, status_code, content_type, question_context):
+    """
+    Save a processed citation's raw and formatted markdown and its metadata.
+    
+    Args:
+        master_folder: Path to the master folder
+        citation_id: Numeric ID of this citation
+        citation_url: URL of the citation
+        content: Raw scraped markdown
+        formatted_content: Markdown cleaned up by Perplexity
+        status_code: HTTP status from the URL test (may be None)
+        content_type: Content-Type from the URL test (may be None)
+        question_context: List of questions referencing this citation
+    """
+    # Save the raw markdown
+    markdown_path = os.path.join(master_folder, "markdown", f"C{citation_id:03d}_raw.md")
+    os.makedirs(os.path.dirname(markdown_path), exist_ok=True)
+    with open(markdown_path, "w", encoding="utf-8") as f:
+        f.write(f"# Citation {citation_id}: {citation_url}\n\n")
+        f.write(content)
+    
+    # Save the formatted content
+    formatted_path = os.path.join(master_folder, "markdown", f"C{citation_id:03d}_formatted.md")
+    with open(formatted_path, "w", encoding="utf-8") as f:
+        f.write(f"# Citation {citation_id}: {citation_url}\n\n")
+        f.write(formatted_content)
+    
+    # Create citation metadata
+    metadata_path = os.path.join(master_folder, "response", f"C{citation_id:03d}_metadata.json")
+    os.makedirs(os.path.dirname(metadata_path), exist_ok=True)
+    
+    metadata = {
+        "citation_id": citation_id,
+        "url": citation_url,
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
+        "status_code": status_code,
+        "content_type": content_type,
+        "content_length": len(content),
+        "formatted_length": len(formatted_content),
+        "questions": [{'question': q.get('question', 'Unknown'), 
+                      'question_number': q.get('question_number', 0)} 
+                     for q in question_context]
+    }
+    
+    with open(metadata_path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+
+async def process_citation(citation_url, question_context, master_folder, citation_id, total_citations, prefix=""):
     """
     Process a citation URL by scraping its content and formatting it with Perplexity.
+    Each blocking step runs in the shared I/O thread pool, so cancelling the
+    coroutine (e.g. on timeout) stops the citation before its next step starts.
     
     Args:
         citation_url: URL to process
@@ -498,19 +736,25 @@ def process_citation(citation_url, question_context, master_folder, citation_id,
         safe_print(f"{prefix}❌ [Citation {citation_id}/{total_citations}] Invalid URL format: {citation_url}")
         return False, None, None
     
+    loop = asyncio.get_running_loop()
+    io_pool = get_io_pool()
+    
     try:
         # Progress tracking
         safe_print(f"{prefix}⏳ [Citation {citation_id}/{total_citations}] Processing: {citation_url}")
         
         # Step 0: Preliminary URL testing
         safe_print(f"{prefix}  ↳ Step 1/6: Testing URL accessibility...")
-        is_accessible, status_code, content_type, message = test_citation_url(citation_url)
+        is_accessible, status_code, content_type, message = await loop.run_in_executor(io_pool, check_citation_url, master_folder, citation_url)
         
         if not is_accessible and status_code is not None:
             safe_print(f"{prefix}  ↳ ⚠️ URL test: {message} (Status: {status_code}, Content-Type: {content_type})")
             if status_code >= 400:  # Client or server error
                 safe_print(f"{prefix}  ↳ ❌ URL returned error status {status_code}")
                 return False, {"error": message, "status_code": status_code}, None
+            if message.startswith("Content too large"):
+                safe_print(f"{prefix}  ↳ ❌ Skipping oversized document")
+                return False, {"error": message, "status_code": status_code}, None
         elif not is_accessible:
             safe_print(f"{prefix}  ↳ ⚠️ URL test: {message}")
             # We'll still try to proceed with Firecrawl as it has more sophisticated scraping
@@ -530,7 +774,7 @@ def process_citation(citation_url, question_context, master_folder, citation_id,
         # Perform the scraping
         safe_print(f"{prefix}  ↳ Step 3/6: Scraping web content...")
         try:
-            citation_data = intelligent_scrape(client, citation_url)
+            citation_data = await loop.run_in_executor(io_pool, intelligent_scrape, client, citation_url)
             if not citation_data or not citation_data.get("markdown"):
                 safe_print(f"{prefix}  ↳ ❌ Failed to extract content from URL")
                 return False, citation_data or {"error": "No content extracted"}, None
@@ -556,7 +800,9 @@ def process_citation(citation_url, question_context, master_folder, citation_id,
         # Format the content
         safe_print(f"{prefix}  ↳ Step 5/6: Cleaning up content with Perplexity...")
         try:
-            formatted_content = cleanup_citation_with_perplexity(content, citation_url, question_context)
+            formatted_content = await loop.run_in_executor(
+                io_pool, cleanup_citation_with_perplexity, content, citation_url, question_context
+            )
             if not formatted_content:
                 safe_print(f"{prefix}  ↳ ❌ Failed to format content")
                 return False, citation_data, None
@@ -568,38 +814,10 @@ def process_citation(citation_url, question_context, master_folder, citation_id,
         # Phase 3: File saving
         safe_print(f"{prefix}  ↳ Step 6/6: Saving citation content to files...")
         try:
-            # Save the raw markdown
-            markdown_path = os.path.join(master_folder, "markdown", f"C{citation_id:03d}_raw.md")
-            os.makedirs(os.path.dirname(markdown_path), exist_ok=True)
-            with open(markdown_path, "w", encoding="utf-8") as f:
-                f.write(f"# Citation {citation_id}: {citation_url}\n\n")
-                f.write(content)
-                
-            # Save the formatted content
-            formatted_path = os.path.join(master_folder, "markdown", f"C{citation_id:03d}_formatted.md")
-            with open(formatted_path, "w", encoding="utf-8") as f:
-                f.write(f"# Citation {citation_id}: {citation_url}\n\n")
-                f.write(formatted_content)
-                
-            # Create citation metadata
-            metadata_path = os.path.join(master_folder, "response", f"C{citation_id:03d}_metadata.json")
-            os.makedirs(os.path.dirname(metadata_path), exist_ok=True)
-            
-            metadata = {
-                "citation_id": citation_id,
-                "url": citation_url,
-                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
-                "status_code": status_code,
-                "content_type": content_type,
-                "content_length": len(content),
-                "formatted_length": len(formatted_content),
-                "questions": [{'question': q.get('question', 'Unknown'), 
-                              'question_number': q.get('question_number', 0)} 
-                             for q in question_context]
-            }
-            
-            with open(metadata_path, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2)
+            await loop.run_in_executor(
+                io_pool, save_citation_files, master_folder, citation_id, citation_url,
+                content, formatted_content, status_code, content_type, question_context
+            )
                 
             safe_print(f"{prefix}✅ [Citation {citation_id}/{total_citations}] Successfully processed: {citation_url}")
             return True, citation_data, formatted_content
@@ -617,7 +835,8 @@ def extract_and_deduplicate_citations(all_questions_results):
     Also ranks citations by frequency of reference.
     
     Args:
-        all_questions_results: List of tuples (success_flag, research_response, citations)
+        all_questions_results: Iterable of tuples (success_flag, research_response, citations),
+            in question order; research_response may be None
     
     Returns:
         Tuple of (citation_map, unique_citation_count)
@@ -648,19 +867,13 @@ def extract_and_deduplicate_citations(all_questions_results):
                     safe_print(f"{Colors.YELLOW}Warning: Skipping non-string citation: {citation} (type: {type(citation)}){Colors.RESET}")
                     continue
                     
-                if citation not in citation_map:
-                    citation_map[citation] = []
-                    
-                citation_map[citation].append({
+                citation_map.setdefault(citation, []).append({
                     "question": question,
                     "question_number": question_number
                 })
         elif isinstance(citations, str):
             # Handle a single citation string
-            if citations not in citation_map:
-                citation_map[citations] = []
-                
-            citation_map[citations].append({
+            citation_map.setdefault(citations, []).append({
                 "question": question,
                 "question_number": question_number
             })
@@ -681,68 +894,90 @@ def prioritize_citations(citation_map, max_citations=50):
     Returns:
         Tuple of (prioritized_citations, skipped_count)
     """
-    # Sort citations by number of references (descending)
-    sorted_citations = sorted(
-        citation_map.items(), 
-        key=lambda item: len(item[1]), 
-        reverse=True
+    # Take the top N citations by number of references (descending) without sorting them all
+    top_citations = heapq.nlargest(
+        max_citations,
+        citation_map.items(),
+        key=lambda item: len(item[1])
     )
     
-    # Take top N citations
-    prioritized_citations = dict(sorted_citations[:max_citations])
-    skipped_count = len(sorted_citations) - max_citations if len(sorted_citations) > max_citations else 0
+    prioritized_citations = dict(top_citations)
+    skipped_count = len(citation_map) - len(prioritized_citations)
     
     return prioritized_citations, skipped_count
 
-def with_timeout(func, *args, **kwargs):
+def extract_and_prioritize_citations(all_questions_results, max_citations=50):
     """
-    Execute a function with a timeout limit.
+    Phase 2 in one call: deduplicate the citations from all research responses and
+    select the most referenced ones for processing.
+    The responses are walked once to build the citation map; the top citations are
+    then picked from the map with a bounded heap rather than a full sort.
     
     Args:
-        func: The function to call
-        *args: Arguments to pass to the function
-        **kwargs: Keyword arguments to pass to the function
+        all_questions_results: List of tuples (success_flag, research_response, citations)
+        max_citations: Maximum number of citations to process
         
     Returns:
-        The result of the function call or a timeout error result
+        Tuple of (citation_map, prioritized_citation_map, skipped_count)
     """
-    import queue
-    import threading
+    citation_map, _ = extract_and_deduplicate_citations(all_questions_results)
+    if not citation_map:
+        return citation_map, {}, 0
     
-    # Extract timeout from kwargs or use default
-    timeout = kwargs.pop('timeout', 300) if 'timeout' in kwargs else args[0]
-    # Remove timeout from args if it's the first argument
-    if len(args) > 0 and isinstance(args[0], (int, float)):
-        args = args[1:]
-    
-    # Debug the arguments
-    safe_print(f"{Colors.YELLOW}Debug - Inside with_timeout - func: {func.__name__}, timeout: {timeout}{Colors.RESET}")
+    prioritized_citation_map, skipped_count = prioritize_citations(citation_map, max_citations)
+    return citation_map, prioritized_citation_map, skipped_count
+
+async def process_citation_with_timeout(citation_url, question_context, master_folder, citation_id, total_citations, prefix="", timeout=CITATION_TIMEOUT):
+    """
+    Process a citation with a time limit and return a structured result.
+    On timeout the citation coroutine is cancelled, so no further steps
+    (scraping, cleanup, file writes) are started for it.
     
-    # For process_citation function, extract parameters for better debugging
-    if func == process_citation and len(args) > 0:
-        citation_url = args[0]
-        citation_id = args[3] if len(args) > 3 else "unknown"
-        total_citations = args[4] if len(args) > 4 else "unknown"
-        prefix = kwargs.get("prefix", args[5] if len(args) > 5 else "")
-        
-        # Debug the citation URL
-        safe_print(f"{Colors.YELLOW}Debug - Citation URL: {citation_url} (type: {type(citation_url)}){Colors.RESET}")
-        
-        # Validate citation URL type
-        if not citation_url or not isinstance(citation_url, str):
-            error_msg = f"Invalid citation URL type: {type(citation_url)}"
-            safe_print(f"{prefix}❌ [Citation {citation_id}/{total_citations}] {error_msg}")
-            return {
-                "citation_id": citation_id,
-                "url": str(citation_url),
-                "success": False,
-                "content": f"# Error Processing Citation\n\n**Error details**: {error_msg}\n\n",
-                "error": error_msg
-            }
+    Args:
+        citation_url: URL to process
+        question_context: Context about the research question
+        master_folder: Path to the master folder
+        citation_id: Numeric ID of this citation
+        total_citations: Total number of citations being processed
+        prefix: Prefix for log messages
+        timeout: Maximum time in seconds to spend on the citation
         
-        # Basic URL validation
-        if not citation_url.startswith(('http://', 'https://')):
-            error_msg = f"Invalid URL format: {citation_url}"
+    Returns:
+        Dictionary with the citation processing result
+    """
+    # Validate citation URL type
+    if not citation_url or not isinstance(citation_url, str):
+        error_msg = f"Invalid citation URL type: {type(citation_url)}"
+        safe_print(f"{prefix}❌ [Citation {citation_id}/{total_citations}] {error_msg}")
+        return {
+            "citation_id": citation_id,
+            "url": str(citation_url),
+            "success": False,
+            "content": f"# Error Processing Citation\n\n**Error details**: {error_msg}\n\n",
+            "error": error_msg
+        }
+    
+    # Basic URL validation
+    if not citation_url.startswith(('http://', 'https://')):
+        error_msg = f"Invalid URL format: {citation_url}"
+        safe_print(f"{prefix}❌ [Citation {citation_id}/{total_citations}] {error_msg}")
+        return {
+            "citation_id": citation_id,
+            "url": citation_url,
+            "success": False,
+            "content": f"# Error Processing Citation\n\n**Error details**: {error_msg}\n\n",
+            "error": error_msg
+        }
+    
+    # Additional URL validation for common issues
+    invalid_patterns = [
+        'javascript:', 'mailto:', 'tel:', 'file:', 'data:',  # Non-web protocols
+        'undefined', 'null', '[object', '127.0.0.1', 'localhost'  # Common invalid values
+    ]
+    
+    for pattern in invalid_patterns:
+        if pattern in citation_url.lower():
+            error_msg = f"Invalid URL content: Contains '{pattern}'"
             safe_print(f"{prefix}❌ [Citation {citation_id}/{total_citations}] {error_msg}")
             return {
                 "citation_id": citation_id,
@@ -751,115 +986,47 @@ def with_timeout(func, *args, **kwargs):
                 "content": f"# Error Processing Citation\n\n**Error details**: {error_msg}\n\n",
                 "error": error_msg
             }
-        
-        # Additional URL validation for common issues
-        invalid_patterns = [
-            'javascript:', 'mailto:', 'tel:', 'file:', 'data:',  # Non-web protocols
-            'undefined', 'null', '[object', '127.0.0.1', 'localhost'  # Common invalid values
-        ]
-        
-        for pattern in invalid_patterns:
-            if pattern in citation_url.lower():
-                error_msg = f"Invalid URL content: Contains '{pattern}'"
-                safe_print(f"{prefix}❌ [Citation {citation_id}/{total_citations}] {error_msg}")
-                return {
-                    "citation_id": citation_id,
-                    "url": citation_url,
-                    "success": False,
-                    "content": f"# Error Processing Citation\n\n**Error details**: {error_msg}\n\n",
-                    "error": error_msg
-                }
-    
-    safe_print(f"{prefix}⏱️ Starting function with {timeout}s timeout: {func.__name__}")
-    result_queue = queue.Queue()
-    
-    # Worker function to execute the target function
-    def worker():
-        try:
-            result = func(*args, **kwargs)
-            result_queue.put(("success", result))
-        except Exception as e:
-            import traceback
-            error_traceback = traceback.format_exc()
-            result_queue.put(("error", str(e), error_traceback))
     
-    # Create and start the worker thread
-    thread = threading.Thread(target=worker)
-    thread.daemon = True
-    thread.start()
+    safe_print(f"{prefix}⏱️ Starting citation with {timeout}s timeout")
     
     try:
-        # Wait for the result with timeout
-        result_type, *result_data = result_queue.get(timeout=timeout)
-        
-        if result_type == "success":
-            result = result_data[0]
-            
-            # Convert tuple result from process_citation to dictionary format
-            if func == process_citation and isinstance(result, tuple) and len(result) == 3:
-                success, citation_data, formatted_content = result
-                citation_url = args[0]
-                citation_id = args[3] if len(args) > 3 else "unknown"
-                
-                # Create a dictionary result
-                return {
-                    "citation_id": citation_id,
-                    "url": str(citation_url),
-                    "success": success,
-                    "content": formatted_content or f"# Error Processing Citation\n\nNo content was extracted from this citation.",
-                    "citation_data": citation_data,
-                    "error": None if success else "Citation processing failed"
-                }
-            
-            return result
-        else:
-            # Handle error case
-            error_msg, error_traceback = result_data
-            
-            # For process_citation function, return structured error result
-            if func == process_citation and len(args) > 0:
-                citation_url = args[0]
-                citation_id = args[3] if len(args) > 3 else "unknown"
-                total_citations = args[4] if len(args) > 4 else "unknown"
-                prefix = kwargs.get("prefix", args[5] if len(args) > 5 else "")
-                
-                safe_print(f"{prefix}❌ [Citation {citation_id}/{total_citations}] Error: {error_msg}")
-                return {
-                    "citation_id": citation_id,
-                    "url": str(citation_url),
-                    "success": False,
-                    "content": f"# Error Processing Citation\n\n**Error details**: {error_msg}\n\n**Traceback**:\n```\n{error_traceback}\n```\n",
-                    "error": error_msg
-                }
-            else:
-                # For other functions, re-raise the exception
-                raise Exception(f"Error in {func.__name__}: {error_msg}\n{error_traceback}")
-    except queue.Empty:
-        # Handle timeout case
-        thread.join(0.1)  # Give the thread a moment to clean up
-        
-        # For process_citation function, return structured timeout result
-        if func == process_citation and len(args) > 0:
-            citation_url = args[0]
-            citation_id = args[3] if len(args) > 3 else "unknown"
-            total_citations = args[4] if len(args) > 4 else "unknown"
-            prefix = kwargs.get("prefix", args[5] if len(args) > 5 else "")
-            
-            error_msg = f"Timeout after {timeout} seconds"
-            safe_print(f"{prefix}⏱️ [Citation {citation_id}/{total_citations}] {error_msg}")
-            return {
-                "citation_id": citation_id,
-                "url": str(citation_url),
-                "success": False,
-                "content": f"# Timeout Processing Citation\n\n**Error details**: {error_msg}\n\n",
-                "error": error_msg,
-                "timeout": True
-            }
-        else:
-            # For other functions, raise a timeout exception
-            raise TimeoutError(f"Function {func.__name__} timed out after {timeout} seconds")
+        success, citation_data, formatted_content = await asyncio.wait_for(
+            process_citation(citation_url, question_context, master_folder, citation_id, total_citations, prefix),
+            timeout
+        )
+        return {
+            "citation_id": citation_id,
+            "url": str(citation_url),
+            "success": success,
+            "content": formatted_content or f"# Error Processing Citation\n\nNo content was extracted from this citation.",
+            "citation_data": citation_data,
+            "error": None if success else "Citation processing failed"
+        }
+    except asyncio.TimeoutError:
+        error_msg = f"Timeout after {timeout} seconds"
+        safe_print(f"{prefix}⏱️ [Citation {citation_id}/{total_citations}] {error_msg}")
+        return {
+            "citation_id": citation_id,
+            "url": str(citation_url),
+            "success": False,
+            "content": f"# Timeout Processing Citation\n\n**Error details**: {error_msg}\n\n",
+            "error": error_msg,
+            "error_type": "Timeout",
+            "timeout": True
+        }
+    except Exception as e:
+        error_msg = str(e)
+        error_traceback = traceback.format_exc()
+        safe_print(f"{prefix}❌ [Citation {citation_id}/{total_citations}] Error: {error_msg}")
+        return {
+            "citation_id": citation_id,
+            "url": str(citation_url),
+            "success": False,
+            "content": f"# Error Processing Citation\n\n**Error details**: {error_msg}\n\n**Traceback**:\n```\n{error_traceback}\n```\n",
+            "error": error_msg
+        }
 
-def create_citation_index(master_folder, citation_map, citation_results, skipped_count=0):
+def create_citation_index(master_folder, citation_map, citation_results, skipped_count=0, out_dir=None):
     """
     Create an index of all citations in Markdown format.
     
@@ -868,9 +1035,13 @@ def create_citation_index(master_folder, citation_map, citation_results, skipped
         citation_map: Mapping of citations to questions (full map)
         citation_results: Results from processing citations (prioritized ones)
         skipped_count: Number of citations that were skipped due to prioritization
+        out_dir: Folder to write the index to (default: the summaries folder)
     """
-    markdown_dir = os.path.join(master_folder, "markdown")
-    citation_index_path = os.path.join(markdown_dir, "citation_index.md")
+    if out_dir is None:
+        out_dir = os.path.join(master_folder, "summaries")
+    citation_index_path = os.path.join(out_dir, "citation_index.md")
+    # Links to the saved citation files are relative to wherever the index is written
+    markdown_link_prefix = os.path.relpath(os.path.join(master_folder, "markdown"), out_dir).replace(os.sep, "/")
     
     # Count different types of failures
     timeout_count = 0
@@ -997,7 +1168,7 @@ def create_citation_index(master_folder, citation_map, citation_results, skipped
                     f.write("- The URL might be incorrect or the content may have been removed\n")
                 elif status_code == 429:
                     f.write("- The website is rate limiting requests (429 Too Many Requests)\n")
-                    f.write("- Try increasing the `THREAD_STAGGER_DELAY` in your .env file\n")
+                    f.write("- Try increasing the `CITATION_RATE_LIMIT_BACKOFF` in your .env file\n")
                     f.write("- Reduce the number of worker threads to avoid rate limiting\n")
                 elif "ssl" in error_msg.lower():
                     f.write("- SSL/TLS certificate validation failed\n")
@@ -1021,8 +1192,10 @@ def create_citation_index(master_folder, citation_map, citation_results, skipped
             
             # Add links to the raw and formatted files if successful
             if success:
-                raw_path = f"C{i:03d}_raw.md"
-                formatted_path = f"C{i:03d}_formatted.md"
+                # Name the files after the ID process_citation saved them under
+                citation_id = citation_result.get("citation_id", i)
+                raw_path = f"{markdown_link_prefix}/C{citation_id:03d}_raw.md"
+                formatted_path = f"{markdown_link_prefix}/C{citation_id:03d}_formatted.md"
                 
                 f.write("\n**Files**:\n\n")
                 f.write(f"- [Raw content]({raw_path})\n")
@@ -1055,7 +1228,7 @@ def create_citation_index(master_folder, citation_map, citation_results, skipped
     safe_print(f"{Colors.GREEN}Created citation index with all {len(citation_map)} citations.{Colors.RESET}")
     return citation_index_path
 
-def consolidate_summary_files(master_folder, pattern, output_filename, title):
+def consolidate_summary_files(master_folder, pattern, output_filename, title, summaries_dir=None):
     """
     Consolidate all files matching a pattern in the markdown directory into a single file.
     
@@ -1064,13 +1237,15 @@ def consolidate_summary_files(master_folder, pattern, output_filename, title):
         pattern: Regex pattern to match filenames (e.g., "executive_summary")
         output_filename: Name of the output file
         title: Title for the consolidated file
+        summaries_dir: Existing folder to write the consolidated file to (default: the summaries folder, created if needed)
     
     Returns:
         Path to the consolidated file
     """
     markdown_dir = os.path.join(master_folder, "markdown")
-    summaries_dir = os.path.join(master_folder, "summaries")
-    os.makedirs(summaries_dir, exist_ok=True)
+    if summaries_dir is None:
+        summaries_dir = os.path.join(master_folder, "summaries")
+        os.makedirs(summaries_dir, exist_ok=True)
     
     # Find all files matching the pattern
     summary_files = []
@@ -1143,34 +1318,94 @@ def consolidate_summary_files(master_folder, pattern, output_filename, title):
     safe_print(f"{Colors.GREEN}Consolidated {len(summary_files)} {pattern} files into: {output_file}{Colors.RESET}")
     return output_file
 
-def move_file(source_path, dest_dir):
+def create_indexes_and_summaries(master_folder, questions, question_results, citation_map=None,
+                                 citation_results=None, skipped_count=0, serial=False):
     """
-    Move a file from source path to destination directory.
+    Create the master (and citation) index in the summaries folder and consolidate
+    the summary files.
+    These steps read and write different files, so they run in parallel threads
+    unless serial is True.
     
     Args:
-        source_path: Path to the source file
-        dest_dir: Destination directory
-        
-    Returns:
-        Path to the moved file
+        master_folder: The master folder for the research project
+        questions: List of research questions
+        question_results: List of (success_flag, research_response, citations) tuples
+        citation_map: Mapping of citations to questions, or None if there were no citations
+        citation_results: Results from processing citations, or None to skip the citation index
+        skipped_count: Number of citations skipped due to prioritization
+        serial: Run the steps one after another instead of in parallel
     """
-    os.makedirs(dest_dir, exist_ok=True)
-    filename = os.path.basename(source_path)
-    dest_path = os.path.join(dest_dir, filename)
+    safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== CONSOLIDATING SUMMARIES ========{Colors.RESET}")
     
-    # Read the original file
-    with open(source_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    summaries_dir = os.path.join(master_folder, "summaries")
+    os.makedirs(summaries_dir, exist_ok=True)
     
-    # Write to the new location
-    with open(dest_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    tasks = [
+        (create_master_index, (master_folder, questions, question_results, summaries_dir)),
+        (consolidate_summary_files, (master_folder, "executive_summary", "consolidated_executive_summaries.md", "Consolidated Executive Summaries", summaries_dir)),
+        (consolidate_summary_files, (master_folder, "research_summary", "consolidated_research_summaries.md", "Consolidated Research Summaries", summaries_dir))
+    ]
+    if citation_results is not None:
+        tasks.append((create_citation_index, (master_folder, citation_map, citation_results, skipped_count, summaries_dir)))
+    
+    if serial:
+        for func, func_args in tasks:
+            func(*func_args)
+    else:
+        executor = get_io_pool()
+        futures = [executor.submit(func, *func_args) for func, func_args in tasks]
+        for future in futures:
+            future.result()
+
+def read_questions_file(questions_file):
+    """
+    Read research questions from a file, one per line, skipping blank lines.
+    
+    Args:
+        questions_file: Path to the questions file
+        
+    Returns:
+        List of question strings
+    """
+    with open(questions_file, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    return [question for question in map(str.strip, lines) if question]
+
+def question_key(question):
+    """
+    Hash a question's text into a short key that identifies it across runs.
     
-    # If write was successful, delete the original file (optional)
-    # os.remove(source_path)
+    Args:
+        question: The research question
+        
+    Returns:
+        Hex digest string
+    """
+    return hashlib.blake2b(question.encode("utf-8"), digest_size=8).hexdigest()
+
+def load_question_results(master_folder):
+    """
+    Read the per-question results recorded in a project folder by earlier runs.
     
-    safe_print(f"{Colors.GREEN}Moved {filename} to {dest_dir}{Colors.RESET}")
-    return dest_path
+    Args:
+        master_folder: Path to the project folder
+        
+    Returns:
+        Dictionary mapping question_key() to the latest result record for that question
+    """
+    records = {}
+    try:
+        with open(os.path.join(master_folder, QUESTION_RESULTS_FILE), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A run that was killed mid-write can leave a partial last line
+                    continue
+                records[record["key"]] = record
+    except FileNotFoundError:
+        pass
+    return records
 
 def generate_research_questions(topic, perspective, depth):
     """
@@ -1225,19 +1460,27 @@ First think deeply and mentally mind map this project deeply across all facets t
         safe_print(f"{Colors.RED}Error generating research questions: {str(e)}{Colors.RESET}")
         return []
 
-def load_project_tracking():
+def _read_project_tracking():
     """
-    Load the project tracking data from JSON file.
-    If file doesn't exist, create a new one with default structure.
+    Return the cached project tracking data, re-reading the file only if it changed on disk.
+    If the file doesn't exist, create a new one with default structure.
+    Callers must hold tracking_lock and must not hand the returned dict out directly.
     
     Returns:
-        dict: The project tracking data
+        dict: The cached project tracking data
     """
+    global _tracking_cache, _tracking_mtime
+    
     if os.path.exists(RESEARCH_PROJECTS_FILE):
         try:
+            mtime = os.stat(RESEARCH_PROJECTS_FILE).st_mtime_ns
+            if _tracking_cache is not None and mtime == _tracking_mtime:
+                return _tracking_cache
+            
             with open(RESEARCH_PROJECTS_FILE, "r") as f:
-                data = json.load(f)
-                return data
+                _tracking_cache = json.load(f)
+            _tracking_mtime = mtime
+            return _tracking_cache
         except Exception as e:
             safe_print(f"{Colors.YELLOW}Warning: Could not load project tracking file: {str(e)}{Colors.RESET}")
             
@@ -1249,13 +1492,51 @@ def load_project_tracking():
     }
     
     # Save the new file
+    if not _write_project_tracking(data):
+        _tracking_cache = data
+    
+    return _tracking_cache
+
+def _write_project_tracking(data):
+    """
+    Atomically write the project tracking data and make it the cached copy.
+    Writes to a temporary file first and renames it over the tracking file, so
+    readers never see a half-written file. Callers must hold tracking_lock.
+    
+    Args:
+        data (dict): The project tracking data to write
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    global _tracking_cache, _tracking_mtime
+    
+    temp_path = f"{RESEARCH_PROJECTS_FILE}.tmp"
     try:
-        with open(RESEARCH_PROJECTS_FILE, "w") as f:
+        with open(temp_path, "w") as f:
             json.dump(data, f, indent=2)
+        os.replace(temp_path, RESEARCH_PROJECTS_FILE)
+        
+        _tracking_cache = data
+        _tracking_mtime = os.stat(RESEARCH_PROJECTS_FILE).st_mtime_ns
+        return True
     except Exception as e:
-        safe_print(f"{Colors.YELLOW}Warning: Could not create project tracking file: {str(e)}{Colors.RESET}")
+        # Force the next load to re-read whatever is actually on disk
+        _tracking_mtime = None
+        safe_print(f"{Colors.YELLOW}Warning: Could not save project tracking file: {str(e)}{Colors.RESET}")
+        return False
+
+def load_project_tracking():
+    """
+    Load the project tracking data from JSON file.
+    If file doesn't exist, create a new one with default structure.
+    The file is only parsed again when it has changed since the last load.
     
-    return data
+    Returns:
+        dict: A copy of the project tracking data
+    """
+    with tracking_lock:
+        return copy.deepcopy(_read_project_tracking())
 
 def get_project_by_id(project_id):
     """
@@ -1268,13 +1549,14 @@ def get_project_by_id(project_id):
         dict: The project data or None if not found
     """
     try:
-        # Load existing tracking data
-        tracking_data = load_project_tracking()
-        
-        # Find the project by ID
-        for project in tracking_data.get("projects", []):
-            if project.get("id") == project_id:
-                return project
+        with tracking_lock:
+            # Use the cached tracking data and copy only the matching project
+            tracking_data = _read_project_tracking()
+            
+            # Find the project by ID
+            for project in tracking_data.get("projects", []):
+                if project.get("id") == project_id:
+                    return copy.deepcopy(project)
         
         safe_print(f"{Colors.YELLOW}Warning: Project with ID {project_id} not found in tracking file{Colors.RESET}")
         return None
@@ -1282,12 +1564,16 @@ def get_project_by_id(project_id):
         safe_print(f"{Colors.RED}Error retrieving project by ID: {str(e)}{Colors.RESET}")
         return None
 
-def get_project_folder(project_data):
+def get_project_folder(project_data, verify=False):
     """
     Get the folder path for an existing project.
     
+    The folder recorded in the tracking data is trusted as-is; a missing folder
+    surfaces on the first real read instead of costing a stat on every lookup.
+    
     Args:
         project_data (dict): The project data
+        verify (bool): Check that the folder exists on disk before returning it
     
     Returns:
         str: The project folder path or None if not found
@@ -1301,8 +1587,8 @@ def get_project_folder(project_data):
             safe_print(f"{Colors.YELLOW}Warning: Project does not have a folder path in its data{Colors.RESET}")
             return None
             
-        # Verify the folder exists
-        if not os.path.exists(folder_path):
+        # Only verify the folder exists when asked to
+        if verify and not os.path.isdir(folder_path):
             safe_print(f"{Colors.YELLOW}Warning: Project folder does not exist: {folder_path}{Colors.RESET}")
             return None
             
@@ -1311,7 +1597,7 @@ def get_project_folder(project_data):
         safe_print(f"{Colors.RED}Error retrieving project folder: {str(e)}{Colors.RESET}")
         return None
 
-def process_new_files_with_openai(master_folder, project_data, start_question_number, question_count):
+def process_new_files_with_openai(master_folder, project_data, start_question_number, question_count, *, enable_openai=None):
     """
     Process only new research files with OpenAI: upload files, add to vector store, and update tracking.
     
@@ -1320,201 +1606,200 @@ def process_new_files_with_openai(master_folder, project_data, start_question_nu
         project_data: Project data dictionary
         start_question_number: The starting question number for the new questions
         question_count: The number of new questions added
+        enable_openai: Override ENABLE_OPENAI_INTEGRATION for this call (None uses the setting)
         
     Returns:
         Updated project data with OpenAI integration info
     """
-    # Preserve the active status if it exists
-    active_status = project_data.get("active", True)
+    if enable_openai is None:
+        enable_openai = ENABLE_OPENAI_INTEGRATION
     
-    if not ENABLE_OPENAI_INTEGRATION:
-        safe_print(f"{Colors.YELLOW}OpenAI integration is disabled. Set ENABLE_OPENAI_INTEGRATION=true to enable.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "disabled"}
-        project_data["active"] = active_status
-        return project_data
+    with preserve_active(project_data):
+        if not enable_openai:
+            safe_print(f"{Colors.YELLOW}OpenAI integration is disabled. Set ENABLE_OPENAI_INTEGRATION=true to enable.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "disabled"}
+            return project_data
         
-    if not OPENAI_AVAILABLE:
-        safe_print(f"{Colors.YELLOW}OpenAI package is not installed. Run 'pip install openai' to enable this feature.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "unavailable", "reason": "openai package not installed"}
-        project_data["active"] = active_status
-        return project_data
+        if not OPENAI_AVAILABLE:
+            safe_print(f"{Colors.YELLOW}OpenAI package is not installed. Run 'pip install openai' to enable this feature.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "unavailable", "reason": "openai package not installed"}
+            return project_data
         
-    if not OPENAI_API_KEY:
-        safe_print(f"{Colors.YELLOW}OPENAI_API_KEY is not set in environment. Add it to your .env file.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "unavailable", "reason": "api key not configured"}
-        project_data["active"] = active_status
-        return project_data
+        if not OPENAI_API_KEY:
+            safe_print(f"{Colors.YELLOW}OPENAI_API_KEY is not set in environment. Add it to your .env file.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "unavailable", "reason": "api key not configured"}
+            return project_data
     
-    # Create OpenAI client
-    client = create_openai_client()
-    if not client:
-        safe_print(f"{Colors.RED}Failed to create OpenAI client. OpenAI integration will be skipped.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "error", "reason": "client creation failed"}
-        project_data["active"] = active_status
-        return project_data
+        # Create OpenAI client
+        client = create_openai_client()
+        if not client:
+            safe_print(f"{Colors.RED}Failed to create OpenAI client. OpenAI integration will be skipped.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "error", "reason": "client creation failed"}
+            return project_data
     
-    prefix = "[OpenAI]"
-    safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== PHASE 5: OPENAI FILE PROCESSING (NEW FILES ONLY) ========{Colors.RESET}")
+        prefix = "[OpenAI]"
+        safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== PHASE 5: OPENAI FILE PROCESSING (NEW FILES ONLY) ========{Colors.RESET}")
     
-    # Get project ID
-    project_id = project_data.get("id")
-    if not project_id:
-        safe_print(f"{Colors.RED}{prefix} Project ID not found in project data. OpenAI integration will be skipped.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "error", "reason": "project id missing"}
-        project_data["active"] = active_status
-        return project_data
+        # Get project ID
+        project_id = project_data.get("id")
+        if not project_id:
+            safe_print(f"{Colors.RED}{prefix} Project ID not found in project data. OpenAI integration will be skipped.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "error", "reason": "project id missing"}
+            return project_data
     
-    # Check if project already has OpenAI integration
-    existing_integration = project_data.get("openai_integration", {})
-    existing_file_ids = existing_integration.get("file_ids", {"readme": None, "markdown_files": [], "summary_files": []})
-    existing_vector_store = existing_integration.get("vector_store", {})
-    vector_store_id = existing_vector_store.get("id")
+        # Check if project already has OpenAI integration
+        existing_integration = project_data.get("openai_integration", {})
+        existing_file_ids = existing_integration.get("file_ids", {"readme": None, "markdown_files": [], "summary_files": []})
+        existing_vector_store = existing_integration.get("vector_store", {})
+        vector_store_id = existing_vector_store.get("id")
     
-    if not vector_store_id:
-        safe_print(f"{Colors.YELLOW}{prefix} No existing vector store found. Will need to create a new one.{Colors.RESET}")
-        # Fall back to regular process_files_with_openai
-        return process_files_with_openai(master_folder, project_data)
+        if not vector_store_id:
+            safe_print(f"{Colors.YELLOW}{prefix} No existing vector store found. Will need to create a new one.{Colors.RESET}")
+            # Fall back to regular process_files_with_openai
+            return process_files_with_openai(master_folder, project_data, enable_openai=enable_openai)
     
-    # Step 1: Upload only the new files to OpenAI
-    safe_print(f"{Colors.CYAN}{prefix} Uploading new files to OpenAI...{Colors.RESET}")
+        # Step 1: Upload only the new files to OpenAI
+        safe_print(f"{Colors.CYAN}{prefix} Uploading new files to OpenAI...{Colors.RESET}")
     
-    new_file_ids = {
-        "readme": None,  # We'll update this from the readme only if it doesn't exist already
-        "markdown_files": [],
-        "summary_files": []
-    }
+        new_file_ids = {
+            "readme": None,  # We'll update this from the readme only if it doesn't exist already
+            "markdown_files": [],
+            "summary_files": []
+        }
     
-    # Upload README.md if it doesn't exist already
-    if not existing_file_ids.get("readme"):
-        readme_path = os.path.join(master_folder, "README.md")
-        if os.path.exists(readme_path):
-            file_id = upload_file_to_openai(client, readme_path, prefix)
-            if file_id:
-                new_file_ids["readme"] = file_id
-                safe_print(f"{Colors.GREEN}{prefix} Uploaded README.md: {file_id}{Colors.RESET}")
+        # Collect the new files first so they can all be uploaded concurrently
+        files_to_upload = []  # List of (file_ids key, file path) tuples
     
-    # Upload only the new markdown files for the new questions
-    markdown_folder = os.path.join(master_folder, "markdown")
-    if os.path.exists(markdown_folder):
-        for i in range(start_question_number, start_question_number + question_count):
-            # Pattern for markdown files: Q01_markdown.md, Q02_markdown.md, etc.
-            file_pattern = f"Q{i:02d}_"
-            for filename in os.listdir(markdown_folder):
-                if filename.endswith(".md") and file_pattern in filename:
-                    file_path = os.path.join(markdown_folder, filename)
-                    file_id = upload_file_to_openai(client, file_path, prefix)
-                    if file_id:
-                        new_file_ids["markdown_files"].append(file_id)
-                        safe_print(f"{Colors.GREEN}{prefix} Uploaded new markdown file: {filename}{Colors.RESET}")
-    
-    # Upload only the new summary files in the summaries folder
-    summaries_folder = os.path.join(master_folder, "summaries")
-    if os.path.exists(summaries_folder):
+        # Upload README.md if it doesn't exist already
+        if not existing_file_ids.get("readme"):
+            readme_path = os.path.join(master_folder, "README.md")
+            if os.path.exists(readme_path):
+                files_to_upload.append(("readme", readme_path))
+    
+        # Upload only the new markdown files for the new questions
+        # Pattern for markdown files: Q01_markdown.md, Q02_markdown.md, etc.
+        file_patterns = [f"Q{i:02d}_" for i in range(start_question_number, start_question_number + question_count)]
+        for entry in scan_markdown_files(os.path.join(master_folder, "markdown")):
+            if any(pattern in entry.name for pattern in file_patterns):
+                files_to_upload.append(("markdown_files", entry.path))
+    
+        # Upload only the new summary files in the summaries folder
         # Upload consolidated files and any files related to new questions
-        for filename in os.listdir(summaries_folder):
+        es_prefixes = tuple(f"ES{i}_" for i in range(start_question_number, start_question_number + question_count))
+        for entry in scan_markdown_files(os.path.join(master_folder, "summaries")):
+            filename = entry.name
             # Only upload files that are consolidated summaries or related to new questions
-            if filename.endswith(".md") and (
+            if (
                 filename.startswith("consolidated_") or
+                filename.startswith(es_prefixes) or
                 "master_index" in filename or
-                "citation_index" in filename or
-                any(f"ES{i}_" in filename for i in range(start_question_number, start_question_number + question_count))
+                "citation_index" in filename
             ):
-                file_path = os.path.join(summaries_folder, filename)
-                file_id = upload_file_to_openai(client, file_path, prefix)
-                if file_id:
-                    new_file_ids["summary_files"].append(file_id)
-                    safe_print(f"{Colors.GREEN}{prefix} Uploaded new summary file: {filename}{Colors.RESET}")
-    
-    # Count total uploaded files
-    total_new_files = (1 if new_file_ids["readme"] else 0) + len(new_file_ids["markdown_files"]) + len(new_file_ids["summary_files"])
-    safe_print(f"{Colors.GREEN}{prefix} Successfully uploaded {total_new_files} new files to OpenAI.{Colors.RESET}")
-    
-    # If no new files were uploaded, just return the existing project data
-    if total_new_files == 0:
-        safe_print(f"{Colors.YELLOW}{prefix} No new files were uploaded. Keeping existing vector store.{Colors.RESET}")
-        project_data["active"] = active_status
-        return project_data
+                files_to_upload.append(("summary_files", entry.path))
+    
+        # Skip files whose content hasn't changed since they were last uploaded
+        uploaded_hashes = dict(existing_integration.get("uploaded_hashes", {}))
+        file_hashes = {}
+        changed_files = []
+        for key, file_path in files_to_upload:
+            relative_path = os.path.relpath(file_path, master_folder)
+            file_hashes[file_path] = file_sha256(file_path)
+            if uploaded_hashes.get(relative_path) == file_hashes[file_path]:
+                safe_print(f"{Colors.CYAN}{prefix} Skipping unchanged file: {relative_path}{Colors.RESET}")
+                continue
+            changed_files.append((key, file_path))
     
-    # Step 3: Add new files to existing vector store
-    safe_print(f"{Colors.CYAN}{prefix} Adding new files to existing vector store...{Colors.RESET}")
+        uploaded_ids = upload_files_concurrently([path for _, path in changed_files], prefix)
+        for (key, file_path), file_id in zip(changed_files, uploaded_ids):
+            if not file_id:
+                continue
+            uploaded_hashes[os.path.relpath(file_path, master_folder)] = file_hashes[file_path]
+            if key == "readme":
+                new_file_ids["readme"] = file_id
+                safe_print(f"{Colors.GREEN}{prefix} Uploaded README.md: {file_id}{Colors.RESET}")
+            elif key == "markdown_files":
+                new_file_ids["markdown_files"].append(file_id)
+                safe_print(f"{Colors.GREEN}{prefix} Uploaded new markdown file: {os.path.basename(file_path)}{Colors.RESET}")
+            else:
+                new_file_ids["summary_files"].append(file_id)
+                safe_print(f"{Colors.GREEN}{prefix} Uploaded new summary file: {os.path.basename(file_path)}{Colors.RESET}")
     
-    # Collect all new file IDs
-    all_new_file_ids = []
-    if new_file_ids["readme"]:
-        all_new_file_ids.append(new_file_ids["readme"])
-    all_new_file_ids.extend(new_file_ids["markdown_files"])
-    all_new_file_ids.extend(new_file_ids["summary_files"])
+        # Count total uploaded files
+        total_new_files = (1 if new_file_ids["readme"] else 0) + len(new_file_ids["markdown_files"]) + len(new_file_ids["summary_files"])
+        safe_print(f"{Colors.GREEN}{prefix} Successfully uploaded {total_new_files} new files to OpenAI.{Colors.RESET}")
     
-    added_count = add_files_to_vector_store(client, vector_store_id, all_new_file_ids, prefix)
-    safe_print(f"{Colors.GREEN}{prefix} Added {added_count} new files to vector store.{Colors.RESET}")
+        # If no new files were uploaded, just return the existing project data
+        if total_new_files == 0:
+            safe_print(f"{Colors.YELLOW}{prefix} No new files were uploaded. Keeping existing vector store.{Colors.RESET}")
+            return project_data
     
-    if added_count == 0:
-        safe_print(f"{Colors.RED}{prefix} Failed to add any new files to vector store.{Colors.RESET}")
-        project_data["active"] = active_status
-        return project_data
+        # Step 3: Add new files to existing vector store
+        safe_print(f"{Colors.CYAN}{prefix} Adding new files to existing vector store...{Colors.RESET}")
     
-    # Step 4: Wait for files to be processed
-    safe_print(f"{Colors.CYAN}{prefix} Waiting for files to be processed...{Colors.RESET}")
-    all_completed = False
-    max_checks = OPENAI_PROCESSING_MAX_CHECKS
-    check_interval = OPENAI_PROCESSING_CHECK_INTERVAL
-    check_count = 0
-    
-    while not all_completed and check_count < max_checks:
-        check_count += 1
-        all_completed = check_files_processing_status(client, vector_store_id, prefix)
-        
-        if not all_completed:
-            safe_print(f"{Colors.CYAN}{prefix} Files still processing. Checking again in {check_interval} seconds... (Check {check_count}/{max_checks}){Colors.RESET}")
-            time.sleep(check_interval)
-    
-    # Merge new file IDs with existing file IDs
-    merged_file_ids = {
-        "readme": new_file_ids["readme"] or existing_file_ids.get("readme"),
-        "markdown_files": existing_file_ids.get("markdown_files", []) + new_file_ids["markdown_files"],
-        "summary_files": existing_file_ids.get("summary_files", []) + new_file_ids["summary_files"]
-    }
+        # Collect all new file IDs
+        all_new_file_ids = []
+        if new_file_ids["readme"]:
+            all_new_file_ids.append(new_file_ids["readme"])
+        all_new_file_ids.extend(new_file_ids["markdown_files"])
+        all_new_file_ids.extend(new_file_ids["summary_files"])
     
-    # Update project tracking with updated vector store info
-    vector_store_info = {
-        "id": vector_store_id,
-        "name": existing_vector_store.get("name"),
-        "file_count": existing_vector_store.get("file_count", 0) + added_count,
-        "processing_completed": all_completed
-    }
+        added_count, batch_id = add_files_to_vector_store(client, vector_store_id, all_new_file_ids, prefix)
+        safe_print(f"{Colors.GREEN}{prefix} Added {added_count} new files to vector store.{Colors.RESET}")
     
-    # Create update data that preserves project parameters
-    update_data = {
-        "openai_integration": {
-            "status": "success",
-            "file_ids": merged_file_ids,
-            "vector_store": vector_store_info
-        }
-    }
+        if added_count == 0:
+            safe_print(f"{Colors.RED}{prefix} Failed to add any new files to vector store.{Colors.RESET}")
+            return project_data
     
-    # Make sure we're not overwriting any other project data
-    # Only update the openai_integration field in the tracking file
-    update_project_in_tracking(project_id, update_data)
+        # Step 4: Wait for files to be processed
+        safe_print(f"{Colors.CYAN}{prefix} Waiting for files to be processed...{Colors.RESET}")
+        all_completed = wait_for_files_processing(client, vector_store_id, prefix, batch_id=batch_id)
     
-    # Add the vector store info to the project data
-    project_data["openai_integration"] = {
-        "status": "success",
-        "file_ids": merged_file_ids,
-        "vector_store": vector_store_info
-    }
+        # Merge new file IDs with existing file IDs
+        merged_file_ids = {
+            "readme": new_file_ids["readme"] or existing_file_ids.get("readme"),
+            "markdown_files": existing_file_ids.get("markdown_files", []) + new_file_ids["markdown_files"],
+            "summary_files": existing_file_ids.get("summary_files", []) + new_file_ids["summary_files"]
+        }
     
-    # Ensure active status is preserved
-    project_data["active"] = active_status
+        # Update project tracking with updated vector store info
+        vector_store_info = {
+            "id": vector_store_id,
+            "name": existing_vector_store.get("name"),
+            "file_count": existing_vector_store.get("file_count", 0) + added_count,
+            "processing_completed": all_completed
+        }
     
-    if all_completed:
-        safe_print(f"{Colors.BOLD}{Colors.GREEN}{prefix} All files have been processed successfully!{Colors.RESET}")
-    else:
-        safe_print(f"{Colors.YELLOW}{prefix} Some files are still not processed after maximum wait time. You can check status later.{Colors.RESET}")
+        # Create update data that preserves project parameters
+        update_data = {
+            "openai_integration": {
+                "status": "success",
+                "file_ids": merged_file_ids,
+                "vector_store": vector_store_info,
+                "uploaded_hashes": uploaded_hashes
+            }
+        }
     
-    return project_data
-
-def add_questions_to_project(project_data, new_questions, args):
-    """
+        # Make sure we're not overwriting any other project data
+        # Only update the openai_integration field in the tracking file
+        update_project_in_tracking(project_id, update_data)
+    
+        # Add the vector store info to the project data
+        project_data["openai_integration"] = {
+            "status": "success",
+            "file_ids": merged_file_ids,
+            "vector_store": vector_store_info,
+            "uploaded_hashes": uploaded_hashes
+        }
+    
+        if all_completed:
+            safe_print(f"{Colors.BOLD}{Colors.GREEN}{prefix} All files have been processed successfully!{Colors.RESET}")
+        else:
+            safe_print(f"{Colors.YELLOW}{prefix} Some files are still not processed after maximum wait time. You can check status later.{Colors.RESET}")
+    
+        return project_data
+
+def add_questions_to_project(project_data, new_questions, args):
+    """
     Add new questions to an existing project.
     
     Args:
@@ -1525,192 +1810,177 @@ def add_questions_to_project(project_data, new_questions, args):
     Returns:
         dict: Updated project data or None if failed
     """
-    try:
-        # Preserve the active status
-        active_status = project_data.get("active", True)
-        
-        # Get the project folder
-        master_folder = get_project_folder(project_data)
-        if not master_folder:
-            return None
+    with preserve_active(project_data):
+        try:
+            # Get the project folder
+            master_folder = get_project_folder(project_data, verify=args.verify_folders)
+            if not master_folder:
+                return None
             
-        # Get existing questions
-        existing_questions = project_data.get("parameters", {}).get("questions", [])
-        
-        # Calculate starting question number for new questions
-        start_question_number = len(existing_questions) + 1
+            # Get existing questions
+            existing_questions = project_data.get("parameters", {}).get("questions", [])
         
-        # Update the project data with combined questions
-        all_questions = existing_questions + new_questions
-        project_data["parameters"]["questions"] = all_questions
+            # Calculate starting question number for new questions
+            start_question_number = len(existing_questions) + 1
         
-        # Update the project status
-        project_data["status"] = "in_progress"
+            # Update the project data with combined questions
+            all_questions = existing_questions + new_questions
+            project_data["parameters"]["questions"] = all_questions
         
-        # Ensure active status is preserved
-        project_data["active"] = active_status
+            # Update the project status
+            project_data["status"] = "in_progress"
         
-        # Prepare updates for the tracking file
-        # Get full parameters to preserve fields like topic, perspective, and depth
-        parameters_update = project_data.get("parameters", {}).copy()
-        parameters_update["questions"] = all_questions
+            # Prepare updates for the tracking file
+            # Get full parameters to preserve fields like topic, perspective, and depth
+            parameters_update = project_data.get("parameters", {}).copy()
+            parameters_update["questions"] = all_questions
         
-        # Update the project in the tracking file
-        update_project_in_tracking(project_data["id"], {
-            "parameters": parameters_update,
-            "status": "in_progress",
-            "active": active_status
-        })
+            # Update the project in the tracking file
+            update_project_in_tracking(project_data["id"], {
+                "parameters": parameters_update,
+                "status": "in_progress",
+                "active": project_data.get("active", True)
+            })
         
-        # Update the README to include new questions
-        readme_path = os.path.join(master_folder, "README.md")
-        if os.path.exists(readme_path):
-            with open(readme_path, "r", encoding="utf-8") as f:
-                readme_content = f.read()
-                
-            # Check if README already has a Research Questions section
-            if "## Research Questions" in readme_content:
-                # Split the content at the Research Questions section
-                parts = readme_content.split("## Research Questions")
-                before_questions = parts[0] + "## Research Questions\n\n"
-                
-                # Create updated questions list
-                questions_content = ""
-                for i, q in enumerate(all_questions, 1):
-                    questions_content += f"{i}. {q}\n"
+            # Update the README to include new questions
+            readme_path = os.path.join(master_folder, "README.md")
+            if os.path.exists(readme_path):
+                with open(readme_path, "r", encoding="utf-8") as f:
+                    readme_content = f.read()
+            
+                # Build the updated questions list in one pass
+                questions_content = "".join(f"{i}. {q}\n" for i, q in enumerate(all_questions, 1))
                 
-                # Find the next section if any
-                after_questions = ""
-                if len(parts) > 1 and "##" in parts[1]:
-                    after_parts = parts[1].split("##", 1)
-                    after_questions = "##" + after_parts[1]
+                # Check if README already has a Research Questions section
+                section_header = "## Research Questions"
+                section_start = readme_content.find(section_header)
+                if section_start != -1:
+                    before_questions = readme_content[:section_start + len(section_header)] + "\n\n"
                 
-                # Write updated README
-                with open(readme_path, "w", encoding="utf-8") as f:
-                    f.write(before_questions + questions_content + "\n" + after_questions)
-            else:
-                # Append Research Questions section to README
-                with open(readme_path, "a", encoding="utf-8") as f:
-                    f.write("\n## Research Questions\n\n")
-                    for i, q in enumerate(all_questions, 1):
-                        f.write(f"{i}. {q}\n")
-        
-        # Process the new questions
-        safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== PROCESSING NEW QUESTIONS ========{Colors.RESET}")
-        safe_print(f"{Colors.CYAN}Adding {len(new_questions)} new questions to existing project{Colors.RESET}")
-        
-        # Load the rate limit settings
-        RATE_LIMIT_QUESTIONS_PER_WORKER = int(os.getenv('RATE_LIMIT_QUESTIONS_PER_WORKER', 10))
-        THREAD_STAGGER_DELAY = float(os.getenv('THREAD_STAGGER_DELAY', 5.0))
-        
-        # Override with command line args if provided
-        if args.stagger_delay is not None:
-            THREAD_STAGGER_DELAY = args.stagger_delay
-            
-        # Calculate max workers based on number of questions and rate limit
-        if args.max_workers is not None:
-            max_workers = args.max_workers
-        else:
-            max_workers = max(1, int(len(new_questions) / RATE_LIMIT_QUESTIONS_PER_WORKER))
-        
-        # Get topic and perspective if available
-        topic = project_data.get("parameters", {}).get("topic")
-        perspective = project_data.get("parameters", {}).get("perspective")
-        
-        # Process each new question
-        all_question_results = []
-        successful_questions = 0
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Create a future for each question
-            futures = {}
-            for i, question in enumerate(new_questions, start_question_number):
-                # Stagger the thread starts to avoid API rate limits
-                if i > start_question_number and THREAD_STAGGER_DELAY > 0:
-                    time.sleep(THREAD_STAGGER_DELAY)
+                    # Keep everything from the next section onwards, if any
+                    next_section = readme_content.find("\n## ", section_start + len(section_header))
+                    after_questions = readme_content[next_section + 1:] if next_section != -1 else ""
                 
-                future = executor.submit(
-                    research_pipeline,
-                    question,
-                    master_folder,
-                    i,
-                    len(all_questions),
-                    topic,
-                    perspective
-                )
-                futures[future] = (i, question)
+                    # Write updated README
+                    with open(readme_path, "w", encoding="utf-8") as f:
+                        f.write(before_questions + questions_content + "\n" + after_questions)
+                else:
+                    # Append Research Questions section to README
+                    with open(readme_path, "a", encoding="utf-8") as f:
+                        f.write(f"\n{section_header}\n\n{questions_content}")
+        
+            # Process the new questions
+            safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== PROCESSING NEW QUESTIONS ========{Colors.RESET}")
+            safe_print(f"{Colors.CYAN}Adding {len(new_questions)} new questions to existing project{Colors.RESET}")
+        
+            # Load the rate limit settings
+            RATE_LIMIT_QUESTIONS_PER_WORKER = int(os.getenv('RATE_LIMIT_QUESTIONS_PER_WORKER', 10))
+            THREAD_STAGGER_DELAY = float(os.getenv('THREAD_STAGGER_DELAY', 5.0))
+        
+            # Override with command line args if provided
+            if args.stagger_delay is not None:
+                THREAD_STAGGER_DELAY = args.stagger_delay
             
-            # Collect results as they complete
-            for future in as_completed(futures):
-                i, question = futures[future]
-                try:
-                    success, research_response, citations = future.result()
-                    all_question_results.append((success, research_response, citations))
+            # Calculate max workers based on number of questions and rate limit
+            if args.max_workers is not None:
+                max_workers = args.max_workers
+            else:
+                max_workers = calculate_max_workers(len(new_questions), RATE_LIMIT_QUESTIONS_PER_WORKER, args.max_concurrency)
+        
+            # Get topic and perspective if available
+            topic = project_data.get("parameters", {}).get("topic")
+            perspective = project_data.get("parameters", {}).get("perspective")
+        
+            # Process each new question
+            all_question_results = []
+            successful_questions = 0
+        
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Create a future for each question
+                futures = {}
+                # Space out question starts to avoid API rate limits. Workers wait for their
+                # own start slot so submission doesn't block collecting early results.
+                start_limiter = StartRateLimiter(THREAD_STAGGER_DELAY)
+                for i, question in enumerate(new_questions, start_question_number):
+                    future = executor.submit(
+                        start_limiter.call,
+                        research_pipeline,
+                        question,
+                        master_folder,
+                        i,
+                        len(all_questions),
+                        topic,
+                        perspective
+                    )
+                    futures[future] = (i, question)
+            
+                # Collect results as they complete
+                for future in iter_completed(futures):
+                    i, question = futures.pop(future)  # Drop the finished future so its result can be freed
+                    try:
+                        # The full response is already saved under response/, so only the citations are kept
+                        success, _, citations = future.result()
+                        all_question_results.append((success, None, citations))
                     
-                    if success:
-                        successful_questions += 1
+                        if success:
+                            successful_questions += 1
                         
-                except Exception as e:
-                    safe_print(f"{Colors.RED}Error processing question {i}: {str(e)}{Colors.RESET}")
-                    all_question_results.append((False, None, []))
-        
-        # Extract and deduplicate citations from all questions
-        safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== EXTRACTING CITATIONS FROM NEW QUESTIONS ========{Colors.RESET}")
-        citation_map, unique_citation_count = extract_and_deduplicate_citations(all_question_results)
-        
-        # Process citations if there are any
-        if citation_map:
-            # Prioritize citations based on reference count
-            prioritized_citation_map, skipped_count = prioritize_citations(citation_map, args.max_citations)
-            
-            # Check for skipped citations
-            if skipped_count > 0:
-                safe_print(f"{Colors.YELLOW}Skipping {skipped_count} less referenced citations to stay within limit of {args.max_citations}{Colors.RESET}")
-            
-            # Process each unique citation
-            safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== PROCESSING CITATIONS FROM NEW QUESTIONS ========{Colors.RESET}")
-            citation_results = process_citations(prioritized_citation_map, master_folder, max_workers, THREAD_STAGGER_DELAY)
-            
-            # Create indexes
-            master_index_path = create_master_index(master_folder, all_questions, all_question_results)
-            citation_index_path = create_citation_index(master_folder, citation_map, citation_results, skipped_count)
-            
-            # Consolidate summaries
-            safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== CONSOLIDATING SUMMARIES ========{Colors.RESET}")
-            consolidate_summary_files(master_folder, "executive_summary", "consolidated_executive_summaries.md", "Consolidated Executive Summaries")
-            consolidate_summary_files(master_folder, "research_summary", "consolidated_research_summaries.md", "Consolidated Research Summaries")
-            
-            # Move master index and citation index to summaries folder
-            move_file(master_index_path, os.path.join(master_folder, "summaries"))
-            move_file(citation_index_path, os.path.join(master_folder, "summaries"))
-        else:
-            safe_print(f"{Colors.YELLOW}No citations found in new questions. Skipping citation processing phase.{Colors.RESET}")
-            # Create the master index even if there are no citations
-            master_index_path = create_master_index(master_folder, all_questions, all_question_results)
-            
-            # Consolidate summary files and move master index
-            safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== CONSOLIDATING SUMMARIES ========{Colors.RESET}")
-            consolidate_summary_files(master_folder, "executive_summary", "consolidated_executive_summaries.md", "Consolidated Executive Summaries")
-            consolidate_summary_files(master_folder, "research_summary", "consolidated_research_summaries.md", "Consolidated Research Summaries")
-            move_file(master_index_path, os.path.join(master_folder, "summaries"))
+                    except Exception as e:
+                        safe_print(f"{Colors.RED}Error processing question {i}: {str(e)}{Colors.RESET}")
+                        all_question_results.append((False, None, []))
+        
+            # Extract and deduplicate citations from all questions and prioritize them by reference count
+            # With --max-citations 0 the citations are never used, so don't extract them at all
+            if args.max_citations > 0:
+                safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== EXTRACTING CITATIONS FROM NEW QUESTIONS ========{Colors.RESET}")
+                citation_map, prioritized_citation_map, skipped_count = extract_and_prioritize_citations(all_question_results, args.max_citations)
+            else:
+                citation_map, prioritized_citation_map, skipped_count = {}, {}, 0
+        
+            # Process citations if there are any
+            if citation_map:
+                # Check for skipped citations
+                if skipped_count > 0:
+                    safe_print(f"{Colors.YELLOW}Skipping {skipped_count} less referenced citations to stay within limit of {args.max_citations}{Colors.RESET}")
+            
+                # Process each unique citation
+                safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== PROCESSING CITATIONS FROM NEW QUESTIONS ========{Colors.RESET}")
+                citation_results = process_citations(prioritized_citation_map, master_folder, max_workers)
+            
+                # Create indexes in the summaries folder and consolidate summaries
+                create_indexes_and_summaries(
+                    master_folder, all_questions, all_question_results,
+                    citation_map, citation_results, skipped_count,
+                    serial=args.serial_post_process
+                )
+            else:
+                if args.max_citations > 0:
+                    safe_print(f"{Colors.YELLOW}No citations found in new questions. Skipping citation processing phase.{Colors.RESET}")
+                else:
+                    safe_print(f"{Colors.YELLOW}Citation processing disabled (--max-citations 0). Skipping citation phase.{Colors.RESET}")
+                # Create the master index even if there are no citations
+                create_indexes_and_summaries(
+                    master_folder, all_questions, all_question_results,
+                    serial=args.serial_post_process
+                )
         
-        # Process files with OpenAI if enabled
-        if ENABLE_OPENAI_INTEGRATION:
-            # Use our new function that only processes the new files
-            project_data = process_new_files_with_openai(master_folder, project_data, start_question_number, len(new_questions))
+            # Process files with OpenAI if enabled
+            if ENABLE_OPENAI_INTEGRATION:
+                # Use our new function that only processes the new files
+                project_data = process_new_files_with_openai(master_folder, project_data, start_question_number, len(new_questions))
         
-        # Update project status to completed
-        project_data["status"] = "completed"
-        update_project_in_tracking(project_data["id"], {"status": "completed"})
+            # Update project status to completed
+            project_data["status"] = "completed"
+            update_project_in_tracking(project_data["id"], {"status": "completed"})
         
-        safe_print(f"\n{Colors.BOLD}{Colors.GREEN}Successfully added {len(new_questions)} new questions to project.{Colors.RESET}")
-        return project_data
+            safe_print(f"\n{Colors.BOLD}{Colors.GREEN}Successfully added {len(new_questions)} new questions to project.{Colors.RESET}")
+            return project_data
         
-    except Exception as e:
-        safe_print(f"{Colors.RED}Error adding questions to project: {str(e)}{Colors.RESET}")
-        with print_lock:
-            traceback.print_exc()
-        return None
+        except Exception as e:
+            safe_print(f"{Colors.RED}Error adding questions to project: {str(e)}{Colors.RESET}")
+            with print_lock:
+                traceback.print_exc()
+            return None
 
 def save_project_tracking(data):
     """
@@ -1725,13 +1995,8 @@ def save_project_tracking(data):
     # Update the last_updated timestamp
     data["last_updated"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
     
-    try:
-        with open(RESEARCH_PROJECTS_FILE, "w") as f:
-            json.dump(data, f, indent=2)
-        return True
-    except Exception as e:
-        safe_print(f"{Colors.YELLOW}Warning: Could not save project tracking file: {str(e)}{Colors.RESET}")
-        return False
+    with tracking_lock:
+        return _write_project_tracking(copy.deepcopy(data))
 
 def add_project_to_tracking(project_data):
     """
@@ -1744,14 +2009,16 @@ def add_project_to_tracking(project_data):
         bool: True if successful, False otherwise
     """
     try:
-        # Load existing tracking data
-        tracking_data = load_project_tracking()
-        
-        # Add the new project
-        tracking_data["projects"].append(project_data)
-        
-        # Save the updated tracking data
-        return save_project_tracking(tracking_data)
+        with tracking_lock:
+            # Append to the cached tracking data instead of copying all of it
+            tracking_data = _read_project_tracking()
+            
+            # Add the new project
+            tracking_data["projects"].append(copy.deepcopy(project_data))
+            
+            # Save the updated tracking data
+            tracking_data["last_updated"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            return _write_project_tracking(tracking_data)
     except Exception as e:
         safe_print(f"{Colors.YELLOW}Warning: Could not add project to tracking file: {str(e)}{Colors.RESET}")
         return False
@@ -1773,16 +2040,22 @@ def update_project_in_tracking(project_id, updates):
         bool: True if successful, False otherwise
     """
     try:
-        # Load existing tracking data
-        tracking_data = load_project_tracking()
-        
-        # Find the project by ID
-        for project in tracking_data["projects"]:
-            if project.get("id") == project_id:
-                # Update the project data
-                project.update(updates)
-                # Save the updated tracking data
-                return save_project_tracking(tracking_data)
+        with tracking_lock:
+            # Load existing tracking data
+            tracking_data = _read_project_tracking()
+            
+            # Find the project by ID
+            for project in tracking_data["projects"]:
+                if project.get("id") == project_id:
+                    # Skip the write entirely if nothing would change
+                    if all(project.get(key) == value for key, value in updates.items()):
+                        return True
+                    
+                    # Update the project data
+                    project.update(copy.deepcopy(updates))
+                    # Save the updated tracking data
+                    tracking_data["last_updated"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+                    return _write_project_tracking(tracking_data)
         
         safe_print(f"{Colors.YELLOW}Warning: Project with ID {project_id} not found in tracking file{Colors.RESET}")
         return False
@@ -1793,6 +2066,7 @@ def update_project_in_tracking(project_id, updates):
 def create_openai_client():
     """
     Create an OpenAI client instance if OpenAI is available.
+    The client is created once and reused by later calls.
     
     Returns:
         OpenAI client or None if not available
@@ -1805,13 +2079,84 @@ def create_openai_client():
         safe_print(f"{Colors.YELLOW}OpenAI integration is not available: OPENAI_API_KEY not set in environment{Colors.RESET}")
         return None
         
+    global _openai_client
+    if _openai_client is not None:
+        return _openai_client
+        
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        return client
+        # Share one pooled HTTP client so TLS connections are reused across all calls
+        http_client = httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+        _openai_client = OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+        atexit.register(http_client.close)
+        return _openai_client
     except Exception as e:
         safe_print(f"{Colors.RED}Error creating OpenAI client: {str(e)}{Colors.RESET}")
         return None
 
+def file_sha256(file_path):
+    """
+    Compute the SHA-256 hex digest of a file's contents.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        The hex digest string
+    """
+    with open(file_path, "rb") as f:
+        # hashlib.file_digest is only available on Python 3.11+
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+@contextmanager
+def open_upload_file(file_path):
+    """
+    Open a file for upload to OpenAI.
+    Files up to OPENAI_IN_MEMORY_UPLOAD_SIZE are read with a single read() so the
+    upload has a known length and needs no further syscalls; larger files are
+    opened with a 1MB buffer instead of the 8KB default.
+    
+    Args:
+        file_path: Path to the file to upload
+        
+    Yields:
+        A value suitable for the `file` argument of client.files.create
+    """
+    with open(file_path, "rb", buffering=1 << 20) as f:
+        # Size the open file descriptor rather than stat-ing the path first
+        if os.fstat(f.fileno()).st_size <= OPENAI_IN_MEMORY_UPLOAD_SIZE:
+            # Pass the filename along so OpenAI can detect the file type
+            yield (os.path.basename(file_path), f.read())
+        else:
+            yield f
+
+def scan_markdown_files(folder):
+    """
+    List the markdown files in a folder with a single directory read.
+    
+    The os.scandir entries carry the file type from the directory listing, so
+    no per-file stat is needed, and a missing folder simply yields nothing.
+    
+    Args:
+        folder: Folder to scan
+        
+    Returns:
+        List of os.DirEntry objects for the .md files in the folder
+    """
+    try:
+        with os.scandir(folder) as entries:
+            return [entry for entry in entries if entry.name.endswith(".md") and entry.is_file()]
+    except FileNotFoundError:
+        return []
+
 def upload_file_to_openai(client, file_path, prefix=""):
     """
     Upload a file to OpenAI's API.
@@ -1827,7 +2172,7 @@ def upload_file_to_openai(client, file_path, prefix=""):
     try:
         safe_print(f"{Colors.CYAN}{prefix} Uploading file: {file_path}{Colors.RESET}")
         
-        with open(file_path, "rb") as file_content:
+        with open_upload_file(file_path) as file_content:
             result = client.files.create(
                 file=file_content,
                 purpose="assistants"
@@ -1839,7 +2184,62 @@ def upload_file_to_openai(client, file_path, prefix=""):
         safe_print(f"{Colors.RED}{prefix} Error uploading file {file_path}: {str(e)}{Colors.RESET}")
         return None
 
-def upload_files_to_openai(client, project_folder, project_id, prefix=""):
+async def upload_file_to_openai_async(async_client, file_path, semaphore, prefix=""):
+    """
+    Upload a file to OpenAI's API using the async client.
+    
+    Args:
+        async_client: The AsyncOpenAI client
+        file_path: Path to the file to upload
+        semaphore: asyncio.Semaphore limiting the number of in-flight uploads
+        prefix: Prefix for log messages
+        
+    Returns:
+        The file ID or None if failed
+    """
+    async with semaphore:
+        try:
+            safe_print(f"{Colors.CYAN}{prefix} Uploading file: {file_path}{Colors.RESET}")
+            
+            with open_upload_file(file_path) as file_content:
+                result = await async_client.files.create(
+                    file=file_content,
+                    purpose="assistants"
+                )
+                
+            safe_print(f"{Colors.GREEN}{prefix} Successfully uploaded file: {file_path}, File ID: {result.id}{Colors.RESET}")
+            return result.id
+        except Exception as e:
+            safe_print(f"{Colors.RED}{prefix} Error uploading file {file_path}: {str(e)}{Colors.RESET}")
+            return None
+
+async def _upload_files_async(file_paths, prefix=""):
+    """Upload all files on one event loop, with at most OPENAI_MAX_CONCURRENT_UPLOADS in flight."""
+    semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENT_UPLOADS)
+    # The SDK retries 429 and 5xx responses itself, with exponential backoff
+    async with AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=API_MAX_RETRIES) as async_client:
+        return await asyncio.gather(*(
+            upload_file_to_openai_async(async_client, file_path, semaphore, prefix)
+            for file_path in file_paths
+        ))
+
+def upload_files_concurrently(file_paths, prefix=""):
+    """
+    Upload several files to OpenAI concurrently.
+    
+    Args:
+        file_paths: List of paths to upload
+        prefix: Prefix for log messages
+        
+    Returns:
+        List of file IDs in the same order as file_paths (None for failed uploads)
+    """
+    if not file_paths:
+        return []
+    
+    return asyncio.run(_upload_files_async(file_paths, prefix))
+
+def upload_files_to_openai(client, project_folder, project_id, prefix="", uploaded_hashes=None):
     """
     Upload multiple files from a project folder to OpenAI.
     
@@ -1848,6 +2248,8 @@ def upload_files_to_openai(client, project_folder, project_id, prefix=""):
         project_folder: The folder containing the research project
         project_id: The ID of the project for tracking
         prefix: Prefix for log messages
+        uploaded_hashes: Optional dict that receives the SHA-256 of each uploaded file, keyed by
+            its path relative to project_folder (the manifest process_new_files_with_openai checks)
         
     Returns:
         Dictionary with uploaded file IDs
@@ -1862,37 +2264,34 @@ def upload_files_to_openai(client, project_folder, project_id, prefix=""):
             "summary_files": []
         }
         
-        # Upload README.md if it exists
-        readme_path = os.path.join(project_folder, "README.md")
-        if os.path.exists(readme_path):
-            file_id = upload_file_to_openai(client, readme_path, prefix)
-            if file_id:
-                file_ids["readme"] = file_id
+        # Collect every file to upload as (category, path)
+        files_to_upload = []
+        
+        # README.md is always written with the project; a missing one just fails its upload
+        files_to_upload.append(("readme", os.path.join(project_folder, "README.md")))
+        
+        # Markdown and summary files
+        for category, subfolder in (("markdown_files", "markdown"), ("summary_files", "summaries")):
+            for entry in scan_markdown_files(os.path.join(project_folder, subfolder)):
+                files_to_upload.append((category, entry.path))
         
-        # Upload markdown files
-        markdown_folder = os.path.join(project_folder, "markdown")
-        if os.path.exists(markdown_folder):
-            for filename in os.listdir(markdown_folder):
-                if filename.endswith(".md"):
-                    file_path = os.path.join(markdown_folder, filename)
-                    file_id = upload_file_to_openai(client, file_path, prefix)
-                    if file_id:
-                        file_ids["markdown_files"].append(file_id)
-        
-        # Upload summary files
-        summaries_folder = os.path.join(project_folder, "summaries")
-        if os.path.exists(summaries_folder):
-            for filename in os.listdir(summaries_folder):
-                if filename.endswith(".md"):
-                    file_path = os.path.join(summaries_folder, filename)
-                    file_id = upload_file_to_openai(client, file_path, prefix)
-                    if file_id:
-                        file_ids["summary_files"].append(file_id)
+        # Upload all files concurrently
+        uploaded_ids = upload_files_concurrently([path for _, path in files_to_upload], prefix)
+        for (category, file_path), file_id in zip(files_to_upload, uploaded_ids):
+            if not file_id:
+                continue
+            if uploaded_hashes is not None:
+                uploaded_hashes[os.path.relpath(file_path, project_folder)] = file_sha256(file_path)
+            if category == "readme":
+                file_ids["readme"] = file_id
+            else:
+                file_ids[category].append(file_id)
         
         # Update project tracking with file IDs
         update_data = {
             "openai_integration": {
-                "file_ids": file_ids
+                "file_ids": file_ids,
+                "uploaded_hashes": uploaded_hashes or {}
             }
         }
         update_project_in_tracking(project_id, update_data)
@@ -1902,7 +2301,7 @@ def upload_files_to_openai(client, project_folder, project_id, prefix=""):
         safe_print(f"{Colors.RED}{prefix} Error uploading files: {str(e)}{Colors.RESET}")
         return None
 
-def create_vector_store(client, name, prefix=""):
+def create_vector_store(client, name, prefix="", file_ids=None):
     """
     Create a vector store with OpenAI.
     
@@ -1910,6 +2309,7 @@ def create_vector_store(client, name, prefix=""):
         client: The OpenAI client
         name: Name for the vector store
         prefix: Prefix for log messages
+        file_ids: Optional list of uploaded file IDs to attach when the store is created
         
     Returns:
         The vector store object or None if failed
@@ -1919,7 +2319,10 @@ def create_vector_store(client, name, prefix=""):
         
     try:
         safe_print(f"{Colors.CYAN}{prefix} Creating vector store: {name}{Colors.RESET}")
-        vector_store = client.vector_stores.create(name=name)
+        if file_ids:
+            vector_store = client.vector_stores.create(name=name, file_ids=file_ids)
+        else:
+            vector_store = client.vector_stores.create(name=name)
         safe_print(f"{Colors.GREEN}{prefix} Vector store created with ID: {vector_store.id}{Colors.RESET}")
         return vector_store
     except Exception as e:
@@ -1928,7 +2331,7 @@ def create_vector_store(client, name, prefix=""):
 
 def add_files_to_vector_store(client, vector_store_id, file_ids, prefix=""):
     """
-    Add multiple files to a vector store.
+    Add multiple files to a vector store in a single file batch.
     
     Args:
         client: The OpenAI client
@@ -1937,27 +2340,23 @@ def add_files_to_vector_store(client, vector_store_id, file_ids, prefix=""):
         prefix: Prefix for log messages
         
     Returns:
-        Number of files successfully added
+        Tuple of (number of files added, file batch ID or None if failed)
     """
     if not client or not vector_store_id or not file_ids:
-        return 0
-        
-    added_count = 0
-    
-    for file_id in file_ids:
-        try:
-            client.vector_stores.files.create(
-                vector_store_id=vector_store_id,
-                file_id=file_id
-            )
-            safe_print(f"{Colors.GREEN}{prefix} Added file {file_id} to vector store{Colors.RESET}")
-            added_count += 1
-        except Exception as e:
-            safe_print(f"{Colors.RED}{prefix} Error adding file {file_id} to vector store: {str(e)}{Colors.RESET}")
+        return 0, None
     
-    return added_count
+    try:
+        batch = client.vector_stores.file_batches.create(
+            vector_store_id=vector_store_id,
+            file_ids=file_ids
+        )
+        safe_print(f"{Colors.GREEN}{prefix} Added {len(file_ids)} files to vector store in batch {batch.id}{Colors.RESET}")
+        return len(file_ids), batch.id
+    except Exception as e:
+        safe_print(f"{Colors.RED}{prefix} Error adding files to vector store: {str(e)}{Colors.RESET}")
+        return 0, None
 
-def check_files_processing_status(client, vector_store_id, prefix=""):
+def check_files_processing_status(client, vector_store_id, prefix="", first_check=False, batch_id=None):
     """
     Check if all files in a vector store have been processed.
     
@@ -1965,20 +2364,36 @@ def check_files_processing_status(client, vector_store_id, prefix=""):
         client: The OpenAI client
         vector_store_id: The ID of the vector store
         prefix: Prefix for log messages
+        first_check: Whether this is the first check after adding files. A 404 on the
+            first check just means the files aren't visible yet, so it's not an error.
+        batch_id: Optional file batch ID. When given, only that batch is checked.
         
     Returns:
         bool: True if all files are processed, False otherwise
     """
     try:
+        if batch_id:
+            # The batch object only describes our files, so it stays small however big the store gets
+            batch = client.vector_stores.file_batches.retrieve(batch_id, vector_store_id=vector_store_id)
+            counts = batch.file_counts
+            
+            # Every file has reached a final state - nothing more to wait for
+            if counts.completed + counts.failed + counts.cancelled >= counts.total or batch.status != "in_progress":
+                if counts.failed > 0:
+                    safe_print(f"{Colors.YELLOW}{prefix} Some files failed processing: {counts.failed} failed{Colors.RESET}")
+                return True
+            
+            safe_print(f"{Colors.YELLOW}{prefix} Files still processing: {counts.in_progress} in progress{Colors.RESET}")
+            return False
+        
         # Get the vector store - using updated API path
         vector_store = client.vector_stores.retrieve(vector_store_id)
         
         # Check file counts from the vector store object
-        if hasattr(vector_store, 'file_counts'):
-            # New API format
-            in_progress = vector_store.file_counts.get('in_progress', 0)
-            failed = vector_store.file_counts.get('failed', 0)
-            cancelled = vector_store.file_counts.get('cancelled', 0)
+        if getattr(vector_store, 'file_counts', None) is not None:
+            # New API format (file_counts is a model object, not a dict)
+            in_progress = getattr(vector_store.file_counts, 'in_progress', 0)
+            failed = getattr(vector_store.file_counts, 'failed', 0)
             
             # If any files are still in progress or have failed, not all are completed
             if in_progress > 0:
@@ -2000,13 +2415,129 @@ def check_files_processing_status(client, vector_store_id, prefix=""):
                 return False
             
     except Exception as e:
+        # Newly added files can briefly return 404 before they show up in the store
+        if first_check and getattr(e, "status_code", None) == 404:
+            return False
+        
         safe_print(f"{Colors.RED}{prefix} Error checking file processing status: {str(e)}{Colors.RESET}")
         # Consider it completed if we can't check (otherwise it might never complete)
         # This is a judgment call - could go either way depending on risk tolerance
         safe_print(f"{Colors.YELLOW}{prefix} Assuming processing is complete due to API error{Colors.RESET}")
         return True
 
-def process_citations(prioritized_citation_map, master_folder, max_workers, thread_stagger_delay=5.0):
+def wait_for_files_processing(client, vector_store_id, prefix="", batch_id=None):
+    """
+    Poll a vector store until all of its files have been processed.
+    
+    Uses exponential backoff with jitter: the first wait is OPENAI_PROCESSING_INITIAL_INTERVAL
+    seconds and each subsequent wait is multiplied by OPENAI_PROCESSING_BACKOFF_FACTOR, capped at
+    OPENAI_PROCESSING_CHECK_INTERVAL.
+    Small uploads finish quickly without long idle sleeps, while large batches don't poll the
+    API more often than needed.
+    
+    Args:
+        client: The OpenAI client
+        vector_store_id: The ID of the vector store
+        prefix: Prefix for log messages
+        batch_id: Optional file batch ID to poll instead of the whole vector store
+        
+    Returns:
+        bool: True if all files were processed within OPENAI_PROCESSING_MAX_CHECKS checks
+    """
+    max_checks = OPENAI_PROCESSING_MAX_CHECKS
+    interval = min(OPENAI_PROCESSING_INITIAL_INTERVAL, OPENAI_PROCESSING_CHECK_INTERVAL)
+    
+    for check_count in range(1, max_checks + 1):
+        if check_files_processing_status(client, vector_store_id, prefix, first_check=(check_count == 1), batch_id=batch_id):
+            return True
+        
+        if check_count < max_checks:
+            delay = interval + random.uniform(0, interval * 0.1)
+            safe_print(f"{Colors.CYAN}{prefix} Files still processing. Checking again in {delay:.1f} seconds... (Check {check_count}/{max_checks}){Colors.RESET}")
+            time.sleep(delay)
+            interval = min(interval * max(1.0, OPENAI_PROCESSING_BACKOFF_FACTOR), OPENAI_PROCESSING_CHECK_INTERVAL)
+    
+    return False
+
+class CitationRateLimiter:
+    """
+    All throttling for citation processing in one place:
+    - an overall cap on how many citations run at once
+    - an asynchronous token bucket per host, so requests to different hosts never
+      wait on each other while repeated requests to the same host are held to a
+      steady rate with a small burst allowance
+    - a per-host pause after a 429 response, doubling on each further 429
+    
+    Use `async with limiter.limit(host):` around each citation.
+    """
+    
+    def __init__(self, max_concurrent, rate=CITATION_PER_HOST_QPS, capacity=CITATION_PER_HOST_BURST, backoff=CITATION_RATE_LIMIT_BACKOFF):
+        """
+        Args:
+            max_concurrent: Maximum number of citations processed at once across all hosts
+            rate: Tokens added per second for each host (0 disables per-host limiting)
+            capacity: Maximum number of tokens a host can accumulate
+            backoff: Seconds to pause a host after its first 429 response
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.backoff = max(backoff, 1.0)
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        self._buckets = {}
+        self._locks = defaultdict(asyncio.Lock)
+        self._strikes = defaultdict(int)
+    
+    async def acquire(self, host):
+        """
+        Wait until a request to the given host is allowed by its token bucket.
+        
+        Args:
+            host: The host (netloc) the request is for
+        """
+        if self.rate <= 0:
+            return
+        
+        async with self._locks[host]:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (self.capacity, now))
+            if updated > now:
+                # Host is paused after a rate limit response
+                await asyncio.sleep(updated - now)
+                now = updated
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                await asyncio.sleep((1 - tokens) / self.rate)
+                now = time.monotonic()
+                tokens = 1
+            self._buckets[host] = (tokens - 1, now)
+    
+    @asynccontextmanager
+    async def limit(self, host):
+        """
+        Hold one of the overall citation slots for a request to the given host,
+        after waiting for the host's rate limit.
+        
+        Args:
+            host: The host (netloc) the request is for
+        """
+        await self.acquire(host)
+        async with self._semaphore:
+            yield
+    
+    def rate_limited(self, host):
+        """
+        Pause a host after it answered with 429, doubling the pause on each strike.
+        
+        Args:
+            host: The host (netloc) that reported rate limiting
+        """
+        self._strikes[host] += 1
+        delay = min(self.backoff * 2 ** (self._strikes[host] - 1), API_MAX_RETRY_DELAY)
+        resume = time.monotonic() + delay
+        _, updated = self._buckets.get(host, (0, resume))
+        self._buckets[host] = (0, max(updated, resume))
+
+def process_citations(prioritized_citation_map, master_folder, max_workers, rate_limit_backoff=CITATION_RATE_LIMIT_BACKOFF):
     """
     Process each unique citation in parallel.
     
@@ -2014,17 +2545,31 @@ def process_citations(prioritized_citation_map, master_folder, max_workers, thre
         prioritized_citation_map: Dictionary mapping citation URLs to question contexts
         master_folder: Path to the master folder
         max_workers: Maximum number of worker threads
-        thread_stagger_delay: Delay between starting thread in seconds
+        rate_limit_backoff: Seconds to pause a host after it answers with 429
         
     Returns:
         List of citation processing results
     """
+    return asyncio.run(_process_citations_async(prioritized_citation_map, master_folder, max_workers, rate_limit_backoff))
+
+async def _process_citations_async(prioritized_citation_map, master_folder, max_workers, rate_limit_backoff):
+    """
+    Event-loop driver for process_citations.
+    Citations are grouped by host and each host group runs as one task, working through
+    its citations in order of reference count. Different hosts run in parallel, and a
+    CitationRateLimiter applies the max_workers cap, the per-host request rate and the
+    backoff after 429 responses. The scraping and cleanup steps use blocking
+    SDK clients, so they run in the shared I/O thread pool.
+    """
     # Display citation processing parameters
     safe_print(f"{Colors.MAGENTA}Citation timeout: {CITATION_TIMEOUT} seconds per citation{Colors.RESET}")
     safe_print(f"{Colors.MAGENTA}Worker threads: {max_workers}{Colors.RESET}")
-    safe_print(f"{Colors.MAGENTA}Thread stagger delay: {thread_stagger_delay} seconds{Colors.RESET}")
+    safe_print(f"{Colors.MAGENTA}Per-host rate limit: {CITATION_PER_HOST_QPS} requests/second (burst {CITATION_PER_HOST_BURST}){Colors.RESET}")
+    safe_print(f"{Colors.MAGENTA}Rate limit backoff: {rate_limit_backoff} seconds{Colors.RESET}")
     
     # Process citations in parallel
+    total = len(prioritized_citation_map)
+    percent_factor = 100.0 / max(1, total)
     citation_results = []
     successful_citations = 0
     failed_citations = 0
@@ -2032,12 +2577,11 @@ def process_citations(prioritized_citation_map, master_folder, max_workers, thre
     
     # Create a progress tracking function
     def update_progress():
-        total = len(prioritized_citation_map)
         completed = successful_citations + failed_citations
         if total == 0:
             return
         
-        percent = int((completed / total) * 100)
+        percent = int(completed * percent_factor)
         bar_length = 40
         filled_length = int(bar_length * completed / total)
         bar = '█' * filled_length + '░' * (bar_length - filled_length)
@@ -2047,275 +2591,320 @@ def process_citations(prioritized_citation_map, master_folder, max_workers, thre
         sys.stdout.write(f"{Colors.CYAN}Progress: [{bar}] {percent}% | ✅ {successful_citations} | ❌ {failed_citations} | ⏱️ {timeout_citations} | Total: {completed}/{total}{Colors.RESET}")
         sys.stdout.flush()
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Create a future for each unique citation
-        futures = {}
-        for i, (citation_url, question_context) in enumerate(prioritized_citation_map.items(), 1):
-            # Stagger the thread starts to avoid API rate limits
-            if i > 1 and thread_stagger_delay > 0:
-                time.sleep(thread_stagger_delay)
-                
-            # For log message, show citation rank by reference count
-            ref_count = len(question_context)
-            
-            # Debug output - print the citation URL and its type
-            safe_print(f"{Colors.YELLOW}Debug - Before with_timeout - Citation {i}: {citation_url} (type: {type(citation_url)}){Colors.RESET}")
-            
-            # Use the timeout wrapper with a configurable timeout
-            # This ensures no single citation can hang the entire process
-            future = executor.submit(
-                with_timeout,
-                process_citation, 
-                citation_url,
-                question_context,
-                master_folder,
-                i,
-                len(prioritized_citation_map),
-                f"[Refs: {ref_count}]",
-                timeout=CITATION_TIMEOUT  # Pass timeout as a keyword argument
-            )
-            futures[future] = (i, citation_url, ref_count)
+    # Redraw the progress bar from its own task at most ~10 times a second,
+    # instead of on every completion
+    progress_done = asyncio.Event()
+    
+    async def refresh_progress():
+        drawn = None
+        while not progress_done.is_set():
+            counts = (successful_citations, failed_citations, timeout_citations)
+            if counts != drawn:
+                update_progress()
+                drawn = counts
+            try:
+                await asyncio.wait_for(progress_done.wait(), 0.1)
+            except asyncio.TimeoutError:
+                pass
+        update_progress()
+    
+    progress_task = asyncio.ensure_future(refresh_progress())
+    
+    rate_limiter = CitationRateLimiter(max_workers, backoff=rate_limit_backoff)
+    
+    async def run_citation(host, i, citation_url, question_context):
+        # For log message, show citation rank by reference count
+        ref_count = len(question_context)
+        
+        # Respect the overall and per-host limits to avoid rate limits
+        async with rate_limiter.limit(host):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Starting citation %d: %s (type: %s)", i, citation_url, type(citation_url))
             
-        # Collect results as they complete
-        for future in as_completed(futures):
-            i, citation_url, ref_count = futures[future]
             try:
-                result = future.result()
-                citation_results.append(result)
-                
-                # Update counters based on result
-                if result.get("success", False):
-                    successful_citations += 1
-                    success_indicator = Colors.GREEN + "✓"
-                else:
-                    failed_citations += 1
-                    success_indicator = Colors.RED + "✗"
-                    
-                    # Check if it was a timeout
-                    if result.get("error_type") == "Timeout":
-                        timeout_citations += 1
-                
-                # Update progress bar
-                update_progress()
-                
-                # Print detailed result
-                safe_print(f"\n{success_indicator} Citation {i}/{len(prioritized_citation_map)} complete: {citation_url[:60]}... (Referenced by {ref_count} questions){Colors.RESET}")
+                # Apply a configurable timeout that cancels the citation when exceeded
+                # This ensures no single citation can hang the entire process
+                result = await process_citation_with_timeout(
+                    citation_url,
+                    question_context,
+                    master_folder,
+                    i,
+                    total,
+                    f"[Refs: {ref_count}]",
+                    timeout=CITATION_TIMEOUT
+                )
                 
-                # Print error details if failed
-                if not result.get("success", False):
-                    error_msg = result.get("error", "Unknown error")
-                    safe_print(f"{Colors.RED}  ↳ Error: {error_msg}{Colors.RESET}")
-                    
+                # Back off from hosts that report rate limiting
+                citation_data = result.get("citation_data") or {}
+                if citation_data.get("status_code") == 429:
+                    rate_limiter.rate_limited(host)
+                return i, citation_url, ref_count, result, None
             except Exception as e:
+                return i, citation_url, ref_count, None, e
+    
+    # Group citations by host so each host's citations run one after another
+    # (different hosts still run in parallel)
+    host_groups = defaultdict(list)
+    for i, (citation_url, question_context) in enumerate(prioritized_citation_map.items(), 1):
+        host_groups[parse_citation_url(citation_url).netloc.lower()].append((i, citation_url, question_context))
+    
+    # Bounded so finished citations (with their scraped content) can't pile up faster than
+    # they are collected; together with the concurrency cap this bounds citations held in memory
+    completed_citations = asyncio.Queue(maxsize=max_workers)
+    
+    async def run_host_group(host, citations):
+        # Most referenced citations first
+        for i, citation_url, question_context in sorted(citations, key=lambda item: len(item[2]), reverse=True):
+            await completed_citations.put(await run_citation(host, i, citation_url, question_context))
+    
+    # Create a task for each host
+    tasks = [
+        asyncio.ensure_future(run_host_group(host, citations))
+        for host, citations in host_groups.items()
+    ]
+        
+    # Collect results as they complete
+    for _ in range(total):
+        i, citation_url, ref_count, result, error = await completed_citations.get()
+        if error is None:
+            citation_results.append(result)
+            
+            # Update counters based on result
+            if result.get("success", False):
+                successful_citations += 1
+                success_indicator = Colors.GREEN + "✓"
+            else:
                 failed_citations += 1
-                citation_results.append({
-                    "citation_id": i,
-                    "url": citation_url,
-                    "success": False,
-                    "content": f"# Error Processing Citation\n\n**Error**: {str(e)}",
-                    "error": str(e)
-                })
+                success_indicator = Colors.RED + "✗"
                 
-                # Update progress bar
-                update_progress()
+                # Check if it was a timeout
+                if result.get("error_type") == "Timeout":
+                    timeout_citations += 1
+            
+            # Print detailed result
+            safe_print(f"\n{success_indicator} Citation {i}/{total} complete: {citation_url[:60]}... (Referenced by {ref_count} questions){Colors.RESET}")
+            
+            # Print error details if failed
+            if not result.get("success", False):
+                error_msg = result.get("error", "Unknown error")
+                safe_print(f"{Colors.RED}  ↳ Error: {error_msg}{Colors.RESET}")
                 
-                # Print error
-                safe_print(f"\n{Colors.RED}✗ Citation {i}/{len(prioritized_citation_map)} failed: {citation_url[:60]}... (Referenced by {ref_count} questions){Colors.RESET}")
-                safe_print(f"{Colors.RED}  ↳ Error: {str(e)}{Colors.RESET}")
+        else:
+            failed_citations += 1
+            citation_results.append({
+                "citation_id": i,
+                "url": citation_url,
+                "success": False,
+                "content": f"# Error Processing Citation\n\n**Error**: {str(error)}",
+                "error": str(error)
+            })
+            
+            # Print error
+            safe_print(f"\n{Colors.RED}✗ Citation {i}/{total} failed: {citation_url[:60]}... (Referenced by {ref_count} questions){Colors.RESET}")
+            safe_print(f"{Colors.RED}  ↳ Error: {str(error)}{Colors.RESET}")
+    
+    await asyncio.gather(*tasks)
+    
+    # Draw the final state of the progress bar
+    progress_done.set()
+    await progress_task
     
     # Print final newline after progress bar
     print()
     
     # Count successful citations
-    safe_print(f"\n{Colors.BOLD}{Colors.GREEN}Citation processing complete: Successfully processed {successful_citations} out of {len(prioritized_citation_map)} citations.{Colors.RESET}")
+    safe_print(f"\n{Colors.BOLD}{Colors.GREEN}Citation processing complete: Successfully processed {successful_citations} out of {total} citations.{Colors.RESET}")
     
     # Print detailed statistics
     safe_print(f"{Colors.CYAN}Citation processing statistics:{Colors.RESET}")
-    safe_print(f"{Colors.CYAN}- Successful: {successful_citations} ({successful_citations/max(1, len(prioritized_citation_map))*100:.1f}%){Colors.RESET}")
-    safe_print(f"{Colors.CYAN}- Failed: {failed_citations} ({failed_citations/max(1, len(prioritized_citation_map))*100:.1f}%){Colors.RESET}")
-    safe_print(f"{Colors.CYAN}  - Timeouts: {timeout_citations} ({timeout_citations/max(1, len(prioritized_citation_map))*100:.1f}%){Colors.RESET}")
-    safe_print(f"{Colors.CYAN}  - Other errors: {failed_citations - timeout_citations} ({(failed_citations - timeout_citations)/max(1, len(prioritized_citation_map))*100:.1f}%){Colors.RESET}")
+    safe_print(f"{Colors.CYAN}- Successful: {successful_citations} ({successful_citations * percent_factor:.1f}%){Colors.RESET}")
+    safe_print(f"{Colors.CYAN}- Failed: {failed_citations} ({failed_citations * percent_factor:.1f}%){Colors.RESET}")
+    safe_print(f"{Colors.CYAN}  - Timeouts: {timeout_citations} ({timeout_citations * percent_factor:.1f}%){Colors.RESET}")
+    safe_print(f"{Colors.CYAN}  - Other errors: {failed_citations - timeout_citations} ({(failed_citations - timeout_citations) * percent_factor:.1f}%){Colors.RESET}")
     
     return citation_results
 
-def process_files_with_openai(master_folder, project_data):
+def process_files_with_openai(master_folder, project_data, *, enable_openai=None):
     """
     Process research files with OpenAI: upload files, create vector store, and update tracking.
     
     Args:
         master_folder: Folder containing the research project
         project_data: Project data dictionary
+        enable_openai: Override ENABLE_OPENAI_INTEGRATION for this call (None uses the setting)
         
     Returns:
         Updated project data with OpenAI integration info
     """
-    # Preserve the active status if it exists
-    active_status = project_data.get("active", True)
+    if enable_openai is None:
+        enable_openai = ENABLE_OPENAI_INTEGRATION
     
-    if not ENABLE_OPENAI_INTEGRATION:
-        safe_print(f"{Colors.YELLOW}OpenAI integration is disabled. Set ENABLE_OPENAI_INTEGRATION=true to enable.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "disabled"}
-        project_data["active"] = active_status
-        return project_data
+    with preserve_active(project_data):
+        if not enable_openai:
+            safe_print(f"{Colors.YELLOW}OpenAI integration is disabled. Set ENABLE_OPENAI_INTEGRATION=true to enable.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "disabled"}
+            return project_data
         
-    if not OPENAI_AVAILABLE:
-        safe_print(f"{Colors.YELLOW}OpenAI package is not installed. Run 'pip install openai' to enable this feature.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "unavailable", "reason": "openai package not installed"}
-        project_data["active"] = active_status
-        return project_data
+        if not OPENAI_AVAILABLE:
+            safe_print(f"{Colors.YELLOW}OpenAI package is not installed. Run 'pip install openai' to enable this feature.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "unavailable", "reason": "openai package not installed"}
+            return project_data
         
-    if not OPENAI_API_KEY:
-        safe_print(f"{Colors.YELLOW}OPENAI_API_KEY is not set in environment. Add it to your .env file.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "unavailable", "reason": "api key not configured"}
-        project_data["active"] = active_status
-        return project_data
+        if not OPENAI_API_KEY:
+            safe_print(f"{Colors.YELLOW}OPENAI_API_KEY is not set in environment. Add it to your .env file.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "unavailable", "reason": "api key not configured"}
+            return project_data
     
-    # Create OpenAI client
-    client = create_openai_client()
-    if not client:
-        safe_print(f"{Colors.RED}Failed to create OpenAI client. OpenAI integration will be skipped.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "error", "reason": "client creation failed"}
-        project_data["active"] = active_status
-        return project_data
+        # Create OpenAI client
+        client = create_openai_client()
+        if not client:
+            safe_print(f"{Colors.RED}Failed to create OpenAI client. OpenAI integration will be skipped.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "error", "reason": "client creation failed"}
+            return project_data
     
-    prefix = "[OpenAI]"
-    safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== PHASE 5: OPENAI FILE PROCESSING ========{Colors.RESET}")
+        prefix = "[OpenAI]"
+        safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== PHASE 5: OPENAI FILE PROCESSING ========{Colors.RESET}")
     
-    # Get project ID
-    project_id = project_data.get("id")
-    if not project_id:
-        safe_print(f"{Colors.RED}{prefix} Project ID not found in project data. OpenAI integration will be skipped.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "error", "reason": "project id missing"}
-        project_data["active"] = active_status
-        return project_data
+        # Get project ID
+        project_id = project_data.get("id")
+        if not project_id:
+            safe_print(f"{Colors.RED}{prefix} Project ID not found in project data. OpenAI integration will be skipped.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "error", "reason": "project id missing"}
+            return project_data
     
-    # Step 1: Upload files to OpenAI
-    safe_print(f"{Colors.CYAN}{prefix} Uploading files to OpenAI...{Colors.RESET}")
-    file_ids = upload_files_to_openai(client, master_folder, project_id, prefix)
+        # Step 1: Upload files to OpenAI
+        safe_print(f"{Colors.CYAN}{prefix} Uploading files to OpenAI...{Colors.RESET}")
+        # Record each uploaded file's digest so later add-questions runs skip unchanged files
+        uploaded_hashes = {}
+        file_ids = upload_files_to_openai(client, master_folder, project_id, prefix, uploaded_hashes)
     
-    if not file_ids:
-        safe_print(f"{Colors.RED}{prefix} Failed to upload files to OpenAI.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "error", "reason": "file upload failed"}
-        project_data["active"] = active_status
-        return project_data
+        if not file_ids:
+            safe_print(f"{Colors.RED}{prefix} Failed to upload files to OpenAI.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "error", "reason": "file upload failed"}
+            return project_data
     
-    # Count total uploaded files
-    total_files = (1 if file_ids["readme"] else 0) + len(file_ids["markdown_files"]) + len(file_ids["summary_files"])
-    safe_print(f"{Colors.GREEN}{prefix} Successfully uploaded {total_files} files to OpenAI.{Colors.RESET}")
+        # Count total uploaded files
+        total_files = (1 if file_ids["readme"] else 0) + len(file_ids["markdown_files"]) + len(file_ids["summary_files"])
+        safe_print(f"{Colors.GREEN}{prefix} Successfully uploaded {total_files} files to OpenAI.{Colors.RESET}")
     
-    # If no files were uploaded, skip vector store creation
-    if total_files == 0:
-        safe_print(f"{Colors.YELLOW}{prefix} No files were uploaded. Skipping vector store creation.{Colors.RESET}")
-        project_data["openai_integration"] = {"status": "no_files", "file_ids": file_ids}
-        project_data["active"] = active_status
-        return project_data
+        # If no files were uploaded, skip vector store creation
+        if total_files == 0:
+            safe_print(f"{Colors.YELLOW}{prefix} No files were uploaded. Skipping vector store creation.{Colors.RESET}")
+            project_data["openai_integration"] = {"status": "no_files", "file_ids": file_ids}
+            return project_data
     
-    # Step 2: Create vector store
-    # Generate a name for the vector store based on topic or questions
-    if project_data.get("parameters", {}).get("topic"):
-        topic = project_data["parameters"]["topic"]
-    else:
-        # Use first question as topic (truncated)
-        first_question = project_data.get("parameters", {}).get("questions", ["Research"])[0]
-        topic = first_question[:30].replace("?", "").strip()
+        # Step 2: Name the vector store
+        # Generate a name for the vector store based on topic or questions
+        if project_data.get("parameters", {}).get("topic"):
+            topic = project_data["parameters"]["topic"]
+        else:
+            # Use first question as topic (truncated)
+            first_question = project_data.get("parameters", {}).get("questions", ["Research"])[0]
+            topic = first_question[:30].replace("?", "").strip()
+    
+        timestamp = project_data.get("timestamp", "").translate(VECTOR_STORE_TIMESTAMP_TABLE)
+        vector_store_name = f"{topic.replace(' ', '_')}_{timestamp}"[:50]
+    
+        # Collect all file IDs
+        all_file_ids = []
+        if file_ids["readme"]:
+            all_file_ids.append(file_ids["readme"])
+        all_file_ids.extend(file_ids["markdown_files"])
+        all_file_ids.extend(file_ids["summary_files"])
+    
+        # Step 3: Create the vector store with every file attached in the same request
+        safe_print(f"{Colors.CYAN}{prefix} Creating vector store: {vector_store_name}{Colors.RESET}")
+        vector_store = create_vector_store(client, vector_store_name, prefix, file_ids=all_file_ids)
+    
+        if not vector_store:
+            safe_print(f"{Colors.RED}{prefix} Failed to create vector store.{Colors.RESET}")
+            project_data["openai_integration"] = {
+                "status": "partial",
+                "file_ids": file_ids,
+                "reason": "vector store creation failed"
+            }
+            return project_data
     
-    timestamp = project_data.get("timestamp", "").replace(":", "").replace("-", "").replace("T", "_").replace("Z", "")
-    vector_store_name = f"{topic}_{timestamp}".replace(" ", "_")[:50]
+        added_count = len(all_file_ids)
+        safe_print(f"{Colors.GREEN}{prefix} Added {added_count} files to vector store.{Colors.RESET}")
     
-    safe_print(f"{Colors.CYAN}{prefix} Creating vector store: {vector_store_name}{Colors.RESET}")
-    vector_store = create_vector_store(client, vector_store_name, prefix)
+        # Step 4: Wait for files to be processed
+        # The store was just created with only these files, so its file counts describe this batch
+        safe_print(f"{Colors.CYAN}{prefix} Waiting for files to be processed...{Colors.RESET}")
+        all_completed = wait_for_files_processing(client, vector_store.id, prefix)
     
-    if not vector_store:
-        safe_print(f"{Colors.RED}{prefix} Failed to create vector store.{Colors.RESET}")
-        project_data["openai_integration"] = {
-            "status": "partial",
-            "file_ids": file_ids,
-            "reason": "vector store creation failed"
+        # Update project tracking with vector store info
+        vector_store_info = {
+            "id": vector_store.id,
+            "name": vector_store_name,
+            "file_count": added_count,
+            "processing_completed": all_completed
         }
-        project_data["active"] = active_status
-        return project_data
-    
-    # Step 3: Add files to vector store
-    safe_print(f"{Colors.CYAN}{prefix} Adding files to vector store...{Colors.RESET}")
-    
-    # Collect all file IDs
-    all_file_ids = []
-    if file_ids["readme"]:
-        all_file_ids.append(file_ids["readme"])
-    all_file_ids.extend(file_ids["markdown_files"])
-    all_file_ids.extend(file_ids["summary_files"])
-    
-    added_count = add_files_to_vector_store(client, vector_store.id, all_file_ids, prefix)
-    safe_print(f"{Colors.GREEN}{prefix} Added {added_count} files to vector store.{Colors.RESET}")
     
-    if added_count == 0:
-        safe_print(f"{Colors.RED}{prefix} Failed to add any files to vector store.{Colors.RESET}")
-        project_data["openai_integration"] = {
-            "status": "partial",
-            "file_ids": file_ids,
-            "vector_store": {
-                "id": vector_store.id,
-                "name": vector_store_name,
-                "file_count": 0
-            },
-            "reason": "no files added to vector store"
+        update_data = {
+            "openai_integration": {
+                "status": "success",
+                "file_ids": file_ids,
+                "vector_store": vector_store_info,
+                "uploaded_hashes": uploaded_hashes
+            }
         }
-        project_data["active"] = active_status
-        return project_data
-    
-    # Step 4: Wait for files to be processed
-    safe_print(f"{Colors.CYAN}{prefix} Waiting for files to be processed...{Colors.RESET}")
-    all_completed = False
-    max_checks = OPENAI_PROCESSING_MAX_CHECKS
-    check_interval = OPENAI_PROCESSING_CHECK_INTERVAL
-    check_count = 0
-    
-    while not all_completed and check_count < max_checks:
-        check_count += 1
-        all_completed = check_files_processing_status(client, vector_store.id, prefix)
-        
-        if not all_completed:
-            safe_print(f"{Colors.CYAN}{prefix} Files still processing. Checking again in {check_interval} seconds... (Check {check_count}/{max_checks}){Colors.RESET}")
-            time.sleep(check_interval)
-    
-    # Update project tracking with vector store info
-    vector_store_info = {
-        "id": vector_store.id,
-        "name": vector_store_name,
-        "file_count": added_count,
-        "processing_completed": all_completed
-    }
     
-    # Preserve the active status if it exists
-    active_status = project_data.get("active", True)
+        # Update the project with this info
+        update_project_in_tracking(project_id, update_data)
     
-    update_data = {
-        "openai_integration": {
+        # Add the vector store info to the project data
+        project_data["openai_integration"] = {
             "status": "success",
             "file_ids": file_ids,
-            "vector_store": vector_store_info
+            "vector_store": vector_store_info,
+            "uploaded_hashes": uploaded_hashes
         }
-    }
-    
-    # Update the project with this info
-    update_project_in_tracking(project_id, update_data)
     
-    # Add the vector store info to the project data
-    project_data["openai_integration"] = {
-        "status": "success",
-        "file_ids": file_ids,
-        "vector_store": vector_store_info
-    }
+        if all_completed:
+            safe_print(f"{Colors.BOLD}{Colors.GREEN}{prefix} All files have been processed successfully!{Colors.RESET}")
+        else:
+            safe_print(f"{Colors.YELLOW}{prefix} Some files are still not processed after maximum wait time. You can check status later.{Colors.RESET}")
     
-    # Ensure active status is preserved
-    project_data["active"] = active_status
+        return project_data
+
+# Domains that are known to be hard to scrape (matched against the URL host and its parent domains)
+PROBLEMATIC_DOMAINS = frozenset([
+    'linkedin.com', 'facebook.com', 'instagram.com',  # Social media
+    'jstor.org', 'springer.com', 'sciencedirect.com',  # Academic paywalls
+    'pdfs.semanticscholar.org',  # PDF repositories
+    'drive.google.com', 'docs.google.com'  # Google Docs/Drive
+])
+
+@functools.lru_cache(maxsize=4096)
+def parse_citation_url(url):
+    """
+    Parse a citation URL, caching results since the same URLs are checked repeatedly.
     
-    if all_completed:
-        safe_print(f"{Colors.BOLD}{Colors.GREEN}{prefix} All files have been processed successfully!{Colors.RESET}")
-    else:
-        safe_print(f"{Colors.YELLOW}{prefix} Some files are still not processed after maximum wait time. You can check status later.{Colors.RESET}")
+    Args:
+        url: The URL to parse
+        
+    Returns:
+        The urllib.parse.ParseResult for the URL
+    """
+    return urlparse(url)
+
+def find_problematic_domain(host):
+    """
+    Find which entry of PROBLEMATIC_DOMAINS a host belongs to, if any.
     
-    return project_data
+    Args:
+        host: Lowercase host name, e.g. "www.linkedin.com"
+        
+    Returns:
+        The matching problematic domain, or None
+    """
+    labels = host.split('.')
+    for i in range(len(labels) - 1):
+        suffix = '.'.join(labels[i:])
+        if suffix in PROBLEMATIC_DOMAINS:
+            return suffix
+    return None
 
 def test_citation_url(url, timeout=10):
     """
@@ -2330,7 +2919,7 @@ def test_citation_url(url, timeout=10):
     """
     # Validate URL format
     try:
-        parsed = urlparse(url)
+        parsed = parse_citation_url(url)
         if not all([parsed.scheme, parsed.netloc]):
             return False, None, None, "Invalid URL format"
     except Exception:
@@ -2341,29 +2930,22 @@ def test_citation_url(url, timeout=10):
         return False, None, None, f"Unsupported protocol: {parsed.scheme}"
     
     # Check common problematic domains
-    problematic_domains = [
-        'linkedin.com', 'facebook.com', 'instagram.com',  # Social media
-        'jstor.org', 'springer.com', 'sciencedirect.com',  # Academic paywalls
-        'pdfs.semanticscholar.org',  # PDF repositories
-        'drive.google.com', 'docs.google.com'  # Google Docs/Drive
-    ]
-    
-    domain = parsed.netloc.lower()
-    for problem_domain in problematic_domains:
-        if problem_domain in domain:
-            return True, None, None, f"Warning: Potentially difficult domain {problem_domain}"
+    problem_domain = find_problematic_domain(parsed.hostname or "")
+    if problem_domain:
+        return True, None, None, f"Warning: Potentially difficult domain {problem_domain}"
     
-    # Try HEAD request first (faster)
+    # Try HEAD request first (faster), on the shared pooled session
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.head(url, timeout=timeout, headers=headers, allow_redirects=True)
+        response = _http_session.head(url, timeout=timeout, allow_redirects=True)
         status_code = response.status_code
         content_type = response.headers.get('Content-Type', '')
         
         # Check status codes
         if 200 <= status_code < 300:
+            # Reject oversized documents before anything tries to download them
+            content_length = response.headers.get('Content-Length', '')
+            if content_length.isdigit() and int(content_length) > CITATION_MAX_BYTES:
+                return False, status_code, content_type, f"Content too large: {int(content_length)} bytes (limit {CITATION_MAX_BYTES})"
             if 'pdf' in content_type.lower():
                 return True, status_code, content_type, "Warning: PDF content (may be difficult to process)"
             elif 'application/' in content_type.lower() and 'json' not in content_type.lower():
@@ -2392,7 +2974,80 @@ def test_citation_url(url, timeout=10):
     except Exception as e:
         return False, None, None, f"Request error: {str(e)}"
 
-def main():
+def url_cache_key(url):
+    """
+    Hash a URL into a short cache key.
+    
+    Args:
+        url: The URL to hash
+        
+    Returns:
+        Hex digest string
+    """
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+
+def open_url_cache(master_folder):
+    """
+    Open the project's cache of URLs that failed the preflight check, creating it if needed.
+    
+    Args:
+        master_folder: Path to the master folder
+        
+    Returns:
+        sqlite3.Connection for the cache database
+    """
+    conn = sqlite3.connect(os.path.join(master_folder, ".url_cache.db"), timeout=10)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS url_status ("
+        "url_hash TEXT PRIMARY KEY, status_code INTEGER, content_type TEXT, message TEXT, expires_at REAL)"
+    )
+    return conn
+
+def check_citation_url(master_folder, url):
+    """
+    Test a citation URL, reusing a recent known-bad result instead of testing it again.
+    URLs that returned a permanent client error (4xx other than 429) or were too large
+    are remembered for URL_CACHE_TTL seconds in master_folder/.url_cache.db.
+    
+    Args:
+        master_folder: Path to the master folder
+        url: The URL to test
+        
+    Returns:
+        Tuple of (is_accessible, status_code, content_type, error_message), as test_citation_url
+    """
+    key = url_cache_key(url)
+    
+    try:
+        with closing(open_url_cache(master_folder)) as conn:
+            row = conn.execute(
+                "SELECT status_code, content_type, message FROM url_status WHERE url_hash = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        if row:
+            status_code, content_type, message = row
+            return False, status_code, content_type, f"{message} (cached)"
+    except sqlite3.Error as e:
+        safe_print(f"{Colors.YELLOW}Warning: Could not read URL cache: {str(e)}{Colors.RESET}")
+    
+    is_accessible, status_code, content_type, message = test_citation_url(url)
+    
+    known_bad = not is_accessible and status_code is not None and (
+        (400 <= status_code < 500 and status_code != 429) or message.startswith("Content too large")
+    )
+    if known_bad and URL_CACHE_TTL > 0:
+        try:
+            with closing(open_url_cache(master_folder)) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO url_status VALUES (?, ?, ?, ?, ?)",
+                    (key, status_code, content_type, message, time.time() + URL_CACHE_TTL)
+                )
+        except sqlite3.Error as e:
+            safe_print(f"{Colors.YELLOW}Warning: Could not update URL cache: {str(e)}{Colors.RESET}")
+    
+    return is_accessible, status_code, content_type, message
+
+def main(argv=None):
     """
     Main entry point for the research orchestrator.
     Implements a three-phase workflow:
@@ -2406,6 +3061,10 @@ def main():
     - Direct question mode: Provide questions directly via command line or file
     - Topic mode: Generate questions based on a topic, perspective, and depth
     - Interactive mode: Prompt for topic, perspective, and depth when run without arguments
+    
+    Args:
+        argv: Command-line arguments to parse instead of sys.argv[1:], so the
+              orchestrator can be driven from Python without a new interpreter
     """
     # Declare global variables
     global ENABLE_OPENAI_INTEGRATION
@@ -2414,6 +3073,12 @@ def main():
     # to ensure it's always available regardless of code path
     project_id = str(uuid.uuid4())
     
+    # Format the start of the run once, so the project's timestamps all name the same moment
+    start_time = time.time()
+    start_local = time.localtime(start_time)
+    now_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(start_time))
+    now_human = time.strftime("%Y-%m-%d %H:%M:%S", start_local)
+    
     parser = argparse.ArgumentParser(description="Research orchestrator for multiple questions.")
     
     # Create a mutually exclusive group for the two explicit modes
@@ -2430,7 +3095,9 @@ def main():
     # Common args
     parser.add_argument("--output", "-o", default="./research_output", help="Output directory (default: ./research_output)")
     parser.add_argument("--max-workers", "-w", type=int, default=None, help="Maximum number of worker threads (default: automatic based on number of questions)")
-    parser.add_argument("--stagger-delay", "-s", type=float, default=None, help="Seconds to wait before starting each new thread (default: from .env)")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENT_REQUESTS, help=f"Upper limit for the automatic worker thread count (default: {MAX_CONCURRENT_REQUESTS} from .env)")
+    parser.add_argument("--serial-post-process", action="store_true", help="Create indexes and consolidated summaries one at a time instead of in parallel")
+    parser.add_argument("--stagger-delay", "-s", type=float, default=None, help="Seconds to wait between starting research questions (default: from .env); citations use CITATION_RATE_LIMIT_BACKOFF instead")
     parser.add_argument("--max-citations", "-c", type=int, default=MAX_CITATIONS, help=f"Maximum number of citations to process (default: {MAX_CITATIONS} from .env)")
     
     # OpenAI integration args
@@ -2438,16 +3105,27 @@ def main():
     
     # New args for existing project and adding questions
     parser.add_argument("--existing-project", "-ep", help="ID of an existing project to process with OpenAI integration or add questions to")
+    parser.add_argument("--resume", "-r", metavar="PROJECT_ID", help="Resume an interrupted project, skipping questions that already completed")
+    parser.add_argument("--verify-folders", action="store_true", help="Check that an existing project's folder is on disk before using it")
     parser.add_argument("--add-questions", "-aq", action="store_true", help="Add questions to an existing project (requires --existing-project)")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Override OpenAI integration setting from command line if provided
     if args.openai_integration:
         ENABLE_OPENAI_INTEGRATION = args.openai_integration == "enable"
     
+    # Resume an interrupted project in its own folder, with its own questions
+    resumed_project = None
+    if args.resume:
+        resumed_project = get_project_by_id(args.resume)
+        if not resumed_project:
+            safe_print(f"{Colors.RED}Project with ID {args.resume} not found. Exiting.{Colors.RESET}")
+            return None
+        project_id = resumed_project["id"]
+    
     # Handle existing project processing
-    if args.existing_project:
+    elif args.existing_project:
         project_data = get_project_by_id(args.existing_project)
         if not project_data:
             safe_print(f"{Colors.RED}Project with ID {args.existing_project} not found. Exiting.{Colors.RESET}")
@@ -2463,8 +3141,7 @@ def main():
             questions = []
             if len(args.questions) == 1 and os.path.isfile(args.questions[0]):
                 # Questions from file
-                with open(args.questions[0], "r", encoding="utf-8") as f:
-                    questions = [line.strip() for line in f.readlines() if line.strip()]
+                questions = read_questions_file(args.questions[0])
                 safe_print(f"{Colors.GREEN}Loaded {len(questions)} questions from {args.questions[0]}{Colors.RESET}")
             else:
                 # Questions from command line
@@ -2478,15 +3155,11 @@ def main():
             return add_questions_to_project(project_data, questions, args)
         else:
             # Process existing project with OpenAI integration
-            master_folder = get_project_folder(project_data)
+            master_folder = get_project_folder(project_data, verify=args.verify_folders)
             if not master_folder:
                 safe_print(f"{Colors.RED}Project folder not found for project {args.existing_project}. Exiting.{Colors.RESET}")
                 return None
                 
-            # Enable OpenAI integration for this operation
-            old_setting = ENABLE_OPENAI_INTEGRATION
-            ENABLE_OPENAI_INTEGRATION = True
-            
             safe_print(f"{Colors.BOLD}{Colors.CYAN}Processing existing project with OpenAI integration{Colors.RESET}")
             safe_print(f"{Colors.CYAN}Project ID: {args.existing_project}{Colors.RESET}")
             safe_print(f"{Colors.CYAN}Project folder: {master_folder}{Colors.RESET}")
@@ -2494,8 +3167,8 @@ def main():
             # Store the active status before processing
             active_status = project_data.get("active", True)
             
-            # Process the project with OpenAI
-            project_data = process_files_with_openai(master_folder, project_data)
+            # Process the project with OpenAI, whatever the global setting
+            project_data = process_files_with_openai(master_folder, project_data, enable_openai=True)
             
             # Ensure the active status is preserved
             if "active" not in project_data:
@@ -2503,20 +3176,18 @@ def main():
                 # Update the tracking file with the active status
                 update_project_in_tracking(project_data["id"], {"active": active_status})
             
-            # Restore original setting
-            ENABLE_OPENAI_INTEGRATION = old_setting
-            
             return project_data
     
     # Determine which mode we're operating in
     questions = []
     
-    if args.questions:
+    if resumed_project:
+        questions = resumed_project.get("parameters", {}).get("questions", [])
+    elif args.questions:
         # Direct question mode
         if len(args.questions) == 1 and os.path.isfile(args.questions[0]):
             # Questions from file
-            with open(args.questions[0], "r", encoding="utf-8") as f:
-                questions = [line.strip() for line in f.readlines() if line.strip()]
+            questions = read_questions_file(args.questions[0])
             safe_print(f"{Colors.GREEN}Loaded {len(questions)} questions from {args.questions[0]}{Colors.RESET}")
         else:
             # Questions from command line
@@ -2530,7 +3201,7 @@ def main():
             # Create an empty project tracking entry with failure status
             project_data = {
                 "id": project_id,
-                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "timestamp": now_iso,
                 "parameters": {
                     "topic": args.topic,
                     "perspective": args.perspective,
@@ -2616,7 +3287,7 @@ def main():
                 # Create an empty project tracking entry with failure status
                 project_data = {
                     "id": project_id,
-                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "timestamp": now_iso,
                     "parameters": {
                         "topic": topic,
                         "perspective": perspective,
@@ -2673,14 +3344,14 @@ def main():
                 
                 # Prompt for questions file
                 questions_file = input(f"{Colors.CYAN}Enter path to file containing questions (one per line): {Colors.RESET}").strip()
-                if not questions_file or not os.path.isfile(questions_file):
+                
+                # Load questions from file, treating a missing file or a directory as an invalid path
+                try:
+                    questions = read_questions_file(questions_file)
+                except (FileNotFoundError, IsADirectoryError, PermissionError):
                     safe_print(f"{Colors.RED}Invalid file path. Exiting.{Colors.RESET}")
                     return
                 
-                # Load questions from file
-                with open(questions_file, "r", encoding="utf-8") as f:
-                    questions = [line.strip() for line in f.readlines() if line.strip()]
-                
                 if not questions:
                     safe_print(f"{Colors.RED}No valid questions found in file. Exiting.{Colors.RESET}")
                     return
@@ -2727,15 +3398,11 @@ def main():
                 project_id = selected_project.get("id")
                 
                 # Get the project folder
-                master_folder = get_project_folder(selected_project)
+                master_folder = get_project_folder(selected_project, verify=args.verify_folders)
                 if not master_folder:
                     safe_print(f"{Colors.RED}Project folder not found. Exiting.{Colors.RESET}")
                     return
                 
-                # Enable OpenAI integration for this operation
-                old_setting = ENABLE_OPENAI_INTEGRATION
-                ENABLE_OPENAI_INTEGRATION = True
-                
                 safe_print(f"{Colors.BOLD}{Colors.CYAN}Processing project with OpenAI integration{Colors.RESET}")
                 safe_print(f"{Colors.CYAN}Project ID: {project_id}{Colors.RESET}")
                 safe_print(f"{Colors.CYAN}Project folder: {master_folder}{Colors.RESET}")
@@ -2743,8 +3410,8 @@ def main():
                 # Store the active status before processing
                 active_status = selected_project.get("active", True)
                 
-                # Process the project with OpenAI
-                project_data = process_files_with_openai(master_folder, selected_project)
+                # Process the project with OpenAI, whatever the global setting
+                project_data = process_files_with_openai(master_folder, selected_project, enable_openai=True)
                 
                 # Ensure the active status is preserved
                 if "active" not in project_data:
@@ -2752,9 +3419,6 @@ def main():
                     # Update the tracking file with the active status
                     update_project_in_tracking(project_data["id"], {"active": active_status})
                 
-                # Restore original setting
-                ENABLE_OPENAI_INTEGRATION = old_setting
-                
                 return project_data
                 
             except ValueError:
@@ -2769,7 +3433,7 @@ def main():
         # Create an empty project tracking entry with failure status
         project_data = {
             "id": project_id,
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "timestamp": now_iso,
             "parameters": {
                 "questions": []
             },
@@ -2798,107 +3462,159 @@ def main():
     if args.max_workers is not None:
         max_workers = args.max_workers
     else:
-        max_workers = max(1, int(len(questions) / RATE_LIMIT_QUESTIONS_PER_WORKER))
-    
-    # Create a descriptive folder name (with topic if available)
-    timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime())
-    folder_prefix = "research"
-    if args.topic:
-        # Sanitize topic for folder name
-        safe_topic = re.sub(r'[^\w\s-]', '', args.topic)
-        safe_topic = re.sub(r'[-\s]+', '_', safe_topic).strip('-_')
-        safe_topic = safe_topic[:30] if len(safe_topic) > 30 else safe_topic
-        folder_prefix = safe_topic
-    
-    master_folder = os.path.join(os.path.abspath(args.output), f"{folder_prefix}_{timestamp}")
-    
-    # Create all required directories
-    os.makedirs(master_folder, exist_ok=True)
-    os.makedirs(os.path.join(master_folder, "response"), exist_ok=True)
-    os.makedirs(os.path.join(master_folder, "markdown"), exist_ok=True)
-    os.makedirs(os.path.join(master_folder, "summaries"), exist_ok=True)  # Added new summaries directory
-    
-    # Create a README for the project
-    readme_path = os.path.join(master_folder, "README.md")
-    topic_title = args.topic if args.topic else "Research Project"
-
-    with open(readme_path, "w", encoding="utf-8") as f:
-        f.write(f"# {topic_title}\n\n")
-        f.write(f"**Generated on**: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())}\n\n")
-        f.write(f"**Project ID**: {project_id}\n\n")
-
+        max_workers = calculate_max_workers(len(questions), RATE_LIMIT_QUESTIONS_PER_WORKER, args.max_concurrency)
+    
+    if resumed_project:
+        master_folder = get_project_folder(resumed_project, verify=args.verify_folders)
+        if not master_folder:
+            safe_print(f"{Colors.RED}Project folder not found for project {project_id}. Exiting.{Colors.RESET}")
+            return None
+        
+        project_data = resumed_project
+        metadata_written = None
+        project_data["status"] = "in_progress"
+        update_project_in_tracking(project_id, {"status": "in_progress"})
+        safe_print(f"{Colors.BOLD}{Colors.CYAN}Resuming project {project_id}{Colors.RESET}")
+    else:
+        # Create a descriptive folder name (with topic if available)
+        timestamp = time.strftime("%Y%m%d_%H%M%S", start_local)
+        folder_prefix = "research"
         if args.topic:
-            f.write(f"**Topic**: {args.topic}\n\n")
-            f.write(f"**Perspective**: {args.perspective}\n\n")
+            # Sanitize topic for folder name
+            safe_topic = UNSAFE_NAME_CHARS_RE.sub('', args.topic)
+            safe_topic = NAME_SEPARATORS_RE.sub('_', safe_topic).strip('-_')
+            safe_topic = safe_topic[:30] if len(safe_topic) > 30 else safe_topic
+            folder_prefix = safe_topic
+        
+        master_folder = os.path.join(os.path.abspath(args.output), f"{folder_prefix}_{timestamp}")
+        
+        # Create all required directories (the master folder is created along with the first one)
+        for subfolder in ("response", "markdown", "summaries"):
+            os.makedirs(os.path.join(master_folder, subfolder), exist_ok=True)
         
-        f.write("## Folder Structure\n\n")
-        f.write("- `markdown/`: Formatted markdown files for each research question\n")
-        f.write("- `response/`: Raw API responses\n")
-        f.write("- `summaries/`: Consolidated files and indexes\n\n")
+        # Create a README for the project
+        readme_path = os.path.join(master_folder, "README.md")
+        topic_title = args.topic if args.topic else "Research Project"
+
+        # Build the whole document first so it's written with a single call
+        readme_parts = [
+            f"# {topic_title}\n\n",
+            f"**Generated on**: {now_human}\n\n",
+            f"**Project ID**: {project_id}\n\n"
+        ]
+
+        if args.topic:
+            readme_parts.append(f"**Topic**: {args.topic}\n\n")
+            readme_parts.append(f"**Perspective**: {args.perspective}\n\n")
+        
+        readme_parts.append(
+            "## Folder Structure\n\n"
+            "- `markdown/`: Formatted markdown files for each research question\n"
+            "- `response/`: Raw API responses\n"
+            "- `summaries/`: Consolidated files and indexes\n\n"
+        )
         
         # Add OpenAI integration info if enabled
         if ENABLE_OPENAI_INTEGRATION:
-            f.write("## OpenAI Integration\n\n")
-            f.write("This research project has been integrated with OpenAI's file search capabilities:\n\n")
-            f.write("- Research files have been uploaded to OpenAI\n")
-            f.write("- A vector store has been created for semantic search\n")
-            f.write("- Project tracking information is stored in the research_projects.json file\n\n")
-            f.write("Use the project ID above when using the OpenAI search functionality.\n\n")
-        
-        f.write("## Research Questions\n\n")
-        for i, q in enumerate(questions, 1):
-            f.write(f"{i}. {q}\n")
-    
-    safe_print(f"{Colors.BOLD}{Colors.GREEN}Research orchestrator started at {time.strftime('%Y-%m-%d %H:%M:%S')}{Colors.RESET}")
+            readme_parts.append(
+                "## OpenAI Integration\n\n"
+                "This research project has been integrated with OpenAI's file search capabilities:\n\n"
+                "- Research files have been uploaded to OpenAI\n"
+                "- A vector store has been created for semantic search\n"
+                "- Project tracking information is stored in the research_projects.json file\n\n"
+                "Use the project ID above when using the OpenAI search functionality.\n\n"
+            )
+        
+        readme_parts.append("## Research Questions\n\n")
+        readme_parts.extend(f"{i}. {q}\n" for i, q in enumerate(questions, 1))
+        
+        # Create a project data structure for tracking
+        project_data = {
+            "id": project_id,
+            "timestamp": now_iso,
+            "parameters": {
+                "questions": questions
+            },
+            "local_storage": {
+                "folder": os.path.abspath(master_folder),
+                "markdown_folder": "markdown",
+                "summary_folder": "summaries",
+                "response_folder": "response"
+            },
+            "status": "in_progress",
+            "active": True
+        }
+        
+        # Add topic, perspective, and depth if available
+        if args.topic:
+            project_data["parameters"]["topic"] = args.topic
+            project_data["parameters"]["perspective"] = args.perspective
+            project_data["parameters"]["depth"] = args.depth
+        
+        # Write the README and add the project to the tracking file in the background,
+        # overlapping them with the first Phase 1 API calls (no worker reads either)
+        def write_project_metadata():
+            with open(readme_path, "w", encoding="utf-8") as f:
+                f.write("".join(readme_parts))
+            add_project_to_tracking(project_data)
+        
+        metadata_written = get_io_pool().submit(write_project_metadata)
+    
+    summaries_dir = os.path.join(master_folder, "summaries")
+    
+    safe_print(f"{Colors.BOLD}{Colors.GREEN}Research orchestrator started at {now_human}{Colors.RESET}")
     safe_print(f"{Colors.MAGENTA}Processing {len(questions)} questions with a maximum of {max_workers} worker threads{Colors.RESET}")
     safe_print(f"{Colors.MAGENTA}Thread stagger delay: {THREAD_STAGGER_DELAY} seconds{Colors.RESET}")
     safe_print(f"{Colors.MAGENTA}Max citations to process: {args.max_citations} (prioritizing most referenced ones){Colors.RESET}")
     safe_print(f"{Colors.MAGENTA}Output directory: {master_folder}{Colors.RESET}")
     
-    # Create a project data structure for tracking
-    project_data = {
-        "id": project_id,
-        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        "parameters": {
-            "questions": questions
-        },
-        "local_storage": {
-            "folder": os.path.abspath(master_folder),
-            "markdown_folder": "markdown",
-            "summary_folder": "summaries",
-            "response_folder": "response"
-        },
-        "status": "in_progress",
-        "active": True
-    }
-    
-    # Add topic, perspective, and depth if available
-    if args.topic:
-        project_data["parameters"]["topic"] = args.topic
-        project_data["parameters"]["perspective"] = args.perspective
-        project_data["parameters"]["depth"] = args.depth
-    
-    # Add project to tracking file
-    add_project_to_tracking(project_data)
-    
     # Initialize counter for successful questions
     successful_questions = 0
     
     ########## PHASE 1: Process all questions ##########
     safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== PHASE 1: PROCESSING ALL QUESTIONS ========{Colors.RESET}")
     
+    # Questions that succeeded in an interrupted run are not researched again
+    previous_results = load_question_results(master_folder) if resumed_project else {}
+    completed_questions = 0
+    
+    def research_question(*pipeline_args):
+        # No API call is made until the README and tracking entry are written, so a failed
+        # write stops the run before anything is spent (the wait is normally milliseconds)
+        if metadata_written is not None:
+            metadata_written.result()
+        return research_pipeline(*pipeline_args)
+    
+    metadata_error = None
+    
+    def checkpoint_progress():
+        # Progress can only be recorded once the project is in the tracking file
+        if metadata_error is not None:
+            return
+        update_project_in_tracking(project_id, {
+            "progress": {"completed": completed_questions, "successful": successful_questions, "total": len(questions)}
+        })
+    
     # Process each question with ThreadPoolExecutor
-    all_question_results = []  # Store results as (success_flag, research_response, citations)
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    all_question_results = [(False, None, [])] * len(questions)  # (success_flag, None, citations) per question, in question order
+    results_path = os.path.join(master_folder, QUESTION_RESULTS_FILE)
+    with open(results_path, "a", encoding="utf-8", buffering=1) as results_file, ThreadPoolExecutor(max_workers=max_workers) as executor:
         # Create a future for each question
         futures = {}
+        # Space out question starts to avoid API rate limits. Workers wait for their
+        # own start slot, so every question is submitted immediately.
+        start_limiter = StartRateLimiter(THREAD_STAGGER_DELAY)
         for i, question in enumerate(questions, 1):
-            # Stagger the thread starts to avoid API rate limits
-            if i > 1 and THREAD_STAGGER_DELAY > 0:
-                time.sleep(THREAD_STAGGER_DELAY)
+            previous = previous_results.get(question_key(question))
+            if previous and previous.get("success"):
+                all_question_results[i - 1] = (True, None, previous.get("citations", []))
+                successful_questions += 1
+                completed_questions += 1
+                continue
             
             future = executor.submit(
-                research_pipeline,
+                start_limiter.call,
+                research_question,
                 question,
                 master_folder,
                 i,
@@ -2906,58 +3622,85 @@ def main():
             )
             futures[future] = (i, question)
         
+        if completed_questions:
+            safe_print(f"{Colors.CYAN}Skipping {completed_questions} questions completed by an earlier run{Colors.RESET}")
+        
+        # Join the metadata write here, outside the result loop; if it failed, drop the
+        # queued questions (started ones fail fast in research_question without an API call)
+        if metadata_written is not None:
+            metadata_error = metadata_written.exception()
+        if metadata_error is not None:
+            for future in futures:
+                future.cancel()
+            futures.clear()
+        
         # Collect results as they complete
-        for future in as_completed(futures):
-            i, question = futures[future]
+        for future in iter_completed(futures):
+            i, question = futures.pop(future)  # Drop the finished future so its result can be freed
             try:
-                success, research_response, citations = future.result()
-                all_question_results.append((success, research_response, citations))
-                
-                if success:
-                    successful_questions += 1
-                    
+                success, _, citations = future.result()
             except Exception as e:
                 safe_print(f"{Colors.RED}Error processing question {i}: {str(e)}{Colors.RESET}")
-                all_question_results.append((False, None, []))
+                success, citations = False, []
+            
+            # The full response is already saved under response/, so only the citations stay in memory
+            all_question_results[i - 1] = (success, None, citations)
+            if success:
+                successful_questions += 1
+            
+            # Record the result right away (line buffered) so an interrupted run can be resumed
+            results_file.write(json.dumps({
+                "key": question_key(question),
+                "question_number": i,
+                "success": success,
+                "citations": citations
+            }) + "\n")
+            
+            # Checkpoint progress in batches to keep tracking file rewrites down
+            completed_questions += 1
+            if PROGRESS_CHECKPOINT_INTERVAL > 0 and completed_questions % PROGRESS_CHECKPOINT_INTERVAL == 0:
+                checkpoint_progress()
+    
+    if metadata_error is not None:
+        safe_print(f"{Colors.RED}Could not write project metadata for {project_id}: {str(metadata_error)}. Exiting.{Colors.RESET}")
+        return None
+    
+    checkpoint_progress()
     
-    # Extract and deduplicate citations from all questions
-    safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== EXTRACTING CITATIONS FROM QUESTIONS ========{Colors.RESET}")
-    citation_map, unique_citation_count = extract_and_deduplicate_citations(all_question_results)
+    # Extract and deduplicate citations from all questions and prioritize them by reference count
+    # With --max-citations 0 the citations are never used, so don't extract them at all
+    if args.max_citations > 0:
+        safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== EXTRACTING CITATIONS FROM QUESTIONS ========{Colors.RESET}")
+        citation_map, prioritized_citation_map, skipped_count = extract_and_prioritize_citations(all_question_results, args.max_citations)
+    else:
+        citation_map, prioritized_citation_map, skipped_count = {}, {}, 0
+    unique_citation_count = len(citation_map)
     
     # Process citations if there are any
     if citation_map:
-        # Prioritize citations based on reference count
-        prioritized_citation_map, skipped_count = prioritize_citations(citation_map, args.max_citations)
-        
         if skipped_count > 0:
             safe_print(f"{Colors.YELLOW}Skipping {skipped_count} less referenced citations to stay within limit of {args.max_citations}{Colors.RESET}")
         
         # Process each unique citation
         safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== PROCESSING CITATIONS ========{Colors.RESET}")
-        citation_results = process_citations(prioritized_citation_map, master_folder, max_workers, THREAD_STAGGER_DELAY)
+        citation_results = process_citations(prioritized_citation_map, master_folder, max_workers)
         
-        # Create indexes
-        master_index_path = create_master_index(master_folder, questions, all_question_results)
-        citation_index_path = create_citation_index(master_folder, citation_map, citation_results, skipped_count)
-        
-        # Consolidate summaries
-        safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== CONSOLIDATING SUMMARIES ========{Colors.RESET}")
-        consolidate_summary_files(master_folder, "executive_summary", "consolidated_executive_summaries.md", "Consolidated Executive Summaries")
-        consolidate_summary_files(master_folder, "research_summary", "consolidated_research_summaries.md", "Consolidated Research Summaries")
-        
-        # Move master index and citation index to summaries folder
-        move_file(master_index_path, os.path.join(master_folder, "summaries"))
-        move_file(citation_index_path, os.path.join(master_folder, "summaries"))
+        # Create indexes in the summaries folder and consolidate summaries
+        create_indexes_and_summaries(
+            master_folder, questions, all_question_results,
+            citation_map, citation_results, skipped_count,
+            serial=args.serial_post_process
+        )
     else:
-        safe_print(f"{Colors.YELLOW}No citations found. Skipping citation processing phase.{Colors.RESET}")
+        if args.max_citations > 0:
+            safe_print(f"{Colors.YELLOW}No citations found. Skipping citation processing phase.{Colors.RESET}")
+        else:
+            safe_print(f"{Colors.YELLOW}Citation processing disabled (--max-citations 0). Skipping citation phase.{Colors.RESET}")
         # Create the master index even if there are no citations
-        master_index_path = create_master_index(master_folder, questions, all_question_results)
-        
-        # Consolidate summary files and move master index
-        safe_print(f"\n{Colors.BOLD}{Colors.CYAN}======== CONSOLIDATING SUMMARIES ========{Colors.RESET}")
-        consolidate_summary_files(master_folder, "executive_summary", "consolidated_executive_summaries.md", "Consolidated Executive Summaries")
-        consolidate_summary_files(master_folder, "research_summary", "consolidated_research_summaries.md", "Consolidated Research Summaries")
-        move_file(master_index_path, os.path.join(master_folder, "summaries"))
+        create_indexes_and_summaries(
+            master_folder, questions, all_question_results,
+            serial=args.serial_post_process
+        )
     
     # Process files with OpenAI if enabled
     if ENABLE_OPENAI_INTEGRATION:
@@ -2979,7 +3722,7 @@ def main():
             safe_print(f"{Colors.CYAN}- Citation Processing: {len(citation_results)}/{len(prioritized_citation_map)} citations processed{Colors.RESET}")
     safe_print(f"{Colors.CYAN}- Consolidated Files: Executive summaries, research summaries{Colors.RESET}")
     safe_print(f"{Colors.CYAN}- Output directory: {master_folder}{Colors.RESET}")
-    safe_print(f"{Colors.CYAN}- Summaries directory: {os.path.join(master_folder, 'summaries')}{Colors.RESET}")
+    safe_print(f"{Colors.CYAN}- Summaries directory: {summaries_dir}{Colors.RESET}")
     
     # Add OpenAI info to the summary if it was processed
     if project_data.get("openai_integration"):
@@ -14,11 +14,15 @@ Features:
 """
 
 import os
+import re
 import sys
 import json
 import time
-import subprocess
-from dotenv import load_dotenv
+import queue
+import tempfile
+import threading
+from collections import deque
+from datetime import datetime
 import streamlit as st
 
 # Add parent directory to path so we can import from research_orchestrator.py
@@ -28,8 +32,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from streamlit_app.utils import (
     init_session_state,
     create_openai_client,
-    load_research_projects,
-    filter_available_projects,
+    load_available_projects,
+    clear_research_projects_cache,
     set_selected_project,
     get_selected_project,
     logger,
@@ -58,11 +62,309 @@ except ImportError:
     has_research_orchestrator = False
     st.warning("Could not import from research_orchestrator.py. Some features may be disabled.")
 
-# Load environment variables
-load_dotenv()
+# Load environment variables once per process; Streamlit re-executes this script on every rerun
+@st.cache_resource(show_spinner=False)
+def load_environment():
+    """Load variables from the .env file into the process environment."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+load_environment()
 
 # Constants
 MAX_SEARCH_RESULTS = int(os.getenv("MAX_SEARCH_RESULTS", "5"))
+LOG_RENDER_INTERVAL = 0.2  # Seconds between redraws of the live research log
+LOG_VIEW_LINES = 500  # Most recent log lines shown in the live research log
+LOG_STATUS_LABEL = "Research log (running...)"
+# Run research_orchestrator.py with the interpreter that runs this app
+PYTHON_CMD = sys.executable or "python3"
+SUBPROCESS_PIPE_BUFFER = 64 * 1024  # Bytes read from the research subprocess per pipe read
+# Make the research subprocess write every print straight to the pipe
+SUBPROCESS_ENV = {**os.environ, "PYTHONUNBUFFERED": "1"}
+
+def iter_output_batches(stream, interval=LOG_RENDER_INTERVAL):
+    """
+    Yield the lines of a text stream in batches, at most one batch per interval.
+    
+    A reader thread does the blocking reads, so the log can be redrawn once per
+    batch instead of once per line.
+    
+    Args:
+        stream: Text stream to read, such as a subprocess's stdout
+        interval: Seconds to keep collecting lines after the first one of a batch
+        
+    Yields:
+        Non-empty lists of lines, until the stream is exhausted
+    """
+    lines = queue.Queue()
+    
+    def read_lines():
+        for line in iter(stream.readline, ''):
+            lines.put(line)
+        lines.put(None)  # End of stream
+    
+    threading.Thread(target=read_lines, daemon=True).start()
+    
+    while True:
+        # Wait for the first line, then gather whatever else arrives within the interval
+        batch = [lines.get()]
+        deadline = time.monotonic() + interval
+        while batch[-1] is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(lines.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        if batch[-1] is None:
+            if len(batch) > 1:
+                yield batch[:-1]
+            return
+        yield batch
+
+# Timestamps like [12:34:56] that mark the start of a log entry
+_TS_RE = re.compile(r'(\[\d{2}:\d{2}:\d{2}\])')
+
+# Log line colours keyed by the text that selects them, highest priority first
+_LOG_COLORS = {
+    "ERROR": "#ff4b4b",
+    "Error": "#ff4b4b",
+    "Failed": "#ff4b4b",
+    "WARNING": "#ffa500",
+    "Warning": "#ffa500",
+    "Searching for:": "#4b8eff",
+    "Processing results": "#4b8eff",
+    "Generating": "#4b8eff",
+    "Uploading to OpenAI": "#4b8eff",
+    "Research completed": "#00cc66",
+    "success": "#00cc66",
+    "INFO": "#7f7f7f",
+}
+_LOG_PRIORITY = {needle: i for i, needle in enumerate(_LOG_COLORS)}
+_CLASSIFY_RE = re.compile(
+    "|".join(re.escape(needle) for needle in _LOG_COLORS if needle != "success") + "|(?i:success)"
+)
+
+def _style_log_line(text, timestamp):
+    """
+    Format a log line with its timestamp, coloured by the highest-priority keyword it contains.
+    
+    Args:
+        text: Log line text
+        timestamp: Time the line was received, as HH:MM:SS
+        
+    Returns:
+        HTML for the line
+    """
+    matches = _CLASSIFY_RE.findall(text)
+    if not matches:
+        return f"[{timestamp}] {text}"
+    
+    # "success" is matched in any case; every other keyword is case-sensitive
+    needle = min(
+        (m if m in _LOG_PRIORITY else m.lower() for m in matches),
+        key=_LOG_PRIORITY.__getitem__
+    )
+    return f"<span style='color: {_LOG_COLORS[needle]};'>[{timestamp}] {text}</span>"
+
+def format_log_line(line, timestamp):
+    """
+    Turn one line of research output into styled HTML log entries.
+    
+    Long lines that hold several [HH:MM:SS] entries run together are split
+    into one entry per timestamp.
+    
+    Args:
+        line: Raw output line
+        timestamp: Time the line was received, as HH:MM:SS
+        
+    Returns:
+        List of HTML entries for the line
+    """
+    # Strip only trailing/leading whitespace but preserve internal spacing
+    styled_line = line.strip()
+    
+    # Only a timestamp after the start of the line begins a second entry, so
+    # most lines skip the split entirely
+    if len(styled_line) <= 80 or not _TS_RE.search(styled_line, 1):
+        return [_style_log_line(styled_line, timestamp)]
+    
+    # Split on timestamp-like patterns but keep the delimiter
+    sections = []
+    current_section = ""
+    for i, part in enumerate(_TS_RE.split(styled_line)):
+        if i > 0 and _TS_RE.match(part):
+            # This is a timestamp, start a new section
+            if current_section:
+                sections.append(current_section)
+            current_section = part
+        else:
+            current_section += part
+    
+    if current_section:
+        sections.append(current_section)
+    
+    return [_style_log_line(section, timestamp) for section in sections]
+
+# Output text that marks a research run's progress: (texts that must all appear, progress, status)
+RESEARCH_PROGRESS_MARKERS = [
+    (("Searching for:",), 0.2, "Searching for information..."),
+    (("Processing results",), 0.4, "Processing search results..."),
+    (("Generating research summaries",), 0.6, "Generating research summaries..."),
+    (("Uploading to OpenAI",), 0.8, "Uploading to OpenAI..."),
+    (("Research completed",), 1.0, "Research completed!"),
+]
+
+ADD_QUESTIONS_PROGRESS_MARKERS = [
+    (("Adding", "new questions to existing project"), 0.2, "Adding questions to project..."),
+    (("Searching for:",), 0.4, "Searching for information..."),
+    (("Processing results",), 0.6, "Processing search results..."),
+    (("Uploading to OpenAI",), 0.8, "Uploading to OpenAI..."),
+    (("Research completed",), 1.0, "Questions added successfully!"),
+]
+
+def find_progress(lines, markers, current):
+    """
+    Find the furthest progress that a batch of output lines reports.
+    
+    Args:
+        lines: Output lines from the research subprocess
+        markers: Progress markers, checked in order; the first one found in a line counts
+        current: Progress already shown
+        
+    Returns:
+        Tuple of (progress, status text) beyond current, or None if the batch does not move it forward
+    """
+    found = None
+    for line in lines:
+        for needles, progress, status in markers:
+            if all(needle in line for needle in needles):
+                if progress > current:
+                    current = progress
+                    found = (progress, status)
+                break
+    return found
+
+def start_run_log(run_name):
+    """
+    Open a new file for the full output of a research run, replacing the previous run's log.
+    
+    The live view only keeps the last LOG_VIEW_LINES lines; this file keeps them all
+    for the download button shown by offer_run_log_download.
+    
+    Args:
+        run_name: Kind of run, such as "research" or "add_questions"
+        
+    Returns:
+        Text file open for writing
+    """
+    previous_path = st.session_state.run_log_files.get(run_name)
+    if previous_path:
+        try:
+            os.remove(previous_path)
+        except OSError:
+            pass
+    
+    log_file = tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", prefix=f"{run_name}_", suffix=".log", delete=False
+    )
+    st.session_state.run_log_files[run_name] = log_file.name
+    return log_file
+
+def offer_run_log_download(run_name):
+    """
+    Show a download button for the full log of the last run of this kind, if there is one.
+    
+    Args:
+        run_name: Kind of run, as passed to start_run_log
+    """
+    log_path = st.session_state.run_log_files.get(run_name)
+    if not log_path or not os.path.exists(log_path):
+        return
+    
+    with open(log_path, "rb") as f:
+        st.download_button(
+            "📥 Download Full Log",
+            data=f.read(),
+            file_name=f"{run_name}.log",
+            mime="text/plain",
+            key=f"download_{run_name}_log"
+        )
+
+# Scrollable box for the live research log; filled with the joined, styled lines
+LOG_VIEW_HTML = (
+    "<div style='margin:0; padding:10px; background-color:#f5f5f5; max-height:400px; "
+    "overflow:auto; white-space: pre-wrap; word-wrap: break-word;'>{}</div>"
+)
+
+# Copy button shown above the research progress log; styled in main.css
+COPY_LOGS_BUTTON_HTML = """
+<div id="copy-button-container">
+    <button id="copy-logs-button">📋 Copy Logs</button>
+</div>
+"""
+
+# Emitted once per page by setup_page. The click handler is delegated from the
+# document and the observer watches the whole page, so they also work for log
+# elements that are created after the scripts run.
+LOG_SCRIPTS_HTML = """
+<script>
+    document.addEventListener('click', function(event) {
+        const btn = event.target.closest('#copy-logs-button');
+        if (!btn) {
+            return;
+        }
+        const preElement = document.querySelector('[data-testid="stText"] pre');
+        if (preElement) {
+            const text = preElement.textContent;
+            navigator.clipboard.writeText(text).then(
+                () => {
+                    const originalText = btn.textContent;
+                    btn.textContent = "✅ Copied!";
+                    setTimeout(() => { btn.textContent = originalText; }, 2000);
+                },
+                () => {
+                    btn.textContent = "❌ Failed to copy";
+                    setTimeout(() => { btn.textContent = "📋 Copy Logs"; }, 2000);
+                }
+            );
+        }
+    });
+    
+    // Function to scroll log to bottom
+    function scrollLogToBottom() {
+        const logElement = document.querySelector('[data-testid="stText"] pre');
+        if (logElement) {
+            logElement.style.maxHeight = "400px";
+            logElement.style.overflow = "auto";
+            logElement.scrollTop = logElement.scrollHeight;
+        }
+    }
+    
+    // Set initial scroll and add observer to handle updates
+    scrollLogToBottom();
+    const observer = new MutationObserver(scrollLogToBottom);
+    observer.observe(document.body, { childList: true, subtree: true });
+</script>
+"""
+
+# Read once per process; Streamlit re-executes this script on every rerun
+@st.cache_data(show_spinner=False)
+def load_css():
+    """
+    Read the app's custom stylesheet.
+    
+    Returns:
+        Contents of styles/main.css, or an empty string if it cannot be read
+    """
+    try:
+        with open(os.path.join(os.path.dirname(__file__), "styles", "main.css")) as f:
+            return f.read()
+    except OSError as e:
+        logger.warning(f"Could not load custom CSS: {str(e)}")
+        return ""
 
 # Page configuration
 def setup_page():
@@ -74,9 +376,11 @@ def setup_page():
         initial_sidebar_state="auto"
     )
     
-    # Load and apply custom CSS
-    with open(os.path.join(os.path.dirname(__file__), "styles", "main.css")) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    # Apply custom CSS
+    st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+    
+    # Copy-logs and auto-scroll behaviour for the research progress log
+    st.markdown(LOG_SCRIPTS_HTML, unsafe_allow_html=True)
 
 def on_project_selected(project, index):
     """Callback for when a project is selected."""
@@ -93,12 +397,8 @@ def display_chat_tab():
         return
     
     # Load and filter projects - handle inactive projects
-    all_projects = load_research_projects()
     show_inactive = should_show_inactive_projects()
-    available_projects = filter_available_projects(
-        all_projects, 
-        include_inactive=show_inactive
-    )
+    available_projects = load_available_projects(include_inactive=show_inactive)
     
     if not available_projects:
         st.warning("No research projects with OpenAI integration available.")
@@ -114,14 +414,10 @@ def display_chat_tab():
     col1, col2 = st.columns([1, 1])
     with col1:
         # Toggle for inactive projects
-        if st.toggle("Show Inactive Projects", value=show_inactive, key="show_inactive_toggle"):
-            if not show_inactive:
-                set_show_inactive_projects(True)
-                st.rerun()
-        else:
-            if show_inactive:
-                set_show_inactive_projects(False)
-                st.rerun()
+        new_show_inactive = st.toggle("Show Inactive Projects", value=show_inactive, key="show_inactive_toggle")
+        if new_show_inactive != show_inactive:
+            set_show_inactive_projects(new_show_inactive)
+            st.rerun()
     
     with col2:
         # Toggle for debug mode
@@ -151,7 +447,7 @@ def display_chat_tab():
             debug_data = {
                 "model": get_model(),
                 "web_search_enabled": is_web_search_enabled(),
-                "vector_store_id": get_selected_project().get("vector_store_id", "unknown") if get_selected_project() else None
+                "vector_store_id": selected_project.get("vector_store_id", "unknown")
             }
             debug_panel(debug_data)
             
@@ -200,21 +496,9 @@ def initiate_research_project():
                 st.error("Please enter a research topic.")
                 return
             
-            # Use python3 explicitly and detect which python command is available
-            python_cmd = "python3"
-            try:
-                # Check if python3 is available, if not fall back to python
-                import shutil
-                if not shutil.which("python3"):
-                    python_cmd = "python"
-                    
-                logger.info(f"Using Python command: {python_cmd}")
-            except Exception as e:
-                logger.warning(f"Error detecting Python command: {str(e)}. Falling back to python3")
-            
             # Build command for subprocess
             cmd = [
-                python_cmd, 
+                PYTHON_CMD, 
                 "research_orchestrator.py",
                 "--topic", topic,
                 "--perspective", perspective,
@@ -224,7 +508,8 @@ def initiate_research_project():
                 "--openai-integration", "enable" if enable_openai else "disable"
             ]
             
-            # Execute research_orchestrator.py as a subprocess
+            # Execute research_orchestrator.py as a subprocess; imported here so the chat tab never loads it
+            import subprocess
             with st.spinner(f"Running research on topic: {topic}..."):
                 try:
                     # Create a progress display container
@@ -237,211 +522,93 @@ def initiate_research_project():
                         # Add a copy button for the logs
                         copy_col1, copy_col2 = st.columns([3, 1])
                         with copy_col2:
-                            st.markdown("""
-                            <div id="copy-button-container" style="text-align: right;">
-                                <button id="copy-logs-button" style="
-                                    background-color: #f0f2f6; 
-                                    border: 1px solid #ddd; 
-                                    padding: 5px 10px; 
-                                    border-radius: 4px;
-                                    cursor: pointer;
-                                    font-size: 0.8em;">
-                                    📋 Copy Logs
-                                </button>
-                            </div>
-                            
-                            <script>
-                                document.getElementById('copy-logs-button').addEventListener('click', function() {
-                                    const preElement = document.querySelector('[data-testid="stText"] pre');
-                                    if (preElement) {
-                                        const text = preElement.textContent;
-                                        navigator.clipboard.writeText(text).then(
-                                            () => {
-                                                const btn = document.getElementById('copy-logs-button');
-                                                const originalText = btn.textContent;
-                                                btn.textContent = "✅ Copied!";
-                                                setTimeout(() => { btn.textContent = originalText; }, 2000);
-                                            },
-                                            () => {
-                                                const btn = document.getElementById('copy-logs-button');
-                                                btn.textContent = "❌ Failed to copy";
-                                                setTimeout(() => { btn.textContent = "📋 Copy Logs"; }, 2000);
-                                            }
-                                        );
-                                    }
-                                });
-                            </script>
-                            """, unsafe_allow_html=True)
-                        
-                        # Create a container for the log output with auto-scroll
-                        log_container = st.container()
+                            st.markdown(COPY_LOGS_BUTTON_HTML, unsafe_allow_html=True)
                         
-                        # Add custom JavaScript to auto-scroll to bottom
-                        st.markdown("""
-                        <script>
-                            // Function to scroll log to bottom
-                            function scrollLogToBottom() {
-                                const logElement = document.querySelector('[data-testid="stText"] pre');
-                                if (logElement) {
-                                    logElement.style.maxHeight = "400px";
-                                    logElement.style.overflow = "auto";
-                                    logElement.scrollTop = logElement.scrollHeight;
-                                }
-                            }
-                            
-                            // Set initial scroll and add observer to handle updates
-                            scrollLogToBottom();
-                            const observer = new MutationObserver(scrollLogToBottom);
-                            const targetNode = document.querySelector('[data-testid="stText"]');
-                            if (targetNode) {
-                                observer.observe(targetNode, { childList: true, subtree: true });
-                            }
-                        </script>
-                        """, unsafe_allow_html=True)
+                        # Collapsible log box that shows whether the run is going, done or failed
+                        log_status = st.status(LOG_STATUS_LABEL, expanded=True)
                     
                     # Run the process and capture output in real-time
                     process = subprocess.Popen(
                         cmd, 
                         stdout=subprocess.PIPE, 
                         stderr=subprocess.STDOUT,
-                        universal_newlines=True
+                        universal_newlines=True,
+                        bufsize=SUBPROCESS_PIPE_BUFFER,
+                        env=SUBPROCESS_ENV
                     )
                     
-                    # Import datetime for timestamps
-                    from datetime import datetime
-                    
                     # Show output in real-time with auto-scrolling and timestamps
-                    full_output = ""
-                    log_display = log_container.empty()
+                    log_display = log_status.empty()
                     
-                    # Track if we need to parse log sections
-                    need_to_parse_sections = True
-                    current_output = []
+                    current_output = deque(maxlen=LOG_VIEW_LINES)
+                    last_progress = 0.0
                     
-                    for line in iter(process.stdout.readline, ''):
-                        if not line:
-                            break
+                    with start_run_log("research") as full_log:
+                        for lines in iter_output_batches(process.stdout):
+                            # Keep every raw line for the full log download
+                            full_log.writelines(lines)
                             
-                        # Check if this looks like a log section start
-                        if '[' in line and ']' in line and any(x in line for x in ['m[', 'Generating', 'Processing', 'Searching', 'Calling']):
-                            # If we detect a timestamp pattern like [HH:MM:SS], treat as a new log entry
-                            need_to_parse_sections = True
-                        
-                        # Add timestamp to the line
-                        timestamp = datetime.now().strftime("%H:%M:%S")
-                        
-                        # Strip only trailing/leading whitespace but preserve internal spacing
-                        styled_line = line.rstrip().lstrip()
-                        
-                        # Parse long lines into smaller chunks if needed
-                        if need_to_parse_sections and len(styled_line) > 80 and ('[' in styled_line and ']' in styled_line):
-                            # Try to break apart sections that look like separate log entries but got combined
-                            sections = []
-                            # Split on timestamp-like patterns but keep the delimiter
-                            import re
-                            parts = re.split(r'(\[\d{2}:\d{2}:\d{2}\])', styled_line)
+                            for line in lines:
+                                # Add timestamp and colour to the line
+                                current_output.extend(format_log_line(line, datetime.now().strftime("%H:%M:%S")))
                             
-                            # Reconstruct with line breaks
-                            current_section = ""
-                            for i, part in enumerate(parts):
-                                if i > 0 and re.match(r'\[\d{2}:\d{2}:\d{2}\]', part):
-                                    # This is a timestamp, start a new section
-                                    if current_section:
-                                        sections.append(current_section)
-                                    current_section = part
-                                else:
-                                    current_section += part
+                            # Update status and progress estimate once per batch, only when it moves forward
+                            progress = find_progress(lines, RESEARCH_PROGRESS_MARKERS, last_progress)
+                            if progress:
+                                last_progress, status = progress
+                                status_text.text(status)
+                                progress_bar.progress(last_progress)
                             
-                            if current_section:
-                                sections.append(current_section)
-                                
-                            # Process each section with colors
-                            for section in sections:
-                                # Color the section based on content
-                                if "ERROR" in section or "Error" in section or "Failed" in section:
-                                    current_output.append(f"<span style='color: #ff4b4b;'>[{timestamp}] {section}</span>")
-                                elif "WARNING" in section or "Warning" in section:
-                                    current_output.append(f"<span style='color: #ffa500;'>[{timestamp}] {section}</span>")
-                                elif "Searching for:" in section:
-                                    current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {section}</span>")
-                                elif "Processing results" in section:
-                                    current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {section}</span>")
-                                elif "Generating" in section:
-                                    current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {section}</span>")
-                                elif "Uploading to OpenAI" in section:
-                                    current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {section}</span>")
-                                elif "Research completed" in section or "success" in section.lower():
-                                    current_output.append(f"<span style='color: #00cc66;'>[{timestamp}] {section}</span>")
-                                elif "INFO" in section:
-                                    current_output.append(f"<span style='color: #7f7f7f;'>[{timestamp}] {section}</span>")
-                                else:
-                                    current_output.append(f"[{timestamp}] {section}")
-                        else:
-                            # Process normally
-                            if "ERROR" in styled_line or "Error" in styled_line or "Failed" in styled_line:
-                                current_output.append(f"<span style='color: #ff4b4b;'>[{timestamp}] {styled_line}</span>")
-                            elif "WARNING" in styled_line or "Warning" in styled_line:
-                                current_output.append(f"<span style='color: #ffa500;'>[{timestamp}] {styled_line}</span>")
-                            elif "Searching for:" in styled_line:
-                                current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {styled_line}</span>")
-                            elif "Processing results" in styled_line:
-                                current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {styled_line}</span>")
-                            elif "Generating" in styled_line:
-                                current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {styled_line}</span>")
-                            elif "Uploading to OpenAI" in styled_line:
-                                current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {styled_line}</span>")
-                            elif "Research completed" in styled_line or "success" in styled_line.lower():
-                                current_output.append(f"<span style='color: #00cc66;'>[{timestamp}] {styled_line}</span>")
-                            elif "INFO" in styled_line:
-                                current_output.append(f"<span style='color: #7f7f7f;'>[{timestamp}] {styled_line}</span>")
-                            else:
-                                current_output.append(f"[{timestamp}] {styled_line}")
-                        
-                        # Join output lines with explicit line breaks for HTML
-                        full_output = "<br>".join(current_output)
-                        
-                        # Update status and progress estimate based on output parsing
-                        if "Searching for:" in line:
-                            status_text.text("Searching for information...")
-                            progress_bar.progress(0.2)
-                        elif "Processing results" in line:
-                            status_text.text("Processing search results...")
-                            progress_bar.progress(0.4)
-                        elif "Generating research summaries" in line:
-                            status_text.text("Generating research summaries...")
-                            progress_bar.progress(0.6)
-                        elif "Uploading to OpenAI" in line:
-                            status_text.text("Uploading to OpenAI...")
-                            progress_bar.progress(0.8)
-                        elif "Research completed" in line:
-                            status_text.text("Research completed!")
-                            progress_bar.progress(1.0)
-                        
-                        # Display the log output with HTML formatting for proper line breaks
-                        log_display.markdown(f"""
-                        <div style='margin:0; padding:10px; background-color:#f5f5f5; max-height:400px; overflow:auto; white-space: pre-wrap; word-wrap: break-word;'>
-                            {full_output}
-                        </div>
-                        """, unsafe_allow_html=True)
+                            # Join the visible lines with explicit HTML line breaks, once per batch
+                            log_display.markdown(
+                                LOG_VIEW_HTML.format("<br>".join(current_output)),
+                                unsafe_allow_html=True
+                            )
                     
                     # Wait for process to complete
                     process.stdout.close()
                     return_code = process.wait()
                     
                     if return_code == 0:
+                        log_status.update(label="Research log", state="complete", expanded=False)
                         status_text.text("Research completed successfully!")
                         progress_bar.progress(1.0)
                         st.success(f"Research on '{topic}' completed successfully!")
                         
                         # Refresh the project list
-                        st.session_state.project_list_cache_time = 0
+                        clear_research_projects_cache()
                     else:
+                        log_status.update(label="Research log", state="error")
                         status_text.text(f"Research failed with error code {return_code}")
                         st.error(f"Research process failed with return code {return_code}")
                     
                 except Exception as e:
                     st.error(f"Error executing research: {str(e)}")
                     logger.error(f"Research execution error: {str(e)}", exc_info=True)
+    
+    # Download buttons cannot live inside a form
+    offer_run_log_download("research")
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+def generate_preview_questions(topic, perspective, depth):
+    """
+    Generate research questions for the preview tab, reusing earlier results for the same inputs.
+    
+    Args:
+        topic: Research topic
+        perspective: Professional perspective to research from
+        depth: Number of questions to generate
+        
+    Returns:
+        List of generated questions
+        
+    Raises:
+        ValueError: If no questions were generated; raising keeps the failure out of the cache
+    """
+    questions = generate_research_questions(topic, perspective, depth)
+    if not questions:
+        raise ValueError(f"No questions generated for topic: {topic}")
+    return questions
 
 def preview_questions():
     """Generate and preview research questions without starting the full process."""
@@ -462,16 +629,22 @@ def preview_questions():
                       max_value=70, 
                       value=5)
     
-    if st.button("Generate Preview") and topic:
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        generate = st.button("Generate Preview")
+    with col2:
+        if st.button("Clear Cached Previews"):
+            generate_preview_questions.clear()
+    
+    if generate and topic:
         with st.spinner(f"Generating research questions for: {topic}..."):
             try:
-                questions = generate_research_questions(topic, perspective, depth)
-                if questions:
-                    st.success(f"Generated {len(questions)} research questions")
-                    for i, question in enumerate(questions, 1):
-                        st.markdown(f"**Q{i}:** {question}")
-                else:
-                    st.error("Failed to generate questions. Please try again.")
+                questions = generate_preview_questions(topic, perspective, depth)
+                st.success(f"Generated {len(questions)} research questions")
+                for i, question in enumerate(questions, 1):
+                    st.markdown(f"**Q{i}:** {question}")
+            except ValueError:
+                st.error("Failed to generate questions. Please try again.")
             except Exception as e:
                 st.error(f"Error generating questions: {str(e)}")
 
@@ -484,10 +657,8 @@ def add_questions_to_existing_project():
         return
     
     # Load and filter projects - allow projects regardless of OpenAI integration status
-    all_projects = load_research_projects()
     show_inactive = should_show_inactive_projects()
-    available_projects = filter_available_projects(
-        all_projects, 
+    available_projects = load_available_projects(
         require_openai=False,
         require_vector_store=False,
         include_incomplete=True,
@@ -499,14 +670,10 @@ def add_questions_to_existing_project():
         return
     
     # Toggle for inactive projects
-    if st.toggle("Show Inactive Projects", value=show_inactive, key="show_inactive_toggle_add"):
-        if not show_inactive:
-            set_show_inactive_projects(True)
-            st.rerun()
-    else:
-        if show_inactive:
-            set_show_inactive_projects(False)
-            st.rerun()
+    new_show_inactive = st.toggle("Show Inactive Projects", value=show_inactive, key="show_inactive_toggle_add")
+    if new_show_inactive != show_inactive:
+        set_show_inactive_projects(new_show_inactive)
+        st.rerun()
     
     # Project selection
     project_options = [
@@ -603,20 +770,9 @@ def add_questions_to_existing_project():
                 st.error("No valid questions found. Please enter at least one question.")
                 return
             
-            # Detect which python command is available
-            python_cmd = "python3"
-            try:
-                import shutil
-                if not shutil.which("python3"):
-                    python_cmd = "python"
-                    
-                logger.info(f"Using Python command: {python_cmd}")
-            except Exception as e:
-                logger.warning(f"Error detecting Python command: {str(e)}. Falling back to python3")
-            
             # Build command for subprocess
             cmd = [
-                python_cmd, 
+                PYTHON_CMD, 
                 "research_orchestrator.py",
                 "--existing-project", project_id,
                 "--add-questions"
@@ -633,7 +789,8 @@ def add_questions_to_existing_project():
                 "--openai-integration", "enable" if enable_openai else "disable"
             ])
             
-            # Execute research_orchestrator.py as a subprocess
+            # Execute research_orchestrator.py as a subprocess; imported here so the chat tab never loads it
+            import subprocess
             with st.spinner(f"Adding {len(new_questions)} questions to project..."):
                 try:
                     # Create a progress display container
@@ -646,211 +803,72 @@ def add_questions_to_existing_project():
                         # Add a copy button for the logs
                         copy_col1, copy_col2 = st.columns([3, 1])
                         with copy_col2:
-                            st.markdown("""
-                            <div id="copy-button-container" style="text-align: right;">
-                                <button id="copy-logs-button" style="
-                                    background-color: #f0f2f6; 
-                                    border: 1px solid #ddd; 
-                                    padding: 5px 10px; 
-                                    border-radius: 4px;
-                                    cursor: pointer;
-                                    font-size: 0.8em;">
-                                    📋 Copy Logs
-                                </button>
-                            </div>
-                            
-                            <script>
-                                document.getElementById('copy-logs-button').addEventListener('click', function() {
-                                    const preElement = document.querySelector('[data-testid="stText"] pre');
-                                    if (preElement) {
-                                        const text = preElement.textContent;
-                                        navigator.clipboard.writeText(text).then(
-                                            () => {
-                                                const btn = document.getElementById('copy-logs-button');
-                                                const originalText = btn.textContent;
-                                                btn.textContent = "✅ Copied!";
-                                                setTimeout(() => { btn.textContent = originalText; }, 2000);
-                                            },
-                                            () => {
-                                                const btn = document.getElementById('copy-logs-button');
-                                                btn.textContent = "❌ Failed to copy";
-                                                setTimeout(() => { btn.textContent = "📋 Copy Logs"; }, 2000);
-                                            }
-                                        );
-                                    }
-                                });
-                            </script>
-                            """, unsafe_allow_html=True)
-                        
-                        # Create a container for the log output with auto-scroll
-                        log_container = st.container()
+                            st.markdown(COPY_LOGS_BUTTON_HTML, unsafe_allow_html=True)
                         
-                        # Add custom JavaScript to auto-scroll to bottom
-                        st.markdown("""
-                        <script>
-                            // Function to scroll log to bottom
-                            function scrollLogToBottom() {
-                                const logElement = document.querySelector('[data-testid="stText"] pre');
-                                if (logElement) {
-                                    logElement.style.maxHeight = "400px";
-                                    logElement.style.overflow = "auto";
-                                    logElement.scrollTop = logElement.scrollHeight;
-                                }
-                            }
-                            
-                            // Set initial scroll and add observer to handle updates
-                            scrollLogToBottom();
-                            const observer = new MutationObserver(scrollLogToBottom);
-                            const targetNode = document.querySelector('[data-testid="stText"]');
-                            if (targetNode) {
-                                observer.observe(targetNode, { childList: true, subtree: true });
-                            }
-                        </script>
-                        """, unsafe_allow_html=True)
+                        # Collapsible log box that shows whether the run is going, done or failed
+                        log_status = st.status(LOG_STATUS_LABEL, expanded=True)
                     
                     # Run the process and capture output in real-time
                     process = subprocess.Popen(
                         cmd, 
                         stdout=subprocess.PIPE, 
                         stderr=subprocess.STDOUT,
-                        universal_newlines=True
+                        universal_newlines=True,
+                        bufsize=SUBPROCESS_PIPE_BUFFER,
+                        env=SUBPROCESS_ENV
                     )
                     
-                    # Import datetime for timestamps
-                    from datetime import datetime
-                    
                     # Show output in real-time with auto-scrolling and timestamps
-                    full_output = ""
-                    log_display = log_container.empty()
+                    log_display = log_status.empty()
                     
-                    # Track if we need to parse log sections
-                    need_to_parse_sections = True
-                    current_output = []
+                    current_output = deque(maxlen=LOG_VIEW_LINES)
+                    last_progress = 0.0
                     
-                    for line in iter(process.stdout.readline, ''):
-                        if not line:
-                            break
+                    with start_run_log("add_questions") as full_log:
+                        for lines in iter_output_batches(process.stdout):
+                            # Keep every raw line for the full log download
+                            full_log.writelines(lines)
                             
-                        # Check if this looks like a log section start
-                        if '[' in line and ']' in line and any(x in line for x in ['m[', 'Generating', 'Processing', 'Searching', 'Calling']):
-                            # If we detect a timestamp pattern like [HH:MM:SS], treat as a new log entry
-                            need_to_parse_sections = True
-                        
-                        # Add timestamp to the line
-                        timestamp = datetime.now().strftime("%H:%M:%S")
-                        
-                        # Strip only trailing/leading whitespace but preserve internal spacing
-                        styled_line = line.rstrip().lstrip()
-                        
-                        # Parse long lines into smaller chunks if needed
-                        if need_to_parse_sections and len(styled_line) > 80 and ('[' in styled_line and ']' in styled_line):
-                            # Try to break apart sections that look like separate log entries but got combined
-                            sections = []
-                            # Split on timestamp-like patterns but keep the delimiter
-                            import re
-                            parts = re.split(r'(\[\d{2}:\d{2}:\d{2}\])', styled_line)
+                            for line in lines:
+                                # Add timestamp and colour to the line
+                                current_output.extend(format_log_line(line, datetime.now().strftime("%H:%M:%S")))
                             
-                            # Reconstruct with line breaks
-                            current_section = ""
-                            for i, part in enumerate(parts):
-                                if i > 0 and re.match(r'\[\d{2}:\d{2}:\d{2}\]', part):
-                                    # This is a timestamp, start a new section
-                                    if current_section:
-                                        sections.append(current_section)
-                                    current_section = part
-                                else:
-                                    current_section += part
+                            # Update status and progress estimate once per batch, only when it moves forward
+                            progress = find_progress(lines, ADD_QUESTIONS_PROGRESS_MARKERS, last_progress)
+                            if progress:
+                                last_progress, status = progress
+                                status_text.text(status)
+                                progress_bar.progress(last_progress)
                             
-                            if current_section:
-                                sections.append(current_section)
-                                
-                            # Process each section with colors
-                            for section in sections:
-                                # Color the section based on content
-                                if "ERROR" in section or "Error" in section or "Failed" in section:
-                                    current_output.append(f"<span style='color: #ff4b4b;'>[{timestamp}] {section}</span>")
-                                elif "WARNING" in section or "Warning" in section:
-                                    current_output.append(f"<span style='color: #ffa500;'>[{timestamp}] {section}</span>")
-                                elif "Searching for:" in section:
-                                    current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {section}</span>")
-                                elif "Processing results" in section:
-                                    current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {section}</span>")
-                                elif "Generating" in section:
-                                    current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {section}</span>")
-                                elif "Uploading to OpenAI" in section:
-                                    current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {section}</span>")
-                                elif "Research completed" in section or "success" in section.lower():
-                                    current_output.append(f"<span style='color: #00cc66;'>[{timestamp}] {section}</span>")
-                                elif "INFO" in section:
-                                    current_output.append(f"<span style='color: #7f7f7f;'>[{timestamp}] {section}</span>")
-                                else:
-                                    current_output.append(f"[{timestamp}] {section}")
-                        else:
-                            # Process normally
-                            if "ERROR" in styled_line or "Error" in styled_line or "Failed" in styled_line:
-                                current_output.append(f"<span style='color: #ff4b4b;'>[{timestamp}] {styled_line}</span>")
-                            elif "WARNING" in styled_line or "Warning" in styled_line:
-                                current_output.append(f"<span style='color: #ffa500;'>[{timestamp}] {styled_line}</span>")
-                            elif "Searching for:" in styled_line:
-                                current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {styled_line}</span>")
-                            elif "Processing results" in styled_line:
-                                current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {styled_line}</span>")
-                            elif "Generating" in styled_line:
-                                current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {styled_line}</span>")
-                            elif "Uploading to OpenAI" in styled_line:
-                                current_output.append(f"<span style='color: #4b8eff;'>[{timestamp}] {styled_line}</span>")
-                            elif "Research completed" in styled_line or "success" in styled_line.lower():
-                                current_output.append(f"<span style='color: #00cc66;'>[{timestamp}] {styled_line}</span>")
-                            elif "INFO" in styled_line:
-                                current_output.append(f"<span style='color: #7f7f7f;'>[{timestamp}] {styled_line}</span>")
-                            else:
-                                current_output.append(f"[{timestamp}] {styled_line}")
-                        
-                        # Join output lines with explicit line breaks for HTML
-                        full_output = "<br>".join(current_output)
-                        
-                        # Update status and progress estimate based on output parsing
-                        if "Adding" in line and "new questions to existing project" in line:
-                            status_text.text("Adding questions to project...")
-                            progress_bar.progress(0.2)
-                        elif "Searching for:" in line:
-                            status_text.text("Searching for information...")
-                            progress_bar.progress(0.4)
-                        elif "Processing results" in line:
-                            status_text.text("Processing search results...")
-                            progress_bar.progress(0.6)
-                        elif "Uploading to OpenAI" in line:
-                            status_text.text("Uploading to OpenAI...")
-                            progress_bar.progress(0.8)
-                        elif "Research completed" in line:
-                            status_text.text("Questions added successfully!")
-                            progress_bar.progress(1.0)
-                        
-                        # Display the log output with HTML formatting for proper line breaks
-                        log_display.markdown(f"""
-                        <div style='margin:0; padding:10px; background-color:#f5f5f5; max-height:400px; overflow:auto; white-space: pre-wrap; word-wrap: break-word;'>
-                            {full_output}
-                        </div>
-                        """, unsafe_allow_html=True)
+                            # Join the visible lines with explicit HTML line breaks, once per batch
+                            log_display.markdown(
+                                LOG_VIEW_HTML.format("<br>".join(current_output)),
+                                unsafe_allow_html=True
+                            )
                     
                     # Wait for process to complete
                     process.stdout.close()
                     return_code = process.wait()
                     
                     if return_code == 0:
+                        log_status.update(label="Research log", state="complete", expanded=False)
                         status_text.text("Questions added successfully!")
                         progress_bar.progress(1.0)
                         st.success(f"Successfully added {len(new_questions)} questions to project '{topic}'!")
                         
                         # Refresh the project list
-                        st.session_state.project_list_cache_time = 0
+                        clear_research_projects_cache()
                     else:
+                        log_status.update(label="Research log", state="error")
                         status_text.text(f"Process failed with error code {return_code}")
                         st.error(f"Failed to add questions. Process returned with code {return_code}")
                     
                 except Exception as e:
                     st.error(f"Error executing process: {str(e)}")
                     logger.error(f"Error adding questions: {str(e)}", exc_info=True)
+    
+    # Download buttons cannot live inside a form
+    offer_run_log_download("add_questions")
 
 def main():
     """Main function to run the Streamlit app."""
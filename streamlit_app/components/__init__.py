@@ -29,7 +29,8 @@ from .model_selector import (
     compact_model_selector,
     model_option_card,
     web_search_toggle,
-    model_settings_panel
+    model_settings_panel,
+    clear_model_cache
 )
 
 # Export debug panel components
@@ -62,6 +63,7 @@ __all__ = [
     'model_option_card',
     'web_search_toggle',
     'model_settings_panel',
+    'clear_model_cache',
     
     # Debug panel
     'debug_panel',
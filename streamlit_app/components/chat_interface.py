@@ -8,13 +8,15 @@ streaming, and better visual design.
 import streamlit as st
 import time
 import html
-from typing import List, Dict, Any, Optional, Callable, Tuple
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Callable, Tuple, Iterator
 from streamlit_app.utils import (
     get_logger,
     get_conversation_messages,
     add_user_message,
     add_assistant_message,
     get_research_response,
+    stream_research_response,
     create_openai_client,
     get_model,
     is_web_search_enabled,
@@ -28,16 +30,34 @@ from streamlit_app.utils import (
 
 logger = get_logger("chat_interface")
 
+# Animated dots shown while the assistant's answer is on its way
+TYPING_INDICATOR_HTML = '<div class="typing-indicator"><span></span><span></span><span></span></div>'
+
+# Streamed text is passed to the page at sentence or line ends, or once this many characters are waiting
+STREAM_FLUSH_CHARS = 50
+
+def coalesce_stream(deltas: Iterator[str]) -> Iterator[str]:
+    """
+    Group streamed text deltas into larger chunks to redraw the answer less often.
+    
+    Args:
+        deltas: Text deltas as they arrive from the API
+        
+    Yields:
+        Chunks ending at a sentence or line end, or of at least STREAM_FLUSH_CHARS characters
+    """
+    buffer = ""
+    for delta in deltas:
+        buffer += delta
+        if len(buffer) >= STREAM_FLUSH_CHARS or "\n" in delta or buffer.endswith((". ", "? ", "! ")):
+            yield buffer
+            buffer = ""
+    if buffer:
+        yield buffer
+
 def typing_animation():
     """Display a typing animation for the assistant."""
-    return st.markdown(
-        """
-        <div class="typing-indicator">
-            <span></span><span></span><span></span>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    return st.markdown(TYPING_INDICATOR_HTML, unsafe_allow_html=True)
 
 def format_markdown(text: str) -> str:
     """Format markdown text for display, escaping HTML characters."""
@@ -45,67 +65,124 @@ def format_markdown(text: str) -> str:
     text = html.escape(text)
     return text
 
-def display_citation(citation: Dict[str, str]) -> None:
+# Citation markup, filled in by render_citation_html
+WEB_CITATION_TEMPLATE = (
+    '<div class="citation web-citation">'
+    '<div class="citation-header">🌐 {id}</div>'
+    '<div>{text}</div>'
+    '<div class="citation-source"><a href="{source}" target="_blank">{source}</a></div>'
+    '</div>'
+)
+FILE_CITATION_TEMPLATE = (
+    '<div class="citation">'
+    '<div class="citation-header">📄 {id}</div>'
+    '<div>{text}</div>'
+    '<div class="citation-source">{source}</div>'
+    '</div>'
+)
+
+@lru_cache(maxsize=1024)
+def render_citation_html(citation_id: str, text: str, source: str) -> str:
+    """
+    Build the HTML for a citation, reusing the result for citations already rendered.
+    
+    Args:
+        citation_id: Citation label
+        text: Citation text
+        source: Source filename, or "Web: <url>" for web citations
+        
+    Returns:
+        HTML for the citation
+    """
+    if source.startswith('Web:'):
+        return WEB_CITATION_TEMPLATE.format(id=citation_id, text=text, source=source.replace('Web: ', ''))
+    return FILE_CITATION_TEMPLATE.format(id=citation_id, text=text, source=source)
+
+def citations_html(citations: List[Dict[str, str]]) -> str:
+    """
+    Build the HTML for a list of citations, so they can be shown with one st.markdown call.
+    
+    Args:
+        citations: List of citation dictionaries with 'id', 'text', and 'source' keys
+        
+    Returns:
+        HTML for all the citations
+    """
+    parts = []
+    for citation in citations:
+        source = citation.get('source', 'Unknown source')
+        default_id = 'Web source' if source.startswith('Web:') else 'Source'
+        parts.append(render_citation_html(citation.get('id', default_id), citation.get('text', ''), source))
+    return '<div class="citations-block">\n' + "\n".join(parts) + '\n</div>'
+
+def build_citations(citation_sources: List[str]) -> Tuple[List[Dict[str, str]], int, int]:
     """
-    Display a citation with styling.
+    Turn citation sources into citation dictionaries for display, dropping duplicates.
     
     Args:
-        citation: Citation dictionary with 'id', 'text', and 'source' keys
+        citation_sources: Source filenames, or "Web: <url>" for web citations
+        
+    Returns:
+        Tuple of (citations, number of file citations, number of web citations)
     """
-    # Determine if this is a web citation
-    is_web_citation = citation.get('source', '').startswith('Web:')
-    
-    with st.container():
-        if is_web_citation:
-            # For web citations
-            source = citation.get('source', 'Unknown source').replace('Web: ', '')
-            st.markdown(f"""
-            <div class="citation web-citation">
-                <div class="citation-header">🌐 {citation.get('id', 'Web source')}</div>
-                <div>{citation.get('text', '')}</div>
-                <div class="citation-source">
-                    <a href="{source}" target="_blank">{source}</a>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            # For file citations
-            st.markdown(f"""
-            <div class="citation">
-                <div class="citation-header">📄 {citation.get('id', 'Source')}</div>
-                <div>{citation.get('text', '')}</div>
-                <div class="citation-source">{citation.get('source', 'Unknown source')}</div>
-            </div>
-            """, unsafe_allow_html=True)
+    # dict.fromkeys keeps the first occurrence of each source, in order
+    sources = list(dict.fromkeys(citation_sources))
+    citations = [
+        {
+            "id": f"citation_{i}",
+            "text": "From web search" if source.startswith("Web:") else f"From document: {source}",
+            "source": source
+        }
+        for i, source in enumerate(sources, 1)
+    ]
+    web_citations = sum(1 for source in sources if source.startswith("Web:"))
+    return citations, len(sources) - web_citations, web_citations
 
-def display_citations(citations: List[Dict[str, str]]) -> None:
+def display_citations(
+    citations: List[Dict[str, str]],
+    expanded: Optional[bool] = None,
+    label: Optional[str] = None,
+    key: Optional[str] = None
+) -> None:
     """
     Display a list of citations with an expandable section.
     
+    When sources are hidden only a header button is rendered, so the citation
+    HTML is not built at all; clicking it turns the show-sources setting on.
+    
     Args:
         citations: List of citation dictionaries
+        expanded: Whether the citations are shown (defaults to the show-sources setting)
+        label: Header text (defaults to "📚 Sources (N)")
+        key: Widget key for the header button, unique per message
     """
     if not citations:
         return
     
-    with st.expander(f"📚 Sources ({len(citations)})", expanded=should_show_sources()):
-        for citation in citations:
-            display_citation(citation)
+    if expanded is None:
+        expanded = should_show_sources()
+    if label is None:
+        label = f"📚 Sources ({len(citations)})"
+    
+    if not expanded:
+        st.button(label, key=key, on_click=set_show_sources, args=(True,))
+        return
+    
+    with st.expander(label, expanded=True):
+        st.markdown(citations_html(citations), unsafe_allow_html=True)
 
 def display_message_history() -> None:
     """Display the conversation history from session state."""
-    # Get message history
+    # Get message history and the sources setting once for all messages
     messages = get_conversation_messages()
+    show_sources = should_show_sources()
     
-    # Create a container for the chat with appropriate styling
+    # Create a container for the chat
     chat_container = st.container()
     
     with chat_container:
-        # Use a container with a CSS class for styling
-        st.markdown('<div class="chat-container">', unsafe_allow_html=True)
-        
         # Iterate through messages and display them
-        for msg in messages:
+        for i, msg in enumerate(messages):
             role = msg.get("role")
             content = msg.get("content", "")
             citations = msg.get("citations", [])
@@ -116,9 +193,7 @@ def display_message_history() -> None:
                 
                 # Display citations if available and this is an assistant message
                 if role == "assistant" and citations:
-                    display_citations(citations)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+                    display_citations(citations, expanded=show_sources, key=f"sources_{i}")
 
 def process_user_message(
     user_message: str,
@@ -156,14 +231,12 @@ def process_user_message(
         client = create_openai_client()
         if not client:
             logger.error("OpenAI client not available")
-            set_generating(False)
             return False
         
         # Get vector store ID from selected project
         vector_store_id = get_vector_store_id()
         if not vector_store_id:
             logger.error("No vector store ID available")
-            set_generating(False)
             return False
         
         # Get model and web search settings
@@ -192,17 +265,10 @@ def process_user_message(
                 f"❌ I'm sorry, I couldn't generate a response. Error: {error_message}",
                 []
             )
-            set_generating(False)
             return False
         
         # Format citations for display
-        citations = []
-        for i, source in enumerate(citation_sources):
-            citations.append({
-                "id": f"citation_{i+1}",
-                "text": f"From document: {source}",
-                "source": source
-            })
+        citations, _, _ = build_citations(citation_sources)
         
         # Add response to history
         add_assistant_message(response_text, citations)
@@ -212,7 +278,6 @@ def process_user_message(
             on_complete(response_text, citations, debug_data)
         
         logger.info(f"Successfully generated response ({len(response_text)} chars, {len(citations)} citations)")
-        set_generating(False)
         return True
         
     except Exception as e:
@@ -224,8 +289,11 @@ def process_user_message(
             []
         )
         
-        set_generating(False)
         return False
+    
+    finally:
+        # Clear the generating flag on every exit path
+        set_generating(False)
 
 def streaming_process_user_message(
     user_message: str,
@@ -261,14 +329,9 @@ def streaming_process_user_message(
         on_start()
     
     # Show typing animation
-    placeholder.markdown(
-        """
-        <div class="typing-indicator">
-            <span></span><span></span><span></span>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    placeholder.markdown(TYPING_INDICATOR_HTML, unsafe_allow_html=True)
+    # Citations get their own slot below the answer, so the answer element is only ever updated in place
+    citation_placeholder = st.empty()
     
     try:
         # Get the OpenAI client
@@ -276,7 +339,6 @@ def streaming_process_user_message(
         if not client:
             logger.error("OpenAI client not available")
             placeholder.error("OpenAI client not available")
-            set_generating(False)
             return False
         
         # Get vector store ID from selected project
@@ -284,7 +346,6 @@ def streaming_process_user_message(
         if not vector_store_id:
             logger.error("No vector store ID available")
             placeholder.error("No vector store ID available")
-            set_generating(False)
             return False
         
         # Get model and web search settings
@@ -293,57 +354,41 @@ def streaming_process_user_message(
         
         logger.info(f"Getting response with model={model}, web_search={web_search}")
         
-        # Get response from OpenAI (non-streaming for now)
-        # TODO: Implement actual streaming using st.write_stream when OpenAI supports it with file search
-        response_text, citation_sources, debug_data = get_research_response(
+        # Stream the response from OpenAI into the placeholder, replacing the typing animation in place
+        result = {}
+        streamed_text = ""
+        for chunk in coalesce_stream(stream_research_response(
             client=client,
             query=user_message,
             vector_store_id=vector_store_id,
+            result=result,
             model=model,
             enable_web_search=web_search,
             debug=True
-        )
+        )):
+            streamed_text += chunk
+            placeholder.markdown(streamed_text)
+        response_text, citation_sources, debug_data = result["text"], result["citations"], result["debug_data"]
         
         # Check if response was successful
         if not response_text:
             error_message = debug_data.get("error", "Unknown error")
             logger.error(f"Failed to get response: {error_message}")
             
-            placeholder.error(f"I'm sorry, I couldn't generate a response. Error: {error_message}")
+            # Keep any partial answer on screen and show the error below it
+            error_target = citation_placeholder if streamed_text else placeholder
+            error_target.error(f"I'm sorry, I couldn't generate a response. Error: {error_message}")
             
-            # Add error message to history
+            # Add error message to history, after any text that was already streamed
+            error_text = f"❌ I'm sorry, I couldn't generate a response. Error: {error_message}"
             add_assistant_message(
-                f"❌ I'm sorry, I couldn't generate a response. Error: {error_message}",
+                f"{streamed_text}\n\n{error_text}" if streamed_text else error_text,
                 []
             )
-            set_generating(False)
             return False
         
-        # Clear the placeholder with the typing animation
-        placeholder.empty()
-        
         # Format citations for display
-        citations = []
-        file_citations = 0
-        web_citations = 0
-        
-        for i, source in enumerate(citation_sources):
-            # Check if this is a web citation
-            if source.startswith("Web:"):
-                web_citations += 1
-                citation_text = "From web search"
-            else:
-                file_citations += 1
-                citation_text = f"From document: {source}"
-                
-            citations.append({
-                "id": f"citation_{i+1}",
-                "text": citation_text,
-                "source": source
-            })
-        
-        # First display the response text
-        st.markdown(response_text)
+        citations, file_citations, web_citations = build_citations(citation_sources)
         
         # Display citations if any
         if citations:
@@ -355,9 +400,8 @@ def streaming_process_user_message(
             else:
                 citation_label = f"📄 Document Sources ({file_citations})"
                 
-            with st.expander(citation_label, expanded=should_show_sources()):
-                for citation in citations:
-                    display_citation(citation)
+            with citation_placeholder.container():
+                display_citations(citations, label=citation_label, key="sources_stream")
         
         # Add response to history
         add_assistant_message(response_text, citations)
@@ -367,7 +411,6 @@ def streaming_process_user_message(
             on_complete(response_text, citations, debug_data)
         
         logger.info(f"Successfully generated response ({len(response_text)} chars, {len(citations)} citations)")
-        set_generating(False)
         return True
         
     except Exception as e:
@@ -381,8 +424,11 @@ def streaming_process_user_message(
             []
         )
         
-        set_generating(False)
         return False
+    
+    finally:
+        # Clear the generating flag on every exit path
+        set_generating(False)
 
 def chat_interface(
     show_message_history: bool = True,
@@ -402,8 +448,13 @@ def chat_interface(
         st.warning("Please select a research project first")
         return
     
+    # Read the chat state once for this run; the message list is updated in place
+    generating = is_generating()
+    web_enabled = is_web_search_enabled()
+    messages = get_conversation_messages()
+    
     # Display a compact info message when generating
-    if is_generating():
+    if generating:
         st.info("Generating response...", icon="⏳")
         
     # Display conversation history if requested (in a container to apply styling)
@@ -411,11 +462,10 @@ def chat_interface(
         display_message_history()
     
     # Display a compact web search hint if enabled (using icon and inline style)
-    if is_web_search_enabled() and not is_generating():
+    if web_enabled and not generating:
         st.info("💡 Web search is enabled - ask about current events or topics beyond your research documents", icon="🔍")
     
     # Chat input - use a more compact styling
-    web_enabled = is_web_search_enabled()
     input_placeholder = "Ask about your research or current events..." if web_enabled else chat_box_placeholder
     
     # Add a small visual separator before the input (using CSS instead of spacing)
@@ -447,28 +497,28 @@ def chat_interface(
                 if success:
                     # Update the placeholder with the actual response (from history)
                     message_placeholder.empty()
-                    messages = get_conversation_messages()
-                    if messages and len(messages) > 0:
+                    if messages:
                         last_message = messages[-1]
                         if last_message["role"] == "assistant":
                             st.markdown(last_message["content"])
                             
                             # Display citations if available
                             if "citations" in last_message and last_message["citations"]:
-                                display_citations(last_message["citations"])
+                                display_citations(last_message["citations"], key="sources_latest")
                 else:
                     # Error already added to history and displayed
                     message_placeholder.empty()
                     
     # Add compact chat controls - clear chat, source toggle
-    if get_conversation_messages():
-        cols = st.columns([1, 1, 6])
-        with cols[0]:
+    if messages:
+        clear_col, sources_col = st.columns([1, 4])
+        with clear_col:
             if st.button("Clear Chat", key="clear_chat", use_container_width=True):
                 clear_conversation()
                 st.rerun()
-        with cols[1]:
+        with sources_col:
             expand = should_show_sources()
-            if st.toggle("Show Sources", value=expand, key="toggle_sources"):
-                set_show_sources(not expand)
+            new_expand = st.toggle("Show Sources", value=expand, key="toggle_sources")
+            if new_expand != expand:
+                set_show_sources(new_expand)
                 st.rerun() 
\ No newline at end of file
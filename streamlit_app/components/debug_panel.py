@@ -6,15 +6,62 @@ This module provides a panel for displaying debug information and logs.
 
 import streamlit as st
 import json
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from streamlit_app.utils import get_logger, is_debug_mode
 
 logger = get_logger("debug_panel")
 
+@lru_cache(maxsize=None)
+def _load_orjson():
+    """
+    Import orjson the first time debug data is formatted.
+    
+    orjson serializes large debug data much faster, but it is optional and only
+    needed once the debug panel is open.
+    
+    Returns:
+        The orjson module, or None if it is not installed
+    """
+    try:
+        import orjson
+        return orjson
+    except ImportError:
+        return None
+
 def format_json(data: Dict[str, Any], indent: int = 2) -> str:
     """Format JSON data for display."""
+    orjson = _load_orjson()
+    # orjson only supports two-space indentation
+    if orjson and indent == 2:
+        try:
+            return orjson.dumps(
+                data,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers beyond 64 bits; the json module handles them
     return json.dumps(data, indent=indent, default=str)
 
+@lru_cache(maxsize=1)
+def model_table_rows() -> List[Dict[str, str]]:
+    """
+    Build the rows of the available-models table once per process.
+    
+    The model list is fixed, so there is nothing to rebuild on later reruns.
+    
+    Returns:
+        List of rows with ID, Name, and Description columns
+    """
+    # Import get_available_models inside the function to avoid circular imports
+    from streamlit_app.utils import get_available_models
+    
+    return [
+        {"ID": model["id"], "Name": model["name"], "Description": model["description"]}
+        for model in get_available_models()
+    ]
+
 def display_debug_data(debug_data: Optional[Dict[str, Any]] = None) -> None:
     """
     Display debug data in a collapsible section.
@@ -30,61 +77,68 @@ def display_debug_data(debug_data: Optional[Dict[str, Any]] = None) -> None:
     tab1, tab2, tab3, tab4, tab5 = st.tabs(["Summary", "Request", "Response", "Models", "JSON"])
     
     with tab1:
-        # Display summary information
-        st.write("**Request Summary**")
-        st.write(f"Model: `{debug_data.get('model', 'unknown')}`")
-        st.write(f"Web Search: `{debug_data.get('web_search_enabled', False)}`")
-        st.write(f"Vector Store ID: `{debug_data.get('vector_store_id', 'unknown')}`")
-        
-        st.write("**Response Summary**")
-        st.write(f"Success: `{debug_data.get('success', False)}`")
-        st.write(f"Response Length: `{debug_data.get('response_length', 0)}` chars")
+        # Display summary information in a single element
+        lines = [
+            "**Request Summary**",
+            f"Model: `{debug_data.get('model', 'unknown')}`",
+            f"Web Search: `{debug_data.get('web_search_enabled', False)}`",
+            f"Vector Store ID: `{debug_data.get('vector_store_id', 'unknown')}`",
+            "**Response Summary**",
+            f"Success: `{debug_data.get('success', False)}`",
+            f"Response Length: `{debug_data.get('response_length', 0)}` chars",
+        ]
         
         # Display which tools were used
         if debug_data.get('web_search_enabled', False):
-            web_search_used = debug_data.get('used_web_search', False)
-            file_search_used = debug_data.get('used_file_search', False)
-            
-            if web_search_used:
-                st.write(f"✅ **Web search was used** with `{debug_data.get('web_citation_count', 0)}` citations")
+            if debug_data.get('used_web_search', False):
+                lines.append(f"✅ **Web search was used** with `{debug_data.get('web_citation_count', 0)}` citations")
             else:
-                st.write("❌ **Web search was NOT used**")
+                lines.append("❌ **Web search was NOT used**")
                 
-            if file_search_used:
-                st.write(f"✅ **File search was used** with `{debug_data.get('file_citation_count', 0)}` citations")
+            if debug_data.get('used_file_search', False):
+                lines.append(f"✅ **File search was used** with `{debug_data.get('file_citation_count', 0)}` citations")
             else:
-                st.write("❌ **File search was NOT used**")
+                lines.append("❌ **File search was NOT used**")
         
         # Display timing information if available
-        if debug_data.get('timing'):
-            st.write("**Timing Information**")
-            timing = debug_data.get('timing', {})
-            st.write(f"Total Time: `{timing.get('total', 0):.2f}` seconds")
-            st.write(f"API Time: `{timing.get('api', 0):.2f}` seconds")
-            st.write(f"Processing Time: `{timing.get('processing', 0):.2f}` seconds")
+        timing = debug_data.get('timing')
+        if timing:
+            lines += [
+                "**Timing Information**",
+                f"Total Time: `{timing.get('total', 0):.2f}` seconds",
+                f"API Time: `{timing.get('api', 0):.2f}` seconds",
+                f"Processing Time: `{timing.get('processing', 0):.2f}` seconds",
+            ]
+        
+        st.markdown("\n\n".join(lines))
     
     with tab2:
         # Display request information
-        st.write("**Request Details**")
-        st.write(f"Query: `{debug_data.get('query', '')}`")
-        st.write(f"Model: `{debug_data.get('model', 'unknown')}`")
-        st.write(f"Request Time: `{debug_data.get('request_time', 'unknown')}`")
+        st.markdown("\n\n".join([
+            "**Request Details**",
+            f"Query: `{debug_data.get('query', '')}`",
+            f"Model: `{debug_data.get('model', 'unknown')}`",
+            f"Request Time: `{debug_data.get('request_time', 'unknown')}`",
+        ]))
         
         # Display message history if available
         if debug_data.get('messages'):
             st.write("**Message History**")
             for i, msg in enumerate(debug_data.get('messages', [])):
                 role = msg.get('role', 'unknown')
-                content_preview = (msg.get('content', '')[:100] + '...') if len(msg.get('content', '')) > 100 else msg.get('content', '')
+                content = msg.get('content', '')
+                content_preview = content[:100] + '...' if len(content) > 100 else content
                 st.write(f"**{i+1}. {role.upper()}:** {content_preview}")
                 with st.expander("View full message"):
-                    st.write(msg.get('content', ''))
+                    st.write(content)
     
     with tab3:
         # Display response information
-        st.write("**Response Details**")
-        st.write(f"Success: `{debug_data.get('success', False)}`")
-        st.write(f"Response Time: `{debug_data.get('response_time', 'unknown')}`")
+        st.markdown("\n\n".join([
+            "**Response Details**",
+            f"Success: `{debug_data.get('success', False)}`",
+            f"Response Time: `{debug_data.get('response_time', 'unknown')}`",
+        ]))
         
         # Display error information if there was an error
         if not debug_data.get('success', False) and debug_data.get('error'):
@@ -101,33 +155,21 @@ def display_debug_data(debug_data: Optional[Dict[str, Any]] = None) -> None:
         
         # Display citation information if available
         if debug_data.get('citations'):
-            st.write("**Citations**")
+            lines = ["**Citations**"]
             for i, citation in enumerate(debug_data.get('citations', [])):
-                st.write(f"**Citation {i+1}:** {citation.get('text', 'Unknown citation')}")
-                st.write(f"Source: {citation.get('source', 'Unknown source')}")
-                st.write("---")
+                lines += [
+                    f"**Citation {i+1}:** {citation.get('text', 'Unknown citation')}",
+                    f"Source: {citation.get('source', 'Unknown source')}",
+                    "---",
+                ]
+            st.markdown("\n\n".join(lines))
     
     with tab4:
         # Display OpenAI models information
         st.write("**Available OpenAI Models**")
         
-        # Import get_available_models inside the function to avoid circular imports
-        from streamlit_app.utils import get_available_models
-        
-        # Get available models
-        models = get_available_models()
-        
-        # Create a table of models
-        data = []
-        for model in models:
-            data.append({
-                "ID": model["id"],
-                "Name": model["name"],
-                "Description": model["description"]
-            })
-        
         # Display as a dataframe
-        st.dataframe(data, use_container_width=True)
+        st.dataframe(model_table_rows(), use_container_width=True)
         
         # Add information about model usage
         st.info("These are the predefined models available for use with the Research Assistant. " +
@@ -155,7 +197,11 @@ def debug_panel(debug_data: Optional[Dict[str, Any]] = None) -> None:
     Args:
         debug_data: Debug data dictionary to display
     """
-    with st.expander("Debug Panel", expanded=is_debug_mode()):
+    # Build nothing unless debug mode is on
+    if not is_debug_mode():
+        return
+    
+    with st.expander("Debug Panel", expanded=True):
         tab1, tab2 = st.tabs(["Debug Data", "Logs"])
         
         with tab1:
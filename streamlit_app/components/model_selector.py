@@ -5,9 +5,26 @@ This module provides a visual interface for selecting OpenAI models.
 """
 
 import streamlit as st
-from typing import List, Dict, Any, Optional, Callable
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from streamlit_app.utils import get_available_models, get_model, set_model
 
+@lru_cache(maxsize=1)
+def _cached_available_models() -> Tuple[Dict[str, str], ...]:
+    """Return the model catalog, read once per process and shared by both selectors."""
+    return tuple(get_available_models())
+
+@lru_cache(maxsize=1)
+def _model_index() -> Tuple[Tuple[str, ...], Dict[str, str]]:
+    """Return the model IDs in display order and a mapping of ID to display name."""
+    models = _cached_available_models()
+    return tuple(model["id"] for model in models), {model["id"]: model["name"] for model in models}
+
+def clear_model_cache() -> None:
+    """Forget the cached model catalog so the next selector render reads it again."""
+    _cached_available_models.cache_clear()
+    _model_index.cache_clear()
+
 def model_option_card(
     model: Dict[str, str],
     is_selected: bool = False,
@@ -57,7 +74,7 @@ def model_selector(
         Currently selected model ID
     """
     # Get available models
-    models = get_available_models()
+    models = _cached_available_models()
     current_model = get_model()
     
     # If no callback is provided, use default state handler
@@ -96,18 +113,14 @@ def compact_model_selector(
     Returns:
         Currently selected model ID
     """
-    # Get available models
-    models = get_available_models()
+    # Model options, built once per catalog
+    model_options, model_names = _model_index()
     current_model = get_model()
     
     # If no callback is provided, use default state handler
     if on_model_selected is None:
         on_model_selected = set_model
     
-    # Model options
-    model_options = [model["id"] for model in models]
-    model_names = {model["id"]: model["name"] for model in models}
-    
     # Simple dropdown selector
     selected_model = st.selectbox(
         "AI model:",
@@ -8,6 +8,9 @@ import streamlit as st
 from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
 
+# Number of project cards rendered at first, and added by each "Load more" click
+PROJECT_PAGE_SIZE = 20
+
 def format_date(date_str: str) -> str:
     """Format date string for display."""
     try:
@@ -99,12 +102,17 @@ def project_card(
                 else:
                     st.error("Project ID not found")
 
+def _load_more_projects() -> None:
+    """Reveal the next page of project cards."""
+    st.session_state.project_page = st.session_state.get("project_page", 0) + 1
+
 def project_selector(
     projects: List[Dict[str, Any]],
     on_project_selected: Callable,
     currently_selected_index: Optional[int] = None,
     use_cards: bool = True,
-    include_stats: bool = True
+    include_stats: bool = True,
+    page_size: int = PROJECT_PAGE_SIZE
 ) -> None:
     """
     Display a project selector with options for card or dropdown view.
@@ -115,6 +123,7 @@ def project_selector(
         currently_selected_index: Index of currently selected project
         use_cards: Whether to use card view (True) or dropdown (False)
         include_stats: Whether to include project statistics
+        page_size: Number of cards rendered per "Load more" page in card view
     """
     if not projects:
         st.warning("No research projects available. Create a new project first.")
@@ -138,14 +147,19 @@ def project_selector(
         
         # Display projects based on view mode
         if use_cards:
-            # Card view
-            for i, project in enumerate(projects):
+            # Card view, rendering only the pages loaded so far
+            visible_count = (st.session_state.get("project_page", 0) + 1) * page_size
+            for i, project in enumerate(projects[:visible_count]):
                 project_card(
                     project=project,
                     index=i,
                     is_selected=(i == currently_selected_index),
                     on_click=on_project_selected
                 )
+            
+            if visible_count < len(projects):
+                st.caption(f"Showing {visible_count} of {len(projects)} projects")
+                st.button("Load more", key="load_more_projects", on_click=_load_more_projects)
         else:
             # Dropdown view
             project_options = [
@@ -51,13 +51,16 @@ from .openai_client import (
     get_available_models,
     get_model_by_id,
     get_research_response,
+    stream_research_response,
     extract_citations_from_response
 )
 
 # Export project management functions
 from .projects import (
     load_research_projects,
+    clear_research_projects_cache,
     filter_available_projects,
+    load_available_projects,
     get_project_info,
     get_formatted_project_list,
     get_project_display_options,
@@ -82,10 +85,11 @@ __all__ = [
     
     # OpenAI client
     'create_openai_client', 'get_available_models', 'get_model_by_id',
-    'get_research_response', 'extract_citations_from_response',
+    'get_research_response', 'stream_research_response', 'extract_citations_from_response',
     
     # Project management
-    'load_research_projects', 'filter_available_projects', 'get_project_info',
+    'load_research_projects', 'clear_research_projects_cache', 'filter_available_projects',
+    'load_available_projects', 'get_project_info',
     'get_formatted_project_list', 'get_project_display_options',
     'update_projects_file', 'archive_project', 'update_project_active_status'
 ] 
\ No newline at end of file
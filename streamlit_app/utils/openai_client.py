@@ -9,7 +9,7 @@ import os
 import time
 import streamlit as st
 from openai import OpenAI
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterator
 from .logger import get_logger
 import json
 
@@ -24,31 +24,45 @@ AVAILABLE_MODELS = [
     {"id": "o3-mini", "name": "o3-mini", "description": "Smaller reasoning model optimized for efficiency"}
 ]
 
-# Cached client creation
-@st.cache_resource
+# Cached client creation, keyed on the API key so rotating the key yields a new client.
+# Failures raise instead of returning None, so they are not cached and the next call retries.
+@st.cache_resource(show_spinner=False)
+def _create_openai_client(api_key: str) -> OpenAI:
+    """
+    Create an OpenAI client for an API key and verify that the key works.
+    
+    Args:
+        api_key: OpenAI API key
+        
+    Returns:
+        OpenAI client
+        
+    Raises:
+        Exception: If the client cannot be created or the key check fails
+    """
+    client = OpenAI(api_key=api_key)
+    # Fetch the list of models to verify API key works
+    client.models.list()
+    logger.info(f"OpenAI client created successfully")
+    return client
+
 def create_openai_client() -> Optional[OpenAI]:
     """
-    Create and cache an OpenAI client.
+    Get the cached OpenAI client for the current OPENAI_API_KEY.
+    
+    The client and its connection pool are reused across reruns and chat turns
+    until the key changes. A failed creation is retried on the next call.
     
     Returns:
         OpenAI client or None if an error occurs
     """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        logger.error("OPENAI_API_KEY not set in environment")
+        return None
+    
     try:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            logger.error("OPENAI_API_KEY not set in environment")
-            return None
-            
-        client = OpenAI(api_key=api_key)
-        # Test the client with a simple request
-        try:
-            # Fetch the list of models to verify API key works
-            models = client.models.list()
-            logger.info(f"OpenAI client created successfully")
-            return client
-        except Exception as e:
-            logger.error(f"Error testing OpenAI client: {str(e)}")
-            return None
+        return _create_openai_client(api_key)
     except Exception as e:
         logger.error(f"Error creating OpenAI client: {str(e)}")
         return None
@@ -64,6 +78,157 @@ def get_model_by_id(model_id: str) -> Optional[Dict[str, str]]:
             return model
     return None
 
+def _build_research_request(
+    query: str,
+    vector_store_id: str,
+    model: str,
+    enable_web_search: bool,
+    max_search_results: int
+) -> Dict[str, Any]:
+    """
+    Build the Responses API arguments for a research query.
+    
+    Args:
+        query: User query
+        vector_store_id: ID of the vector store to search
+        model: Model to use for generation
+        enable_web_search: Whether to enable web search
+        max_search_results: Maximum number of search results to return
+        
+    Returns:
+        Keyword arguments for client.responses.create
+    """
+    # Modify the input query if web search is enabled to provide explicit instructions
+    user_input = query
+    if enable_web_search:
+        # Augment the query with instructions about tool usage
+        user_input = (
+            f"{query}\n\n"
+            f"Note: If you don't find sufficient information in the research documents, "
+            f"please use web search to look for up-to-date information on this topic. "
+            f"For questions about current events, sports scores, or real-time data, web search is preferred."
+        )
+    
+    # Build tools list
+    tools = [{
+        "type": "file_search",
+        "vector_store_ids": [vector_store_id],
+        "max_num_results": max_search_results
+    }]
+    
+    # Add web search if enabled
+    if enable_web_search:
+        tools.append({
+            "type": "web_search"
+        })
+    
+    # Determine which outputs to include in the response
+    include_outputs = ["output[*].file_search_call.search_results"]
+    if enable_web_search:
+        include_outputs.append("output[*].web_search_call.search_results")
+    
+    return {
+        "model": model,
+        "input": user_input,  # Use potentially modified input with instructions
+        "tools": tools,
+        "include": include_outputs,
+        "tool_choice": "auto"  # The API doesn't support more complex tool_choice configurations
+    }
+
+def _parse_research_response(
+    response: Any,
+    debug_data: Dict[str, Any],
+    enable_web_search: bool,
+    debug: bool
+) -> Tuple[str, List[str]]:
+    """
+    Extract the answer text and citations from a Responses API response.
+    
+    Fills in the success, timing, and tool-usage fields of debug_data.
+    
+    Args:
+        response: Completed Responses API response
+        debug_data: Debug data dictionary started by the caller
+        enable_web_search: Whether web search was enabled
+        debug: Whether to include search result details in debug_data
+        
+    Returns:
+        Tuple of (response text, list of citation filenames and "Web: <url>" sources)
+    """
+    # Extract response text and citations
+    response_text = ""
+    citations = []
+    web_citations = []
+    used_web_search = False
+    used_file_search = False
+    
+    if response and response.output:
+        for output in response.output:
+            # Check if web search was used
+            if output.type == "web_search_call":
+                used_web_search = True
+                logger.info("Web search was used in this response")
+            
+            # Check if file search was used
+            if output.type == "file_search_call":
+                used_file_search = True
+                logger.info("File search was used in this response")
+            
+            if output.type == "message":
+                for content_item in output.content:
+                    if content_item.type == "output_text":
+                        response_text = content_item.text
+                        
+                        # Extract file citations
+                        if hasattr(content_item, 'annotations') and content_item.annotations:
+                            for annotation in content_item.annotations:
+                                if annotation.type == "file_citation":
+                                    citations.append(annotation.filename)
+                                elif annotation.type == "web_search_citation":
+                                    web_citations.append(f"Web: {annotation.url}")
+                                    
+            # Add file search details to debug data if available
+            if debug and output.type == "file_search_call":
+                debug_data["file_search"] = {
+                    "search_results": [{
+                        "filename": result.filename,
+                        "score": result.score
+                    } for result in output.search_results] if hasattr(output, 'search_results') else []
+                }
+            
+            # Add web search details to debug data if available
+            if debug and output.type == "web_search_call":
+                debug_data["web_search"] = {
+                    "search_results": []
+                }
+                if hasattr(output, 'search_results'):
+                    debug_data["web_search"]["search_results"] = [
+                        {"title": result.title, "url": result.url}
+                        for result in output.search_results
+                    ]
+    
+    # Combine file and web citations
+    all_citations = citations + web_citations
+    
+    debug_data["total_time"] = time.time() - debug_data["start_time"]
+    debug_data["success"] = True
+    debug_data["response_length"] = len(response_text)
+    debug_data["citation_count"] = len(all_citations)
+    debug_data["file_citation_count"] = len(citations)
+    debug_data["web_citation_count"] = len(web_citations)
+    debug_data["used_web_search"] = used_web_search
+    debug_data["used_file_search"] = used_file_search
+    
+    # Log detailed information about the response
+    logger.info(f"Got response from OpenAI ({len(response_text)} chars, {len(all_citations)} citations) in {debug_data['total_time']:.2f}s")
+    if enable_web_search:
+        if used_web_search:
+            logger.info(f"Web search was used with {len(web_citations)} citations")
+        else:
+            logger.info("Web search was enabled but not used by the model")
+    
+    return response_text, all_citations
+
 def get_research_response(
     client: OpenAI, 
     query: str, 
@@ -109,122 +274,106 @@ def get_research_response(
         "start_time": start_time,
     }
     
-    # Modify the input query if web search is enabled to provide explicit instructions
-    user_input = query
-    if enable_web_search:
-        # Augment the query with instructions about tool usage
-        user_input = (
-            f"{query}\n\n"
-            f"Note: If you don't find sufficient information in the research documents, "
-            f"please use web search to look for up-to-date information on this topic. "
-            f"For questions about current events, sports scores, or real-time data, web search is preferred."
-        )
-    
-    # Build tools list
-    tools = [{
-        "type": "file_search",
-        "vector_store_ids": [vector_store_id],
-        "max_num_results": max_search_results
-    }]
-    
-    # Add web search if enabled
-    if enable_web_search:
-        tools.append({
-            "type": "web_search"
-        })
+    request = _build_research_request(query, vector_store_id, model, enable_web_search, max_search_results)
     
     try:
-        logger.info(f"Sending request to OpenAI with {len(tools)} tools")
+        logger.info(f"Sending request to OpenAI with {len(request['tools'])} tools")
         
-        # Determine which outputs to include in the response
-        include_outputs = ["output[*].file_search_call.search_results"]
-        if enable_web_search:
-            include_outputs.append("output[*].web_search_call.search_results")
-            
         # Call OpenAI API
-        response = client.responses.create(
-            model=model,
-            input=user_input,  # Use potentially modified input with instructions
-            tools=tools,
-            include=include_outputs,
-            tool_choice="auto"  # The API doesn't support more complex tool_choice configurations
-        )
-        
-        # Extract response text and citations
-        response_text = ""
-        citations = []
-        web_citations = []
-        used_web_search = False
-        used_file_search = False
-        
+        response = client.responses.create(**request)
         debug_data["api_response_time"] = time.time() - start_time
         
-        if response and response.output:
-            for output in response.output:
-                # Check if web search was used
-                if output.type == "web_search_call":
-                    used_web_search = True
-                    logger.info("Web search was used in this response")
-                
-                # Check if file search was used
-                if output.type == "file_search_call":
-                    used_file_search = True
-                    logger.info("File search was used in this response")
-                
-                if output.type == "message":
-                    for content_item in output.content:
-                        if content_item.type == "output_text":
-                            response_text = content_item.text
-                            
-                            # Extract file citations
-                            if hasattr(content_item, 'annotations') and content_item.annotations:
-                                for annotation in content_item.annotations:
-                                    if annotation.type == "file_citation":
-                                        citations.append(annotation.filename)
-                                    elif annotation.type == "web_search_citation":
-                                        web_citations.append(f"Web: {annotation.url}")
-                                        
-                # Add file search details to debug data if available
-                if debug and output.type == "file_search_call":
-                    debug_data["file_search"] = {
-                        "search_results": [{
-                            "filename": result.filename,
-                            "score": result.score
-                        } for result in output.search_results] if hasattr(output, 'search_results') else []
-                    }
-                
-                # Add web search details to debug data if available
-                if debug and output.type == "web_search_call":
-                    debug_data["web_search"] = {
-                        "search_results": []
-                    }
-                    if hasattr(output, 'search_results'):
-                        debug_data["web_search"]["search_results"] = [
-                            {"title": result.title, "url": result.url}
-                            for result in output.search_results
-                        ]
+        response_text, all_citations = _parse_research_response(response, debug_data, enable_web_search, debug)
+        return response_text, all_citations, debug_data
         
-        # Combine file and web citations
-        all_citations = citations + web_citations
+    except Exception as e:
+        error_message = str(e)
+        logger.error(f"Error from OpenAI API: {error_message}")
         
+        debug_data["success"] = False
+        debug_data["error"] = error_message
         debug_data["total_time"] = time.time() - start_time
-        debug_data["success"] = True
-        debug_data["response_length"] = len(response_text)
-        debug_data["citation_count"] = len(all_citations)
-        debug_data["file_citation_count"] = len(citations)
-        debug_data["web_citation_count"] = len(web_citations)
-        debug_data["used_web_search"] = used_web_search
-        debug_data["used_file_search"] = used_file_search
         
-        # Log detailed information about the response
-        logger.info(f"Got response from OpenAI ({len(response_text)} chars, {len(all_citations)} citations) in {debug_data['total_time']:.2f}s")
-        if enable_web_search:
-            if used_web_search:
-                logger.info(f"Web search was used with {len(web_citations)} citations")
-            else:
-                logger.info("Web search was enabled but not used by the model")
+        return None, [], debug_data
+
+def stream_research_response(
+    client: OpenAI, 
+    query: str, 
+    vector_store_id: str,
+    result: Dict[str, Any],
+    model: str = "gpt-4o-mini",
+    enable_web_search: bool = False,
+    max_search_results: int = 5,
+    debug: bool = False
+) -> Iterator[str]:
+    """
+    Stream a response from OpenAI using the Responses API with vector store search.
+    
+    Yields the answer text as it is generated. Once the generator is exhausted,
+    result holds the same values get_research_response returns: "text" (None if
+    an error occurs), "citations", and "debug_data".
+    
+    Args:
+        client: OpenAI client
+        query: User query
+        vector_store_id: ID of the vector store to search
+        result: Dictionary that receives the final text, citations, and debug data
+        model: Model to use for generation
+        enable_web_search: Whether to enable web search
+        max_search_results: Maximum number of search results to return
+        debug: Whether to include debug information in the response
         
-        return response_text, all_citations, debug_data
+    Yields:
+        Text deltas of the answer
+    """
+    result.update(text=None, citations=[], debug_data={})
+    
+    if not client:
+        logger.error("OpenAI client not available")
+        result["debug_data"] = {"error": "OpenAI client not available"}
+        return
+    
+    if not vector_store_id:
+        logger.error("Vector store ID not provided")
+        result["debug_data"] = {"error": "Vector store ID not provided"}
+        return
+    
+    start_time = time.time()
+    debug_data = {
+        "query": query,
+        "model": model,
+        "vector_store_id": vector_store_id,
+        "web_search_enabled": enable_web_search,
+        "max_search_results": max_search_results,
+        "start_time": start_time,
+        "streamed": True,
+    }
+    result["debug_data"] = debug_data
+    
+    request = _build_research_request(query, vector_store_id, model, enable_web_search, max_search_results)
+    
+    try:
+        logger.info(f"Streaming request to OpenAI with {len(request['tools'])} tools")
+        
+        response = None
+        for event in client.responses.create(stream=True, **request):
+            if event.type == "response.output_text.delta":
+                if "first_token_time" not in debug_data:
+                    debug_data["first_token_time"] = time.time() - start_time
+                yield event.delta
+            elif event.type in ("response.completed", "response.incomplete"):
+                response = event.response
+            elif event.type == "response.failed":
+                error = event.response.error
+                raise RuntimeError(error.message if error else "Response failed")
+            elif event.type == "error":
+                raise RuntimeError(event.message)
+        
+        if response is None:
+            raise RuntimeError("Response stream ended before the response completed")
+        
+        debug_data["api_response_time"] = time.time() - start_time
+        result["text"], result["citations"] = _parse_research_response(response, debug_data, enable_web_search, debug)
         
     except Exception as e:
         error_message = str(e)
@@ -233,8 +382,6 @@ def get_research_response(
         debug_data["success"] = False
         debug_data["error"] = error_message
         debug_data["total_time"] = time.time() - start_time
-        
-        return None, [], debug_data
 
 def extract_citations_from_response(response, citations_map=None):
     """
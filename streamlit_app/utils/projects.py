@@ -13,26 +13,22 @@ from .logger import get_logger
 
 logger = get_logger("projects")
 
-# Cached project loading
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_research_projects(file_path: Optional[str] = None) -> List[Dict[str, Any]]:
+# Cached project loading, keyed on the file's modification time so any write
+# (including one by a research_orchestrator.py subprocess) invalidates it
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def _load_research_projects(file_path: str, mtime: float) -> List[Dict[str, Any]]:
     """
-    Load research projects from the JSON file.
+    Read and parse the research projects JSON file.
     
     Args:
-        file_path: Path to the JSON file (uses env var if not provided)
+        file_path: Path to the JSON file
+        mtime: Modification time of the file, used only as part of the cache key
         
     Returns:
         List of projects or empty list if error occurs
     """
-    file_path = file_path or os.getenv("RESEARCH_PROJECTS_FILE", "research_projects.json")
-    
     start_time = time.time()
     try:
-        if not os.path.exists(file_path):
-            logger.error(f"Research projects file not found: {file_path}")
-            return []
-            
         with open(file_path, "r") as f:
             data = json.load(f)
             projects = data.get("projects", [])
@@ -43,6 +39,34 @@ def load_research_projects(file_path: Optional[str] = None) -> List[Dict[str, An
         logger.error(f"Error loading research projects: {str(e)}")
         return []
 
+def load_research_projects(file_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Load research projects from the JSON file.
+    
+    The file is only parsed again when its modification time changes, so
+    reruns cost a single stat.
+    
+    Args:
+        file_path: Path to the JSON file (uses env var if not provided)
+        
+    Returns:
+        List of projects or empty list if error occurs
+    """
+    file_path = file_path or os.getenv("RESEARCH_PROJECTS_FILE", "research_projects.json")
+    
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        logger.error(f"Research projects file not found: {file_path}")
+        return []
+    
+    return _load_research_projects(file_path, mtime)
+
+def clear_research_projects_cache() -> None:
+    """Drop all cached project lists so the next load reads the file again."""
+    _load_research_projects.clear()
+    _load_available_projects.clear()
+
 def filter_available_projects(projects: List[Dict[str, Any]], 
                              require_openai: bool = True,
                              require_vector_store: bool = True,
@@ -88,6 +112,68 @@ def filter_available_projects(projects: List[Dict[str, Any]],
     logger.info(f"Filtered {len(filtered_projects)} projects from {len(projects)} total projects")
     return filtered_projects
 
+# Cached filtered project lists, keyed like _load_research_projects plus the filter criteria
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def _load_available_projects(file_path: str, mtime: float, 
+                             require_openai: bool, 
+                             require_vector_store: bool, 
+                             include_incomplete: bool, 
+                             include_inactive: bool) -> List[Dict[str, Any]]:
+    """
+    Load the projects in a file and filter them.
+    
+    Args:
+        file_path: Path to the JSON file
+        mtime: Modification time of the file, used only as part of the cache key
+        require_openai: Whether to require OpenAI integration
+        require_vector_store: Whether to require a vector store
+        include_incomplete: Whether to include incomplete projects
+        include_inactive: Whether to include inactive projects
+        
+    Returns:
+        List of filtered projects
+    """
+    return filter_available_projects(
+        _load_research_projects(file_path, mtime),
+        require_openai=require_openai,
+        require_vector_store=require_vector_store,
+        include_incomplete=include_incomplete,
+        include_inactive=include_inactive
+    )
+
+def load_available_projects(file_path: Optional[str] = None,
+                            require_openai: bool = True,
+                            require_vector_store: bool = True,
+                            include_incomplete: bool = False,
+                            include_inactive: bool = False) -> List[Dict[str, Any]]:
+    """
+    Load research projects and filter them, as filter_available_projects does.
+    
+    The filtered list is cached for each set of criteria until the file changes,
+    so reruns neither copy the full project list nor filter it again.
+    
+    Args:
+        file_path: Path to the JSON file (uses env var if not provided)
+        require_openai: Whether to require OpenAI integration
+        require_vector_store: Whether to require a vector store
+        include_incomplete: Whether to include incomplete projects
+        include_inactive: Whether to include inactive projects
+        
+    Returns:
+        List of filtered projects or empty list if error occurs
+    """
+    file_path = file_path or os.getenv("RESEARCH_PROJECTS_FILE", "research_projects.json")
+    
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        logger.error(f"Research projects file not found: {file_path}")
+        return []
+    
+    return _load_available_projects(
+        file_path, mtime, require_openai, require_vector_store, include_incomplete, include_inactive
+    )
+
 def get_project_info(project: Dict[str, Any]) -> Dict[str, Any]:
     """
     Extract and format key information from a project.
@@ -185,7 +271,7 @@ def update_projects_file(projects: List[Dict[str, Any]], file_path: Optional[str
         logger.info(f"Updated {len(projects)} projects in {file_path}")
         
         # Clear the cache to ensure fresh data on next load
-        load_research_projects.clear()
+        clear_research_projects_cache()
         
         return True
     except Exception as e:
@@ -257,7 +343,7 @@ def update_project_active_status(project_id: str, is_active: bool, file_path: Op
             json.dump(data, f, indent=2)
         
         # Clear the cache so the updated file will be reloaded
-        load_research_projects.clear()
+        clear_research_projects_cache()
         
         logger.info(f"Updated active status of project {project_id} to {is_active}")
         return True
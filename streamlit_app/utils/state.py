@@ -56,6 +56,14 @@ def init_session_state():
     
     if "log_history" not in st.session_state:
         st.session_state.log_history = []
+    
+    # Full-log file paths of the latest research runs, keyed by kind of run
+    if "run_log_files" not in st.session_state:
+        st.session_state.run_log_files = {}
+    
+    # Number of extra pages of project cards loaded in the project selector
+    if "project_page" not in st.session_state:
+        st.session_state.project_page = 0
 
 # Conversation History Management
 def add_user_message(content: str):